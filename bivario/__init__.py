@@ -4,6 +4,7 @@ Bivario.
 Python library for plotting bivariate choropleth maps in Matplotlib and Folium.
 """
 
+from bivario.classifier import BivariateClassifier
 from bivario.cmap import (
     AccentsBivariateColourmap,
     CornersBivariateColourmap,
@@ -11,20 +12,35 @@ from bivario.cmap import (
     NamedBivariateColourmap,
     get_bivariate_cmap,
 )
-from bivario.folium import explore_bivariate_data
-from bivario.legend import plot_bivariate_legend
+from bivario.folium import explore_bivariate_data, save_bivariate_map
+from bivario.legend import BivariateLegendSpec, plot_bivariate_legend
 from bivario.lonboard import viz_bivariate_data
+from bivario.matplotlib import plot_bivariate_data
+from bivario.raster import BivariateRaster, rasterize_bivariate
+from bivario.tiles import render_bivariate_tiles
+from bivario.vector_tiles import export_bivariate_vector_tiles
+from bivario.xarray import BivariateDataArray, colour_bivariate_dataarray
 
 __app_name__ = "bivario"
 __version__ = "0.3.1"
 
 __all__ = [
     "AccentsBivariateColourmap",
+    "BivariateClassifier",
+    "BivariateDataArray",
+    "BivariateLegendSpec",
+    "BivariateRaster",
     "CornersBivariateColourmap",
     "MplCmapBivariateColourmap",
     "NamedBivariateColourmap",
+    "colour_bivariate_dataarray",
     "explore_bivariate_data",
+    "export_bivariate_vector_tiles",
     "get_bivariate_cmap",
+    "plot_bivariate_data",
     "plot_bivariate_legend",
+    "rasterize_bivariate",
+    "render_bivariate_tiles",
+    "save_bivariate_map",
     "viz_bivariate_data",
 ]
@@ -2,28 +2,89 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
+from bivario._quantiles import QUANTILE_METHOD, get_quantile_estimator
+
 if TYPE_CHECKING:
     import numpy.typing as npt
 
     from bivario.typing import NumericArray
 
+# Number of values processed at once by the in place alpha scaling
+_ALPHA_BLOCK_SIZE = 2**16
+
 
 def prepare_alpha_values(
     values_a: "NumericArray",
     values_b: "NumericArray",
     alpha_norm_quantile: float = 0.9,
+    quantile_method: QUANTILE_METHOD = "exact",
 ) -> "npt.NDArray[np.float64]":
+    norm_value_a, norm_value_b = get_alpha_norm_values(
+        values_a=values_a,
+        values_b=values_b,
+        alpha_norm_quantile=alpha_norm_quantile,
+        quantile_method=quantile_method,
+    )
+    return scale_alpha_values(
+        values_a=values_a,
+        values_b=values_b,
+        norm_value_a=norm_value_a,
+        norm_value_b=norm_value_b,
+    )
+
+
+def get_alpha_norm_values(
+    values_a: "NumericArray",
+    values_b: "NumericArray",
+    alpha_norm_quantile: float = 0.9,
+    quantile_method: QUANTILE_METHOD = "exact",
+    chunk_size: int | None = None,
+) -> tuple[float, float]:
+    validate_alpha_norm_quantile(alpha_norm_quantile)
+
+    if quantile_method == "exact" and chunk_size is None:
+        return (
+            float(np.quantile(values_a, alpha_norm_quantile)),
+            float(np.quantile(values_b, alpha_norm_quantile)),
+        )
+
+    # Values are fed to the estimators chunk by chunk, same as in the out of core pipelines
+    estimator_a = get_quantile_estimator(quantile_method)
+    estimator_b = get_quantile_estimator(quantile_method)
+    chunk_size = chunk_size or len(values_a) or 1
+    for start in range(0, len(values_a), chunk_size):
+        estimator_a.update(values_a[start : start + chunk_size])
+        estimator_b.update(values_b[start : start + chunk_size])
+
+    return estimator_a.quantile(alpha_norm_quantile), estimator_b.quantile(alpha_norm_quantile)
+
+
+def validate_alpha_norm_quantile(alpha_norm_quantile: float) -> None:
     if alpha_norm_quantile < 0 or alpha_norm_quantile > 1:
         raise ValueError("alpha_norm_quantile must be between 0 and 1 (inclusive).")
 
-    alpha_values: npt.NDArray[np.float64] = np.sqrt(
-        np.minimum(
-            1,
-            np.maximum(
-                values_a / np.quantile(values_a, alpha_norm_quantile),
-                values_b / np.quantile(values_b, alpha_norm_quantile),
-            ),
-        )
-    ).astype(np.float64)
 
-    return alpha_values
+def scale_alpha_values(
+    values_a: "NumericArray",
+    values_b: "NumericArray",
+    norm_value_a: float,
+    norm_value_b: float,
+    out: "npt.NDArray[np.float64] | None" = None,
+) -> "npt.NDArray[np.float64]":
+    # Computed in place in blocks, so the output buffer is the only full size allocation
+    if out is None:
+        out = np.empty(len(values_a), dtype=np.float64)
+
+    buffer = np.empty(min(len(values_a), _ALPHA_BLOCK_SIZE), dtype=np.float64)
+    for start in range(0, len(values_a), _ALPHA_BLOCK_SIZE):
+        stop = min(start + _ALPHA_BLOCK_SIZE, len(values_a))
+        block = out[start:stop]
+        block_b = buffer[: stop - start]
+
+        np.divide(values_a[start:stop], norm_value_a, out=block)
+        np.divide(values_b[start:stop], norm_value_b, out=block_b)
+        np.maximum(block, block_b, out=block)
+        np.minimum(block, 1, out=block)
+        np.sqrt(block, out=block)
+
+    return out
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from bivario._alpha import scale_alpha_values
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from bivario.cmap import BivariateColourmap
+    from bivario.typing import BivariateColourmapArray, NumericArray
+
+
+@dataclass(frozen=True)
+class ColouringBounds:
+    bins_a: "NumericArray | None"
+    bins_b: "NumericArray | None"
+    range_a: tuple[float, float]
+    range_b: tuple[float, float]
+    alpha_norm_values: tuple[float, float] | None
+
+
+def colour_with_bounds(
+    values_a: "NumericArray",
+    values_b: "NumericArray",
+    bounds: ColouringBounds,
+    cmap: "BivariateColourmap",
+    dark_mode: bool,
+) -> tuple["BivariateColourmapArray", "npt.NDArray[np.float64] | None"]:
+    values_cmap = cmap(
+        values_a=normalize_with_range(_classify_with_bins(values_a, bounds.bins_a), bounds.range_a),
+        values_b=normalize_with_range(_classify_with_bins(values_b, bounds.bins_b), bounds.range_b),
+        normalize=False,
+        dark_mode=dark_mode,
+    )
+
+    alpha_values = None
+    if bounds.alpha_norm_values is not None:
+        norm_value_a, norm_value_b = bounds.alpha_norm_values
+        alpha_values = scale_alpha_values(
+            values_a=values_a,
+            values_b=values_b,
+            norm_value_a=norm_value_a,
+            norm_value_b=norm_value_b,
+        )
+
+    return values_cmap, alpha_values
+
+
+def _classify_with_bins(values: "NumericArray", bins: "NumericArray | None") -> "NumericArray":
+    if bins is None:
+        return values
+
+    # Same as mapclassify, values outside of the bins are assigned to the closest one
+    return np.minimum(np.searchsorted(bins, values, side="left"), len(bins) - 1)
+
+
+def normalize_with_range(
+    values: "NumericArray", value_range: tuple[float, float]
+) -> "NumericArray":
+    v_min, v_max = value_range
+    return np.clip((values - v_min) / (v_max - v_min), 0, 1)
@@ -0,0 +1,217 @@
+from typing import TYPE_CHECKING, Any
+
+import narwhals as nw
+import numpy as np
+
+from bivario._alpha import validate_alpha_norm_quantile
+from bivario._native_schemes import equal_interval_bins, quantile_percentiles
+from bivario._prepared import PreparedBivariateData, get_range
+from bivario._scheme import (
+    SCHEME_TYPE,
+    MapclassifyResult,
+    format_tick_labels,
+    normalize_scheme_name,
+    parse_schemes,
+)
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import _validate_missing_values
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+
+# Schemes with bins defined by the minimum, maximum and quantiles, computed by the engine
+_LAZY_SCHEMES = ("quantiles", "equalinterval")
+
+
+def supports_lazy_colouring(
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier,
+    k: int | tuple[int, int],
+) -> bool:
+    # Fitted classifier has known bins, so any scheme can be applied by the engine
+    if isinstance(scheme, BivariateClassifier):
+        return True
+
+    scheme_a, scheme_b, _, _ = parse_schemes(scheme=scheme, k=k)
+    return all(
+        scheme is None or normalize_scheme_name(scheme) in _LAZY_SCHEMES
+        for scheme in (scheme_a, scheme_b)
+    )
+
+
+def prepare_lazy_colouring(
+    lf: "nw.LazyFrame[Any]",
+    column_a: str,
+    column_b: str,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier,
+    k: int | tuple[int, int],
+    alpha: bool,
+    alpha_norm_quantile: float,
+    label_a: str | None = None,
+    label_b: str | None = None,
+) -> PreparedBivariateData:
+    if alpha:
+        validate_alpha_norm_quantile(alpha_norm_quantile)
+
+    classifier = None
+    if isinstance(scheme, BivariateClassifier):
+        classifier = scheme
+        classifier._check_is_fitted()
+        scheme_a, scheme_b, k_a, k_b = (
+            classifier.scheme_a,
+            classifier.scheme_b,
+            classifier.k_a,
+            classifier.k_b,
+        )
+    else:
+        scheme_a, scheme_b, k_a, k_b = parse_schemes(scheme=scheme, k=k)
+    columns = {"a": (column_a, scheme_a, k_a), "b": (column_b, scheme_b, k_b)}
+
+    # All statistics are computed in a single aggregation query, bins and ranges of a fitted
+    # classifier don't depend on the values
+    schema = lf.collect_schema()
+    statistics_exprs = []
+    for key, (column, column_scheme, column_k) in columns.items():
+        # Nulls and NaNs are counted in the same query, NaNs exist only in float columns
+        missing = nw.col(column).is_null()
+        if schema[column].is_float():
+            missing = missing | nw.col(column).is_nan()
+        statistics_exprs.append(missing.sum().alias(f"{key}_missing"))
+        if classifier is None:
+            statistics_exprs.extend(
+                [
+                    nw.col(column).min().alias(f"{key}_min"),
+                    nw.col(column).max().alias(f"{key}_max"),
+                ]
+            )
+        if alpha:
+            statistics_exprs.append(
+                nw.col(column)
+                .quantile(alpha_norm_quantile, interpolation="linear")
+                .alias(f"{key}_alpha_norm")
+            )
+        if (
+            classifier is None
+            and column_scheme is not None
+            and normalize_scheme_name(column_scheme) == "quantiles"
+        ):
+            statistics_exprs.extend(
+                nw.col(column).quantile(level, interpolation="linear").alias(f"{key}_q{idx}")
+                for idx, level in enumerate(quantile_percentiles(column_k) / 100)
+            )
+
+    results = lf.select(*statistics_exprs).collect().to_dict(as_series=False)
+    _validate_missing_values(int(results["a_missing"][0]), int(results["b_missing"][0]))
+    statistics = {name: float(values[0]) for name, values in results.items()}
+
+    bins: dict[str, npt.NDArray[np.float64] | None]
+    if classifier is not None:
+        bins = {"a": classifier.bins_a, "b": classifier.bins_b}
+    else:
+        bins = {
+            key: None
+            if column_scheme is None
+            else _get_bins(key, normalize_scheme_name(column_scheme), column_k, statistics)
+            for key, (_, column_scheme, column_k) in columns.items()
+        }
+
+    # Only class codes (or values without binning) and alpha values are materialized
+    row_exprs = [
+        _classify_expr(column, bins[key]).alias(key) for key, (column, _, _) in columns.items()
+    ]
+    alpha_norm_values = None
+    if alpha:
+        alpha_norm_values = (statistics["a_alpha_norm"], statistics["b_alpha_norm"])
+        row_exprs.append(
+            nw.max_horizontal(
+                nw.col(column_a) / alpha_norm_values[0], nw.col(column_b) / alpha_norm_values[1]
+            )
+            .clip(upper_bound=1)
+            .sqrt()
+            .alias("alpha")
+        )
+
+    rows = lf.select(*row_exprs).collect()
+    values_a = rows["a"].to_numpy()
+    values_b = rows["b"].to_numpy()
+
+    if classifier is not None:
+        scheme_result = MapclassifyResult(
+            values_a=values_a,
+            values_b=values_b,
+            tick_labels_a=classifier.tick_labels_a,
+            tick_labels_b=classifier.tick_labels_b,
+            scheme_a=scheme_a,
+            scheme_b=scheme_b,
+            k_a=k_a if bins["a"] is None else len(bins["a"]),
+            k_b=k_b if bins["b"] is None else len(bins["b"]),
+            bins_a=bins["a"],
+            bins_b=bins["b"],
+        )
+        range_a, range_b, class_range_a, class_range_b = classifier._ranges()
+    else:
+        scheme_result = MapclassifyResult(
+            values_a=values_a,
+            values_b=values_b,
+            tick_labels_a=_get_tick_labels("a", bins["a"], statistics),
+            tick_labels_b=_get_tick_labels("b", bins["b"], statistics),
+            scheme_a=scheme_a,
+            scheme_b=scheme_b,
+            k_a=k_a,
+            k_b=k_b,
+            bins_a=bins["a"],
+            bins_b=bins["b"],
+        )
+        # Only the minimum and maximum of the original values are needed by the legend
+        range_a = (statistics["a_min"], statistics["a_max"])
+        range_b = (statistics["b_min"], statistics["b_max"])
+        class_range_a = range_a if bins["a"] is None else get_range(values_a)
+        class_range_b = range_b if bins["b"] is None else get_range(values_b)
+
+    return PreparedBivariateData(
+        scheme_result=scheme_result,
+        range_a=range_a,
+        range_b=range_b,
+        class_range_a=class_range_a,
+        class_range_b=class_range_b,
+        alpha_norm_values=alpha_norm_values,
+        alpha_values=rows["alpha"].to_numpy().astype(np.float64) if alpha else None,
+        label_a=label_a,
+        label_b=label_b,
+    )
+
+
+def _get_bins(
+    key: str, scheme: str, k: int, statistics: dict[str, float]
+) -> "npt.NDArray[np.float64]":
+    if scheme == "quantiles":
+        return np.unique(
+            [statistics[f"{key}_q{idx}"] for idx in range(len(quantile_percentiles(k)))]
+        ).astype(np.float64)
+
+    # Statistics are python floats, so bins are computed in float64
+    return equal_interval_bins(statistics[f"{key}_min"], statistics[f"{key}_max"], k).astype(
+        np.float64
+    )
+
+
+def _classify_expr(column: str, bins: "npt.NDArray[np.float64] | None") -> nw.Expr:
+    if bins is None:
+        return nw.col(column)
+
+    # Number of bins lower than the value, values above the last bin are assigned to the last
+    # class, same as bins search done by mapclassify
+    thresholds = [(nw.col(column) > float(edge)).cast(nw.Int64) for edge in bins[:-1]]
+    if not thresholds:
+        return (nw.col(column) * 0).cast(nw.Int64)
+
+    return nw.sum_horizontal(*thresholds)
+
+
+def _get_tick_labels(
+    key: str, bins: "npt.NDArray[np.float64] | None", statistics: dict[str, float]
+) -> list[str] | None:
+    if bins is None:
+        return None
+
+    return format_tick_labels(statistics[f"{key}_min"], bins)
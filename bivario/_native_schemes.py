@@ -0,0 +1,129 @@
+import warnings
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from bivario.typing import NumericArray
+
+
+@dataclass(frozen=True)
+class Binning:
+    # Same attributes as in mapclassify classifiers
+    yb: "npt.NDArray[np.intp]"
+    bins: "NumericArray"
+    k: int
+
+
+def classify_native(values: "NumericArray", scheme: str, k: int) -> Binning | None:
+    # Returns None for schemes without native implementation
+    get_bins = _NATIVE_SCHEMES.get(scheme)
+    if get_bins is None:
+        return None
+
+    bins = get_bins(values, k)
+    # Values are always within the bins, so this is the same as mapclassify bin1d function
+    yb = np.minimum(np.searchsorted(bins, values, side="left"), len(bins) - 1)
+    return Binning(yb=yb, bins=bins, k=len(bins))
+
+
+def quantile_percentiles(k: int) -> "npt.NDArray[np.float64]":
+    # Same percentiles as in mapclassify Quantiles classifier
+    width = 100.0 / k
+    percentiles = np.arange(width, 100 + width, width, dtype=np.float64)
+    if percentiles[-1] > 100.0:
+        percentiles[-1] = 100.0
+
+    return percentiles
+
+
+def equal_interval_bins(min_value: Any, max_value: Any, k: int) -> "NumericArray":
+    # Same bins as in mapclassify EqualInterval classifier, computed with the values dtype
+    if min_value == max_value:
+        raise ValueError(
+            f"Not enough unique values in array to form {k} classes. All values in `y` are equal."
+        )
+
+    width = (max_value - min_value) / k
+    cuts = np.arange(min_value + width, max_value + width, width)
+    if len(cuts) > k:
+        cuts = cuts[0:k]
+    cuts[-1] = max_value
+
+    return cuts
+
+
+def _quantiles_bins(values: "NumericArray", k: int) -> "NumericArray":
+    bins = np.unique(_score_at_percentiles(values, quantile_percentiles(k)))
+    if len(bins) < k:
+        warnings.warn(
+            f"Not enough unique values in array to form {k} classes. Setting k to {len(bins)}.",
+            UserWarning,
+            stacklevel=4,
+        )
+
+    return bins
+
+
+def _equal_interval_bins(values: "NumericArray", k: int) -> "NumericArray":
+    return equal_interval_bins(values.min(), values.max(), k)
+
+
+def _std_mean_bins(values: "NumericArray", k: int) -> "NumericArray":
+    # Same bins as in mapclassify StdMean classifier with default multiples, k is ignored
+    std = values.std(ddof=1)
+    mean = values.mean()
+    bins = [mean + std * multiple for multiple in (-2, -1, 1, 2)]
+
+    max_value = values.max()
+    if bins[-1] < max_value:
+        bins.append(max_value)
+
+    return np.array(bins)
+
+
+def _box_plot_bins(values: "NumericArray", k: int) -> "NumericArray":
+    # Same bins as in mapclassify BoxPlot classifier with default hinge, k is ignored
+    q25, q50, q75, q100 = _score_at_percentiles(values, np.array([25.0, 50.0, 75.0, 100.0]))
+    pivot = 1.5 * (q75 - q25)
+    left_fence = q25 - pivot
+    right_fence = q75 + pivot
+
+    if right_fence < q100:
+        return np.array([left_fence, q25, q50, q75, right_fence, q100])
+
+    return np.array([left_fence, q25, q50, q75, right_fence])
+
+
+def _score_at_percentiles(
+    values: "NumericArray", percentiles: "npt.NDArray[np.float64]"
+) -> "npt.NDArray[np.float64]":
+    # Same interpolation (and floating point operations) as scipy scoreatpercentile function
+    # used by mapclassify, but with a partial sort of the values around the required positions
+    positions = percentiles / 100.0 * (len(values) - 1)
+    lower = positions.astype(np.intp)
+    upper = np.minimum(lower + 1, len(values) - 1)
+
+    partitioned = np.partition(values, np.unique(np.concatenate([lower, upper])))
+    lower_values = partitioned[lower].astype(np.float64)
+    upper_values = partitioned[upper].astype(np.float64)
+
+    lower_weights = (lower + 1) - positions
+    upper_weights = positions - lower
+    interpolated = (lower_values * lower_weights + upper_values * upper_weights) / (
+        lower_weights + upper_weights
+    )
+
+    scores: npt.NDArray[np.float64] = np.where(positions == lower, lower_values, interpolated)
+    return scores
+
+
+_NATIVE_SCHEMES = {
+    "quantiles": _quantiles_bins,
+    "equalinterval": _equal_interval_bins,
+    "stdmean": _std_mean_bins,
+    "boxplot": _box_plot_bins,
+}
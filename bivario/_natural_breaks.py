@@ -0,0 +1,145 @@
+import warnings
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from bivario._native_schemes import Binning
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import numpy.typing as npt
+
+    from bivario.typing import NumericArray
+
+
+if TYPE_CHECKING:
+    _SumOfSquares = Callable[[npt.NDArray[np.intp], npt.NDArray[np.intp]], npt.NDArray[np.float64]]
+
+
+def classify_natural_breaks(
+    values: "NumericArray",
+    k: int = 5,
+    sample_size: int | None = None,
+    seed: int | None = 0,
+) -> Binning:
+    values = np.asarray(values, dtype=np.float64)
+
+    fit_values = values
+    if sample_size is not None and sample_size < len(values):
+        # Breaks are fitted on a sample, but the upper bound always covers all values
+        rng = np.random.default_rng(seed)
+        fit_values = rng.choice(values, size=sample_size, replace=False)
+
+    bins = natural_breaks_bins(fit_values, k=k)
+    bins[-1] = max(bins[-1], values.max())
+
+    # Same as mapclassify, values outside of the bins are assigned to the closest one
+    yb = np.minimum(np.searchsorted(bins, values, side="left"), len(bins) - 1)
+
+    return Binning(yb=yb, bins=bins, k=len(bins))
+
+
+def natural_breaks_bins(values: "NumericArray", k: int = 5) -> "npt.NDArray[np.float64]":
+    # Optimal 1D k-means (Ckmeans) on weighted unique values, returns upper bounds of classes
+    unique_values, counts = np.unique(np.asarray(values, dtype=np.float64), return_counts=True)
+    n = len(unique_values)
+
+    if n < k:
+        warnings.warn(
+            f"Not enough unique values in array to form {k} classes. Setting k to {n}.",
+            UserWarning,
+            stacklevel=3,
+        )
+        return unique_values
+
+    # Values are shifted to reduce precision loss in the sums of squares
+    shifted_values = unique_values - np.median(unique_values)
+    weights = counts.astype(np.float64)
+    prefix_weights = np.concatenate([[0.0], np.cumsum(weights)])
+    prefix_sums = np.concatenate([[0.0], np.cumsum(weights * shifted_values)])
+    prefix_squares = np.concatenate([[0.0], np.cumsum(weights * shifted_values**2)])
+
+    def sum_of_squares(
+        starts: "npt.NDArray[np.intp]", ends: "npt.NDArray[np.intp]"
+    ) -> "npt.NDArray[np.float64]":
+        # Within-class sum of squared deviations of values[starts..ends] (inclusive)
+        class_weights = prefix_weights[ends + 1] - prefix_weights[starts]
+        class_sums = prefix_sums[ends + 1] - prefix_sums[starts]
+        class_squares = prefix_squares[ends + 1] - prefix_squares[starts]
+        class_costs: npt.NDArray[np.float64] = np.maximum(
+            class_squares - class_sums**2 / class_weights, 0.0
+        )
+        return class_costs
+
+    indices = np.arange(n)
+    costs = sum_of_squares(np.zeros(n, dtype=np.intp), indices)
+    # Start of the last class of the optimal classification of values[0..i] into q classes
+    class_starts = [np.zeros(n, dtype=np.intp)]
+
+    for q in range(1, k):
+        # Last class is only needed for the classification of all the values
+        costs, starts = _next_layer(
+            costs, q, n, sum_of_squares, first_end=n - 1 if q == k - 1 else q
+        )
+        class_starts.append(starts)
+
+    bins = np.empty(k, dtype=np.float64)
+    end = n - 1
+    for q in range(k - 1, -1, -1):
+        bins[q] = unique_values[end]
+        end = class_starts[q][end] - 1
+
+    return bins
+
+
+def _next_layer(
+    previous_costs: "npt.NDArray[np.float64]",
+    q: int,
+    n: int,
+    sum_of_squares: "_SumOfSquares",
+    first_end: int,
+) -> tuple["npt.NDArray[np.float64]", "npt.NDArray[np.intp]"]:
+    # Divide and conquer optimization, the optimal start of the last class is monotonic in the
+    # class end, so each level of the recursion is evaluated for all segments at once
+    costs = np.full(n, np.inf)
+    starts = np.zeros(n, dtype=np.intp)
+
+    # Segments of class ends with the range of possible starts of the last class
+    ends_low = np.array([first_end])
+    ends_high = np.array([n - 1])
+    starts_low = np.array([q])
+    starts_high = np.array([n - 1])
+
+    while len(ends_low):
+        middles = (ends_low + ends_high) // 2
+        lengths = np.minimum(starts_high, middles) - starts_low + 1
+        segment_starts = np.cumsum(lengths) - lengths
+
+        positions = np.arange(segment_starts[-1] + lengths[-1])
+        candidates = positions - np.repeat(segment_starts - starts_low, lengths)
+        candidate_costs = previous_costs[candidates - 1] + sum_of_squares(
+            candidates, np.repeat(middles, lengths)
+        )
+
+        # First candidate with the lowest cost in each segment
+        min_costs = np.minimum.reduceat(candidate_costs, segment_starts)
+        min_positions = np.where(
+            candidate_costs <= np.repeat(min_costs, lengths), positions, len(positions)
+        )
+        best_starts = candidates[np.minimum.reduceat(min_positions, segment_starts)]
+
+        costs[middles] = min_costs
+        starts[middles] = best_starts
+
+        # Left halves end before the middle and right halves start after it
+        left = middles > ends_low
+        right = middles < ends_high
+        ends_low, ends_high, starts_low, starts_high = (
+            np.concatenate([ends_low[left], middles[right] + 1]),
+            np.concatenate([middles[left] - 1, ends_high[right]]),
+            np.concatenate([starts_low[left], best_starts[right]]),
+            np.concatenate([best_starts[left], starts_high[right]]),
+        )
+
+    return costs, starts
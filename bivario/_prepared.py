@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from bivario._alpha import get_alpha_norm_values, scale_alpha_values
+from bivario._colouring import ColouringBounds, normalize_with_range
+from bivario._scheme import SCHEME_TYPE, MapclassifyResult, apply_mapclassify
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import _count_missing_values, _validate_missing_values, _validate_values
+from bivario.legend import BivariateLegendSpec, _try_parse_label
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from bivario.cmap import BivariateColourmap
+    from bivario.typing import BivariateColourmapArray, NumericArray, ValueInput
+
+
+@dataclass(frozen=True)
+class PreparedBivariateData:
+    scheme_result: MapclassifyResult
+    # Ranges of the original values, used by the legend
+    range_a: tuple[float, float]
+    range_b: tuple[float, float]
+    # Ranges of the (classified) values, used to normalize them before applying the colourmap
+    class_range_a: tuple[float, float]
+    class_range_b: tuple[float, float]
+    alpha_norm_values: tuple[float, float] | None
+    alpha_values: "npt.NDArray[np.float64] | None"
+    label_a: str | None = None
+    label_b: str | None = None
+
+    @property
+    def bounds(self) -> ColouringBounds:
+        return ColouringBounds(
+            bins_a=self.scheme_result.bins_a,
+            bins_b=self.scheme_result.bins_b,
+            range_a=self.class_range_a,
+            range_b=self.class_range_b,
+            alpha_norm_values=self.alpha_norm_values,
+        )
+
+    def colour(self, cmap: "BivariateColourmap", dark_mode: bool) -> "BivariateColourmapArray":
+        # Values are already validated and their ranges known, so they are normalized only once
+        return cmap(
+            values_a=normalize_with_range(self.scheme_result.values_a, self.class_range_a),
+            values_b=normalize_with_range(self.scheme_result.values_b, self.class_range_b),
+            normalize=False,
+            dark_mode=dark_mode,
+        )
+
+    def legend_spec(
+        self, cmap: "BivariateColourmap", dark_mode: bool, numerical_grid_size: int
+    ) -> BivariateLegendSpec:
+        scheme_result = self.scheme_result
+
+        grid_size: int | tuple[int, int]
+        if scheme_result.scheme_a is scheme_result.scheme_b is None:
+            grid_size = numerical_grid_size
+        else:
+            grid_size_y = (
+                numerical_grid_size if scheme_result.scheme_a is None else scheme_result.k_a
+            )
+            grid_size_x = (
+                numerical_grid_size if scheme_result.scheme_b is None else scheme_result.k_b
+            )
+            grid_size = (grid_size_x, grid_size_y)
+
+        return BivariateLegendSpec(
+            range_a=self.range_a,
+            range_b=self.range_b,
+            cmap=cmap,
+            grid_size=grid_size,
+            label_a=self.label_a,
+            label_b=self.label_b,
+            tick_labels_a=scheme_result.tick_labels_a,
+            tick_labels_b=scheme_result.tick_labels_b,
+            dark_mode=dark_mode,
+        )
+
+
+def prepare_bivariate_data(
+    values_a: "ValueInput",
+    values_b: "ValueInput",
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier,
+    k: int | tuple[int, int],
+    alpha: bool,
+    alpha_norm_quantile: float,
+    label_a: str | None = None,
+    label_b: str | None = None,
+) -> PreparedBivariateData:
+    # Values are converted and validated once for all the following stages
+    parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
+    _validate_missing_values(
+        _count_missing_values(parsed_values_a), _count_missing_values(parsed_values_b)
+    )
+    parsed_values_a = np.ascontiguousarray(parsed_values_a)
+    parsed_values_b = np.ascontiguousarray(parsed_values_b)
+
+    alpha_norm_values = None
+    alpha_values = None
+    if alpha:
+        alpha_norm_values = get_alpha_norm_values(
+            values_a=parsed_values_a,
+            values_b=parsed_values_b,
+            alpha_norm_quantile=alpha_norm_quantile,
+        )
+        alpha_values = scale_alpha_values(
+            parsed_values_a,
+            parsed_values_b,
+            norm_value_a=alpha_norm_values[0],
+            norm_value_b=alpha_norm_values[1],
+        )
+
+    if isinstance(scheme, BivariateClassifier):
+        # Fitted classifier defines the classes and ranges independently from the values
+        scheme_result = scheme._scheme_result(parsed_values_a, parsed_values_b)
+        range_a, range_b, class_range_a, class_range_b = scheme._ranges()
+    else:
+        scheme_result = apply_mapclassify(
+            values_a=parsed_values_a, values_b=parsed_values_b, scheme=scheme, k=k
+        )
+        range_a = get_range(parsed_values_a)
+        range_b = get_range(parsed_values_b)
+        class_range_a = (
+            range_a if scheme_result.bins_a is None else get_range(scheme_result.values_a)
+        )
+        class_range_b = (
+            range_b if scheme_result.bins_b is None else get_range(scheme_result.values_b)
+        )
+
+    return PreparedBivariateData(
+        scheme_result=scheme_result,
+        range_a=range_a,
+        range_b=range_b,
+        class_range_a=class_range_a,
+        class_range_b=class_range_b,
+        alpha_norm_values=alpha_norm_values,
+        alpha_values=alpha_values,
+        label_a=label_a or _try_parse_label(values_a),
+        label_b=label_b or _try_parse_label(values_b),
+    )
+
+
+def get_range(values: "NumericArray") -> tuple[float, float]:
+    return float(values.min()), float(values.max())
@@ -0,0 +1,126 @@
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from bivario.typing import NumericArray
+
+QUANTILE_METHOD = Literal["exact", "kll"]
+
+
+class ExactQuantileEstimator:
+    # Keeps all the values, quantiles are the same as computed by np.quantile
+    def __init__(self) -> None:
+        self._chunks: list[npt.NDArray[np.float64]] = []
+
+    @property
+    def count(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def update(self, values: "NumericArray") -> "ExactQuantileEstimator":
+        self._chunks.append(np.asarray(values, dtype=np.float64).ravel())
+        return self
+
+    def merge(self, other: "ExactQuantileEstimator") -> "ExactQuantileEstimator":
+        self._chunks.extend(other._chunks)
+        return self
+
+    def quantile(self, q: float) -> float:
+        if not self._chunks:
+            raise ValueError("Cannot compute quantile without any values.")
+
+        values = self._chunks[0] if len(self._chunks) == 1 else np.concatenate(self._chunks)
+        return float(np.quantile(values, q))
+
+
+class KLLQuantileEstimator:
+    # Mergeable sketch with bounded memory (KLL with equal capacities of all levels). Items on
+    # a level h represent 2^h values. When a level exceeds the capacity, its sorted items are
+    # compacted by keeping every second one (with a random offset) and moving them a level up.
+    # Minimum and maximum are tracked exactly, since compaction can drop the extreme items.
+    def __init__(self, capacity: int = 4096, seed: int | None = 0) -> None:
+        if capacity < 2:
+            raise ValueError("Capacity must be at least 2.")
+
+        self.capacity = capacity
+        self._levels: list[npt.NDArray[np.float64]] = []
+        self._rng = np.random.default_rng(seed)
+        self._min = np.inf
+        self._max = -np.inf
+
+    @property
+    def count(self) -> int:
+        return sum(len(items) << level for level, items in enumerate(self._levels))
+
+    def update(self, values: "NumericArray") -> "KLLQuantileEstimator":
+        items = np.asarray(values, dtype=np.float64).ravel()
+        if len(items):
+            self._min = min(self._min, float(items.min()))
+            self._max = max(self._max, float(items.max()))
+
+        self._add(0, items)
+        self._compact()
+        return self
+
+    def merge(self, other: "KLLQuantileEstimator") -> "KLLQuantileEstimator":
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        for level, items in enumerate(other._levels):
+            self._add(level, items)
+        self._compact()
+        return self
+
+    def quantile(self, q: float) -> float:
+        if not any(len(items) for items in self._levels):
+            raise ValueError("Cannot compute quantile without any values.")
+        if q <= 0:
+            return self._min
+        if q >= 1:
+            return self._max
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [
+                np.full(len(level_items), 1 << level, dtype=np.int64)
+                for level, level_items in enumerate(self._levels)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        cumulative_weights = np.cumsum(weights[order])
+
+        # Inverted cumulative distribution of the weighted items
+        rank = q * cumulative_weights[-1]
+        index = min(int(np.searchsorted(cumulative_weights, rank, side="left")), len(items) - 1)
+        return float(items[order[index]])
+
+    def _add(self, level: int, items: "npt.NDArray[np.float64]") -> None:
+        while len(self._levels) <= level:
+            self._levels.append(np.empty(0, dtype=np.float64))
+
+        self._levels[level] = np.concatenate([self._levels[level], items])
+
+    def _compact(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # Odd item stays on the level, so the total weight is preserved
+                leftover, items = items[: len(items) % 2], items[len(items) % 2 :]
+                offset = int(self._rng.integers(2))
+                self._levels[level] = leftover
+                self._add(level + 1, items[offset::2])
+            level += 1
+
+
+def get_quantile_estimator(
+    method: QUANTILE_METHOD,
+) -> ExactQuantileEstimator | KLLQuantileEstimator:
+    if method == "exact":
+        return ExactQuantileEstimator()
+    if method == "kll":
+        return KLLQuantileEstimator()
+
+    raise ValueError(f"Unknown quantile method: {method}. Available methods: exact, kll.")
@@ -0,0 +1,118 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from bivario.legend import DPI
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy.typing as npt
+
+WEB_MERCATOR_CRS = 3857
+# Geometry indexes are encoded in 24-bit RGB colours, zero is reserved for the background
+_MAX_GEOMETRIES = 2**24 - 1
+
+
+def rasterize_geometries(
+    geometries: "gpd.GeoSeries",
+    colours: "npt.NDArray[np.floating]",
+    size_px: int,
+) -> tuple["npt.NDArray[np.uint8]", tuple[float, float, float, float]]:
+    if geometries.crs is None:
+        raise ValueError("Geometries must have a defined CRS to be rasterized.")
+    if size_px < 1:
+        raise ValueError("size_px must be a positive integer.")
+    if len(geometries) > _MAX_GEOMETRIES:
+        raise ValueError(f"Cannot rasterize more than {_MAX_GEOMETRIES:,} geometries.")
+
+    from geopandas import GeoSeries
+
+    geometries = geometries.to_crs(WEB_MERCATOR_CRS)
+
+    minx, miny, maxx, maxy = geometries.total_bounds
+    # Keep a non-zero extent for a single point or a horizontal / vertical line
+    if maxx == minx:
+        minx, maxx = minx - 0.5, maxx + 0.5
+    if maxy == miny:
+        miny, maxy = miny - 0.5, maxy + 0.5
+
+    scale = size_px / max(maxx - minx, maxy - miny)
+    width_px = max(1, round((maxx - minx) * scale))
+    height_px = max(1, round((maxy - miny) * scale))
+
+    pixel_ids = draw_geometry_ids(
+        geometries,
+        geometry_ids=np.arange(1, len(geometries) + 1, dtype=np.int64),
+        bounds=(minx, miny, maxx, maxy),
+        width_px=width_px,
+        height_px=height_px,
+    )
+    image = get_colours_lookup(colours)[pixel_ids]
+
+    corners = GeoSeries.from_xy([minx, maxx], [miny, maxy], crs=WEB_MERCATOR_CRS).to_crs(4326)
+    bounds = (
+        float(corners.x.iloc[0]),
+        float(corners.y.iloc[0]),
+        float(corners.x.iloc[1]),
+        float(corners.y.iloc[1]),
+    )
+
+    return image, bounds
+
+
+def draw_geometry_ids(
+    geometries: "gpd.GeoSeries",
+    geometry_ids: "npt.NDArray[np.int64]",
+    bounds: tuple[float, float, float, float],
+    width_px: int,
+    height_px: int,
+) -> "npt.NDArray[np.int64]":
+    # Returns the id of the geometry drawn in each pixel (zero for the background), first row of
+    # the image is the maximum y
+    minx, miny, maxx, maxy = bounds
+
+    fig = Figure(figsize=(width_px / DPI, height_px / DPI), dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+
+    # Geometries are drawn with opaque colours encoding their id, so each pixel gets exactly
+    # one geometry, without blending the colours of overlapping borders
+    id_colours = (
+        np.column_stack(((geometry_ids >> 16) & 255, (geometry_ids >> 8) & 255, geometry_ids & 255))
+        / 255
+    )
+
+    polygons_mask = geometries.geom_type.isin(("Polygon", "MultiPolygon")).to_numpy()
+    if polygons_mask.any():
+        geometries[polygons_mask].plot(
+            ax=ax, color=id_colours[polygons_mask], linewidth=0, antialiased=False, aspect=None
+        )
+    if (~polygons_mask).any():
+        geometries[~polygons_mask].plot(
+            ax=ax, color=id_colours[~polygons_mask], antialiased=False, aspect=None
+        )
+
+    ax.set_xlim(minx, maxx)
+    ax.set_ylim(miny, maxy)
+    canvas.draw()  # type: ignore[no-untyped-call]
+
+    buffer = np.asarray(canvas.buffer_rgba())  # type: ignore[no-untyped-call]
+    pixel_ids: npt.NDArray[np.int64] = (
+        buffer[..., 0].astype(np.int64) << 16
+        | buffer[..., 1].astype(np.int64) << 8
+        | buffer[..., 2]
+    )
+    pixel_ids[buffer[..., 3] == 0] = 0
+
+    return pixel_ids
+
+
+def get_colours_lookup(colours: "npt.NDArray[np.floating]") -> "npt.NDArray[np.uint8]":
+    # Colours of the geometries as RGBA bytes, indexed by the geometry id
+    colours_lookup = np.zeros((len(colours) + 1, 4), dtype=np.uint8)
+    colours_lookup[1:] = np.round(np.clip(colours, 0, 1) * 255)
+    return colours_lookup
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, cast
 
-from mapclassify import classify
-from mapclassify.classifiers import _format_intervals
+import numpy as np
+
+from bivario._native_schemes import Binning, classify_native
+from bivario._natural_breaks import classify_natural_breaks
 
 if TYPE_CHECKING:
     from mapclassify.classifiers import MapClassifier
@@ -23,6 +25,8 @@ class MapclassifyResult:
     scheme_b: str | None
     k_a: int
     k_b: int
+    bins_a: "NumericArray | None" = None
+    bins_b: "NumericArray | None" = None
 
 
 def apply_mapclassify(
@@ -30,34 +34,26 @@ def apply_mapclassify(
     values_b: "NumericArray",
     scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] = True,
     k: int | tuple[int, int] = 5,
+    natural_breaks_sample_size: int | None = None,
 ) -> MapclassifyResult:
     tick_labels_a = None
     tick_labels_b = None
+    bins_a = None
+    bins_b = None
 
-    if isinstance(scheme, (tuple, list)):
-        scheme_a, scheme_b = scheme
-    else:
-        scheme_a = scheme_b = scheme
-
-    if isinstance(k, (tuple, list)):
-        k_a, k_b = k
-    else:
-        k_a = k_b = k
-
-    if isinstance(scheme_a, bool):
-        scheme_a = "NaturalBreaks" if scheme_a else None
-    if isinstance(scheme_b, bool):
-        scheme_b = "NaturalBreaks" if scheme_b else None
+    scheme_a, scheme_b, k_a, k_b = parse_schemes(scheme=scheme, k=k)
 
     if scheme_a is not None:
-        binning_a = cast("MapClassifier", classify(values_a, scheme=scheme_a, k=k_a))
+        binning_a = _classify(values_a, scheme_a, k_a, natural_breaks_sample_size)
+        tick_labels_a = format_tick_labels(float(values_a.min()), binning_a.bins)
         values_a = binning_a.yb
-        tick_labels_a = [_l.replace(".0", "") for _l in _format_intervals(binning_a, "{:,.1f}")[0]]
+        bins_a = binning_a.bins
 
     if scheme_b is not None:
-        binning_b = cast("MapClassifier", classify(values_b, scheme=scheme_b, k=k_b))
+        binning_b = _classify(values_b, scheme_b, k_b, natural_breaks_sample_size)
+        tick_labels_b = format_tick_labels(float(values_b.min()), binning_b.bins)
         values_b = binning_b.yb
-        tick_labels_b = [_l.replace(".0", "") for _l in _format_intervals(binning_b, "{:,.1f}")[0]]
+        bins_b = binning_b.bins
 
     return MapclassifyResult(
         values_a=values_a,
@@ -68,4 +64,61 @@ def apply_mapclassify(
         scheme_b=scheme_b,
         k_a=k_a,
         k_b=k_b,
+        bins_a=bins_a,
+        bins_b=bins_b,
     )
+
+
+def _classify(
+    values: "NumericArray", scheme: str, k: int, natural_breaks_sample_size: int | None
+) -> "MapClassifier | Binning":
+    scheme_name = normalize_scheme_name(scheme)
+
+    # Natural breaks are computed with an exact dynamic programming algorithm instead of
+    # the k-means used by mapclassify
+    if scheme_name == "naturalbreaks":
+        return classify_natural_breaks(values, k=k, sample_size=natural_breaks_sample_size)
+
+    # Common schemes are computed natively, mapclassify (with scipy and scikit-learn) is imported
+    # only for the other ones
+    binning = classify_native(values, scheme_name, k)
+    if binning is not None:
+        return binning
+
+    from mapclassify import classify
+
+    return cast("MapClassifier", classify(values, scheme=scheme, k=k))
+
+
+def normalize_scheme_name(scheme: str) -> str:
+    # Same as scheme names parsing in mapclassify classify function
+    return scheme.lower().replace("_", "")
+
+
+def parse_schemes(
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE], k: int | tuple[int, int]
+) -> tuple[str | None, str | None, int, int]:
+    if isinstance(scheme, (tuple, list)):
+        scheme_a, scheme_b = scheme
+    else:
+        scheme_a = scheme_b = scheme
+
+    if isinstance(k, (tuple, list)):
+        k_a, k_b = k
+    else:
+        k_a = k_b = k
+
+    if isinstance(scheme_a, bool):
+        scheme_a = "NaturalBreaks" if scheme_a else None
+    if isinstance(scheme_b, bool):
+        scheme_b = "NaturalBreaks" if scheme_b else None
+
+    return scheme_a, scheme_b, k_a, k_b
+
+
+def format_tick_labels(lowest: float, bins: "NumericArray") -> list[str]:
+    # Same edges as mapclassify legend intervals, with open lower bound if first bin is lower
+    if lowest > bins[0]:
+        lowest = -np.inf
+
+    return [f"{edge:,.1f}".replace(".0", "") for edge in (lowest, *bins)]
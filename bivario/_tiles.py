@@ -0,0 +1,302 @@
+import abc
+import gzip
+import json
+import multiprocessing
+import sqlite3
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# Half of the Web Mercator extent, same in both axes
+WEB_MERCATOR_HALF_SIZE = 20037508.342789244
+MAX_ZOOM = 24
+
+TILE = tuple[int, int, int]
+TILE_FORMAT = Literal["png", "pbf"]
+
+# Data used for rendering the tiles, set once in each worker process
+RENDER_STATE: dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class TilesetMetadata:
+    # Same keys as in the MBTiles metadata table
+    name: str
+    tile_format: TILE_FORMAT
+    min_zoom: int
+    max_zoom: int
+    bounds: tuple[float, float, float, float]
+    description: str = ""
+    # Saved as the MBTiles "json" metadata value, e.g. with the vector layers of MVT tiles
+    json_metadata: dict[str, Any] | None = field(default=None)
+
+    def to_mbtiles(self) -> dict[str, str]:
+        minx, miny, maxx, maxy = self.bounds
+        metadata = {
+            "name": self.name,
+            "format": self.tile_format,
+            "type": "overlay",
+            "description": self.description,
+            "minzoom": str(self.min_zoom),
+            "maxzoom": str(self.max_zoom),
+            "bounds": f"{minx},{miny},{maxx},{maxy}",
+            "center": f"{(minx + maxx) / 2},{(miny + maxy) / 2},{self.min_zoom}",
+        }
+        if self.json_metadata is not None:
+            metadata["json"] = json.dumps(self.json_metadata)
+
+        return metadata
+
+
+def validate_zoom_range(min_zoom: int, max_zoom: int) -> None:
+    if not 0 <= min_zoom <= max_zoom <= MAX_ZOOM:
+        raise ValueError(f"Zoom range must satisfy 0 <= min_zoom <= max_zoom <= {MAX_ZOOM}.")
+
+
+def tile_bounds(tile: TILE) -> tuple[float, float, float, float]:
+    # Bounds of the tile in Web Mercator coordinates, y tiles are counted from the top
+    z, x, y = tile
+    tile_size = 2 * WEB_MERCATOR_HALF_SIZE / (1 << z)
+    minx = x * tile_size - WEB_MERCATOR_HALF_SIZE
+    maxy = WEB_MERCATOR_HALF_SIZE - y * tile_size
+    return minx, maxy - tile_size, minx + tile_size, maxy
+
+
+def iter_zoom_tiles(
+    geometries: "gpd.GeoSeries", min_zoom: int, max_zoom: int, margin_px: float, tile_size_px: int
+) -> Iterable[list[TILE]]:
+    # Yields tiles intersecting the geometries (in Web Mercator), zoom by zoom. Only children of
+    # the non-empty tiles are checked on the next zoom, so empty areas are skipped quickly
+    import shapely
+
+    minx, miny, maxx, maxy = np.clip(
+        geometries.total_bounds, -WEB_MERCATOR_HALF_SIZE, WEB_MERCATOR_HALF_SIZE
+    )
+    tiles_range = 1 << min_zoom
+    tile_size = 2 * WEB_MERCATOR_HALF_SIZE / tiles_range
+    min_x, max_x = (
+        int(np.clip((value + WEB_MERCATOR_HALF_SIZE) // tile_size, 0, tiles_range - 1))
+        for value in (minx, maxx)
+    )
+    min_y, max_y = (
+        int(np.clip((WEB_MERCATOR_HALF_SIZE - value) // tile_size, 0, tiles_range - 1))
+        for value in (maxy, miny)
+    )
+    candidates = [
+        (min_zoom, x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)
+    ]
+
+    for zoom in range(min_zoom, max_zoom + 1):
+        if not candidates:
+            return
+
+        boxes = shapely.box(
+            *np.array([query_bounds(tile, margin_px, tile_size_px) for tile in candidates]).T
+        )
+        tile_indexes = np.unique(geometries.sindex.query(boxes)[0])
+        tiles = [candidates[index] for index in tile_indexes]
+        yield tiles
+
+        if zoom < max_zoom:
+            candidates = [
+                (zoom + 1, 2 * x + dx, 2 * y + dy)
+                for _, x, y in tiles
+                for dx in (0, 1)
+                for dy in (0, 1)
+            ]
+
+
+def query_bounds(
+    tile: TILE, margin_px: float, tile_size_px: int
+) -> tuple[float, float, float, float]:
+    # Tile bounds extended by a margin, so markers and lines drawn partially over the tile border
+    # are included
+    minx, miny, maxx, maxy = tile_bounds(tile)
+    margin = margin_px * (maxx - minx) / tile_size_px
+    return minx - margin, miny - margin, maxx + margin, maxy + margin
+
+
+class TileWriter(abc.ABC):
+    def __init__(self, path: Path, metadata: TilesetMetadata) -> None:
+        self.path = path
+        self.metadata = metadata
+
+    def __enter__(self) -> "TileWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close(finalize=exc_type is None)
+
+    def tile_order_key(self, tile: TILE) -> Any:
+        return tile
+
+    @abc.abstractmethod
+    def write_tile(self, tile: TILE, data: bytes) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def close(self, finalize: bool = True) -> None:
+        raise NotImplementedError
+
+
+class DirectoryTileWriter(TileWriter):
+    # Tiles saved as {z}/{x}/{y}.{format} files, with a metadata.json file (same as tippecanoe)
+    def __init__(self, path: Path, metadata: TilesetMetadata) -> None:
+        super().__init__(path, metadata)
+        path.mkdir(parents=True, exist_ok=True)
+
+    def write_tile(self, tile: TILE, data: bytes) -> None:
+        z, x, y = tile
+        tile_path = self.path / str(z) / str(x) / f"{y}.{self.metadata.tile_format}"
+        tile_path.parent.mkdir(parents=True, exist_ok=True)
+        tile_path.write_bytes(data)
+
+    def close(self, finalize: bool = True) -> None:
+        if finalize:
+            (self.path / "metadata.json").write_text(json.dumps(self.metadata.to_mbtiles()))
+
+
+class MBTilesTileWriter(TileWriter):
+    # SQLite database following the MBTiles 1.3 specification, with rows counted from the bottom
+    def __init__(self, path: Path, metadata: TilesetMetadata) -> None:
+        super().__init__(path, metadata)
+        path.unlink(missing_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            "CREATE TABLE metadata (name TEXT, value TEXT);"
+            "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, "
+            "tile_data BLOB);"
+            "CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);"
+        )
+
+    def write_tile(self, tile: TILE, data: bytes) -> None:
+        z, x, y = tile
+        if self.metadata.tile_format == "pbf":
+            data = gzip.compress(data, mtime=0)
+        self.connection.execute(
+            "INSERT INTO tiles VALUES (?, ?, ?, ?)", (z, x, (1 << z) - 1 - y, data)
+        )
+
+    def close(self, finalize: bool = True) -> None:
+        if finalize:
+            self.connection.executemany(
+                "INSERT INTO metadata VALUES (?, ?)", self.metadata.to_mbtiles().items()
+            )
+            self.connection.commit()
+        self.connection.close()
+
+
+class PMTilesTileWriter(TileWriter):
+    # Single file archive following the PMTiles v3 specification, tiles are written in the order
+    # of their ids, so the archive is clustered
+    def __init__(self, path: Path, metadata: TilesetMetadata) -> None:
+        try:
+            from pmtiles.writer import Writer
+        except (ImportError, ModuleNotFoundError) as ex:
+            raise ImportError(
+                "The 'pmtiles' package "
+                "is required for writing PMTiles archives. You can install it using "
+                "'pip install pmtiles'."
+            ) from ex
+
+        super().__init__(path, metadata)
+        self.file = path.open("wb")
+        self.writer: Writer = Writer(self.file)  # type: ignore[no-untyped-call]
+
+    def tile_order_key(self, tile: TILE) -> Any:
+        from pmtiles.tile import zxy_to_tileid
+
+        return zxy_to_tileid(*tile)
+
+    def write_tile(self, tile: TILE, data: bytes) -> None:
+        from pmtiles.tile import zxy_to_tileid
+
+        if self.metadata.tile_format == "pbf":
+            data = gzip.compress(data, mtime=0)
+        self.writer.write_tile(zxy_to_tileid(*tile), data)  # type: ignore[no-untyped-call]
+
+    def close(self, finalize: bool = True) -> None:
+        if finalize:
+            from pmtiles.convert import mbtiles_to_header_json
+
+            header, metadata = mbtiles_to_header_json(  # type: ignore[no-untyped-call]
+                self.metadata.to_mbtiles()
+            )
+            # PMTiles metadata is a single JSON object, so the values are stored at the top level
+            if self.metadata.json_metadata is not None:
+                metadata.pop("json")
+                metadata.update(self.metadata.json_metadata)
+            self.writer.finalize(header, metadata)  # type: ignore[no-untyped-call]
+        self.file.close()
+
+
+def get_tile_writer(path: str | Path, metadata: TilesetMetadata) -> TileWriter:
+    # Archive type is selected by the file extension, other paths are directories
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".mbtiles":
+        return MBTilesTileWriter(path, metadata)
+    if suffix == ".pmtiles":
+        return PMTilesTileWriter(path, metadata)
+
+    return DirectoryTileWriter(path, metadata)
+
+
+def write_tiles(
+    render_tile: Callable[[TILE], bytes | None],
+    render_state: dict[str, Any],
+    geometries: "gpd.GeoSeries",
+    output: str | Path,
+    metadata: TilesetMetadata,
+    margin_px: float,
+    tile_size_px: int,
+    processes: int | None,
+) -> None:
+    # Tiles of each zoom are rendered in parallel and written in the order of the writer, empty
+    # tiles (rendered as None) are skipped
+    executor = None
+    if processes != 1:
+        # Workers are spawned, since forking a process with running threads can deadlock
+        executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_set_render_state,
+            initargs=(render_state,),
+        )
+    else:
+        _set_render_state(render_state)
+
+    try:
+        with get_tile_writer(output, metadata) as writer:
+            for zoom_tiles in iter_zoom_tiles(
+                geometries,
+                min_zoom=metadata.min_zoom,
+                max_zoom=metadata.max_zoom,
+                margin_px=margin_px,
+                tile_size_px=tile_size_px,
+            ):
+                tiles = sorted(zoom_tiles, key=writer.tile_order_key)
+                rendered_tiles = (
+                    map(render_tile, tiles)
+                    if executor is None
+                    else executor.map(render_tile, tiles, chunksize=16)
+                )
+                for tile, data in zip(tiles, rendered_tiles, strict=True):
+                    if data is not None:
+                        writer.write_tile(tile, data)
+    finally:
+        if executor is None:
+            RENDER_STATE.clear()
+        else:
+            executor.shutdown()
+
+
+def _set_render_state(render_state: dict[str, Any]) -> None:
+    RENDER_STATE.update(render_state)
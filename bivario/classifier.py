@@ -0,0 +1,282 @@
+"""Reusable bivariate classifier module."""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from bivario._colouring import _classify_with_bins
+from bivario._scheme import (
+    SCHEME_TYPE,
+    MapclassifyResult,
+    apply_mapclassify,
+    format_tick_labels,
+    parse_schemes,
+)
+from bivario.cmap import _validate_values
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from bivario.typing import NumericArray, ValueInput
+
+__all__ = ["BivariateClassifier"]
+
+_USER_DEFINED_SCHEME = "UserDefined"
+
+
+class BivariateClassifier:
+    """
+    Bivariate classifier fitted once and reused for classifying new values.
+
+    Stores bin edges and tick labels for both variables, so values from different batches
+    (e.g. streaming partitions or map tiles) are assigned to the same classes and coloured
+    consistently. Can be passed to the plotting functions with the `scheme` parameter.
+    Alpha values are still normalized separately for each plotted dataset.
+
+    Attributes:
+        scheme_a (str | None): Binning scheme of the first variable. None if not binned.
+        scheme_b (str | None): Binning scheme of the second variable. None if not binned.
+        k_a (int): Requested number of classes of the first variable.
+        k_b (int): Requested number of classes of the second variable.
+        sample_size (int | None): Number of values sampled for fitting the NaturalBreaks scheme.
+        bins_a (npt.NDArray[np.float64] | None): Upper bounds of the classes of the first
+            variable. None if not fitted or not binned.
+        bins_b (npt.NDArray[np.float64] | None): Upper bounds of the classes of the second
+            variable. None if not fitted or not binned.
+        tick_labels_a (list[str] | None): Legend tick labels of the first variable.
+        tick_labels_b (list[str] | None): Legend tick labels of the second variable.
+        range_a (tuple[float, float] | None): Minimum and maximum value of the first variable
+            in the reference data. None if not fitted.
+        range_b (tuple[float, float] | None): Minimum and maximum value of the second variable
+            in the reference data. None if not fitted.
+    """
+
+    def __init__(
+        self,
+        scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] = True,
+        k: int | tuple[int, int] = 5,
+        sample_size: int | None = None,
+    ) -> None:
+        """
+        Initialize bivariate classifier.
+
+        Args:
+            scheme (str | None | bool | tuple, optional): Mapclassify binning scheme for the data.
+                If True, uses NaturalBreaks. If False or None, no binning is applied.
+                If str, uses the specified scheme. Can also define two different schemes for
+                both variables. Defaults to True.
+            k (int | tuple[int, int], optional): Number of classes for binning. Can define two
+                different values for both variables. Defaults to 5.
+            sample_size (int | None, optional): Number of randomly sampled values used to fit
+                the NaturalBreaks scheme. Useful for speeding up fitting on large datasets.
+                The last class always covers the maximum value. If None, all values are used.
+                Defaults to None.
+        """
+        self.scheme_a, self.scheme_b, self.k_a, self.k_b = parse_schemes(scheme=scheme, k=k)
+        self.sample_size = sample_size
+
+        self.bins_a: npt.NDArray[np.float64] | None = None
+        self.bins_b: npt.NDArray[np.float64] | None = None
+        self.tick_labels_a: list[str] | None = None
+        self.tick_labels_b: list[str] | None = None
+        self.range_a: tuple[float, float] | None = None
+        self.range_b: tuple[float, float] | None = None
+
+    def __repr__(self) -> str:
+        """Text representation of the classifier."""
+        return (
+            f"{self.__class__.__name__}(scheme=({self.scheme_a!r}, {self.scheme_b!r}),"
+            f" k=({self.k_a}, {self.k_b}), fitted={self.is_fitted})"
+        )
+
+    @classmethod
+    def from_breaks(
+        cls,
+        bins_a: "NumericArray | list[float] | None",
+        bins_b: "NumericArray | list[float] | None",
+        range_a: tuple[float, float] | None = None,
+        range_b: tuple[float, float] | None = None,
+    ) -> "BivariateClassifier":
+        """
+        Create a fitted classifier from explicit class breaks.
+
+        Args:
+            bins_a (NumericArray | list[float] | None): Upper bounds of the classes of the first
+                variable, in increasing order. Values above the last bound are assigned to the
+                last class. If None, the first variable isn't binned.
+            bins_b (NumericArray | list[float] | None): Upper bounds of the classes of the second
+                variable, in increasing order. Values above the last bound are assigned to the
+                last class. If None, the second variable isn't binned.
+            range_a (tuple[float, float] | None, optional): Minimum and maximum value of the first
+                variable. Used for the lowest tick label of binned variable and for
+                normalization of the variable without binning. Required if `bins_a` is None.
+                Defaults to None.
+            range_b (tuple[float, float] | None, optional): Minimum and maximum value of the second
+                variable. Used for the lowest tick label of binned variable and for
+                normalization of the variable without binning. Required if `bins_b` is None.
+                Defaults to None.
+
+        Returns:
+            BivariateClassifier: Fitted classifier.
+
+        Raises:
+            ValueError: If bins are empty or not increasing, or range is missing for variable
+                without binning.
+        """
+        classifier = cls(
+            scheme=(
+                None if bins_a is None else _USER_DEFINED_SCHEME,
+                None if bins_b is None else _USER_DEFINED_SCHEME,
+            ),
+            k=(0 if bins_a is None else len(bins_a), 0 if bins_b is None else len(bins_b)),
+        )
+        classifier.bins_a, classifier.tick_labels_a, classifier.range_a = _parse_breaks(
+            bins_a, range_a, "a"
+        )
+        classifier.bins_b, classifier.tick_labels_b, classifier.range_b = _parse_breaks(
+            bins_b, range_b, "b"
+        )
+        return classifier
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether the classifier has been fitted."""
+        return self.range_a is not None and self.range_b is not None
+
+    def fit(self, values_a: "ValueInput", values_b: "ValueInput") -> "BivariateClassifier":
+        """
+        Fit classes of both variables on the reference values.
+
+        Args:
+            values_a (ValueInput): List or array of reference values for first variable.
+            values_b (ValueInput): List or array of reference values for second variable.
+
+        Returns:
+            BivariateClassifier: Fitted classifier (self).
+        """
+        parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
+
+        scheme_result = apply_mapclassify(
+            values_a=parsed_values_a,
+            values_b=parsed_values_b,
+            scheme=(self.scheme_a, self.scheme_b),
+            k=(self.k_a, self.k_b),
+            natural_breaks_sample_size=self.sample_size,
+        )
+
+        self.bins_a = _to_float_array(scheme_result.bins_a)
+        self.bins_b = _to_float_array(scheme_result.bins_b)
+        self.tick_labels_a = scheme_result.tick_labels_a
+        self.tick_labels_b = scheme_result.tick_labels_b
+        self.range_a = (float(parsed_values_a.min()), float(parsed_values_a.max()))
+        self.range_b = (float(parsed_values_b.min()), float(parsed_values_b.max()))
+
+        return self
+
+    def transform(
+        self, values_a: "ValueInput", values_b: "ValueInput"
+    ) -> tuple["NumericArray", "NumericArray"]:
+        """
+        Assign values of both variables to the fitted classes.
+
+        Values of a variable without binning are returned unchanged.
+
+        Args:
+            values_a (ValueInput): List or array of values for first variable.
+            values_b (ValueInput): List or array of values for second variable.
+
+        Returns:
+            tuple[NumericArray, NumericArray]: Class indexes (or values) of both variables.
+
+        Raises:
+            ValueError: If classifier hasn't been fitted.
+        """
+        parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
+        self._check_is_fitted()
+
+        return (
+            _classify_with_bins(parsed_values_a, self.bins_a),
+            _classify_with_bins(parsed_values_b, self.bins_b),
+        )
+
+    def fit_transform(
+        self, values_a: "ValueInput", values_b: "ValueInput"
+    ) -> tuple["NumericArray", "NumericArray"]:
+        """
+        Fit classes on the values and assign the same values to them.
+
+        Args:
+            values_a (ValueInput): List or array of values for first variable.
+            values_b (ValueInput): List or array of values for second variable.
+
+        Returns:
+            tuple[NumericArray, NumericArray]: Class indexes (or values) of both variables.
+        """
+        return self.fit(values_a, values_b).transform(values_a, values_b)
+
+    def _check_is_fitted(self) -> None:
+        if not self.is_fitted:
+            raise ValueError(
+                "Classifier must be fitted with the `fit` method before classifying values."
+            )
+
+    def _scheme_result(
+        self, values_a: "NumericArray", values_b: "NumericArray"
+    ) -> MapclassifyResult:
+        # Same result as apply_mapclassify, but with the fitted bins and tick labels
+        self._check_is_fitted()
+
+        return MapclassifyResult(
+            values_a=_classify_with_bins(values_a, self.bins_a),
+            values_b=_classify_with_bins(values_b, self.bins_b),
+            tick_labels_a=self.tick_labels_a,
+            tick_labels_b=self.tick_labels_b,
+            scheme_a=self.scheme_a,
+            scheme_b=self.scheme_b,
+            k_a=self.k_a if self.bins_a is None else len(self.bins_a),
+            k_b=self.k_b if self.bins_b is None else len(self.bins_b),
+            bins_a=self.bins_a,
+            bins_b=self.bins_b,
+        )
+
+    def _ranges(
+        self,
+    ) -> tuple[tuple[float, float], tuple[float, float], tuple[float, float], tuple[float, float]]:
+        # Classes are normalized with all fitted classes, not only the ones present in a batch
+        self._check_is_fitted()
+        assert self.range_a is not None and self.range_b is not None
+
+        class_range_a = self.range_a if self.bins_a is None else (0.0, float(len(self.bins_a) - 1))
+        class_range_b = self.range_b if self.bins_b is None else (0.0, float(len(self.bins_b) - 1))
+        return self.range_a, self.range_b, class_range_a, class_range_b
+
+
+def _parse_breaks(
+    bins: "NumericArray | list[float] | None", value_range: tuple[float, float] | None, name: str
+) -> tuple["npt.NDArray[np.float64] | None", list[str] | None, tuple[float, float]]:
+    if bins is None:
+        if value_range is None:
+            raise ValueError(f"Range of values must be provided if `bins_{name}` is None.")
+        return None, None, value_range
+
+    parsed_bins = np.asarray(bins, dtype=np.float64)
+    if parsed_bins.ndim != 1 or len(parsed_bins) == 0:
+        raise ValueError(f"`bins_{name}` must be a non-empty list of values.")
+    if np.any(np.diff(parsed_bins) <= 0):
+        raise ValueError(f"`bins_{name}` must be strictly increasing.")
+
+    if value_range is None:
+        # Without known minimum, the first class has an open lower bound
+        tick_labels = format_tick_labels(-np.inf, parsed_bins)
+        value_range = (float(parsed_bins[0]), float(parsed_bins[-1]))
+    else:
+        tick_labels = format_tick_labels(value_range[0], parsed_bins)
+
+    return parsed_bins, tick_labels, value_range
+
+
+def _to_float_array(bins: "NumericArray | None") -> "npt.NDArray[np.float64] | None":
+    if bins is None:
+        return None
+
+    return np.asarray(bins, dtype=np.float64)
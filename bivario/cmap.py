@@ -141,25 +141,10 @@ class MplCmapBivariateColourmap(BivariateColourmap):
         va_colour_oklab = XYZ_to_Oklab(sRGB_to_XYZ(va_colour))
         vb_colour_oklab = XYZ_to_Oklab(sRGB_to_XYZ(vb_colour))
 
-        z_colour = np.zeros_like(va_colour, dtype=float)
-
-        it = np.nditer(
-            np.zeros(z_colour.shape[:-1]), flags=["multi_index"], op_flags=[["readwrite"]]
-        )
-        while not it.finished:
-            pos_a, pos_b = values_a[it.multi_index], values_b[it.multi_index]
-
-            loc_diff = pos_b - pos_a
-            lerp_t = (loc_diff + 1) / 2
-
-            colour_a = va_colour_oklab[it.multi_index]
-            colour_b = vb_colour_oklab[it.multi_index]
-
-            mixed_colour = _lerp(colour_a, colour_b, lerp_t)
-            mixed_colour_rgb = np.clip(XYZ_to_sRGB(Oklab_to_XYZ(mixed_colour)), 0, 1)
-
-            z_colour[it.multi_index] = mixed_colour_rgb
-            it.iternext()
+        # Colours of all values are mixed at once, the lerp position broadcasts over channels
+        lerp_t = (np.asarray(values_b, dtype=float) - values_a + 1)[..., None] / 2
+        mixed_colour = _lerp(va_colour_oklab, vb_colour_oklab, lerp_t)
+        z_colour = np.clip(XYZ_to_sRGB(Oklab_to_XYZ(mixed_colour)), 0, 1)
 
         return z_colour
 
@@ -195,27 +180,20 @@ class CornersBivariateColourmap(BivariateColourmap):
     def _apply_colours(
         self, values_a: "NumericArray", values_b: "NumericArray", **kwargs: Any
     ) -> "BivariateColourmapArray":
-        z_colour = np.zeros((*values_a.shape, 3), dtype=float)
-
         a_colour_oklab = XYZ_to_Oklab(sRGB_to_XYZ(np.array(self.a_colour)))
         b_colour_oklab = XYZ_to_Oklab(sRGB_to_XYZ(np.array(self.b_colour)))
         low_colour_oklab = XYZ_to_Oklab(sRGB_to_XYZ(np.array(self.low_colour)))
         high_colour_oklab = XYZ_to_Oklab(sRGB_to_XYZ(np.array(self.high_colour)))
 
-        it = np.nditer(
-            np.zeros(z_colour.shape[:-1]), flags=["multi_index"], op_flags=[["readwrite"]]
-        )
-        while not it.finished:
-            pos_a, pos_b = values_a[it.multi_index], values_b[it.multi_index]
-
-            first_colour = _lerp(low_colour_oklab, a_colour_oklab, pos_a)
-            second_colour = _lerp(b_colour_oklab, high_colour_oklab, pos_a)
-            middle_colour = _lerp(first_colour, second_colour, pos_b)
+        # Colours of all values are mixed at once, the lerp positions broadcast over channels
+        pos_a = np.asarray(values_a, dtype=float)[..., None]
+        pos_b = np.asarray(values_b, dtype=float)[..., None]
 
-            mixed_colour_rgb = np.clip(XYZ_to_sRGB(Oklab_to_XYZ(middle_colour)), 0, 1)
+        first_colour = _lerp(low_colour_oklab, a_colour_oklab, pos_a)
+        second_colour = _lerp(b_colour_oklab, high_colour_oklab, pos_a)
+        middle_colour = _lerp(first_colour, second_colour, pos_b)
 
-            z_colour[it.multi_index] = mixed_colour_rgb
-            it.iternext()
+        z_colour = np.clip(XYZ_to_sRGB(Oklab_to_XYZ(middle_colour)), 0, 1)
 
         return z_colour
 
@@ -369,7 +347,9 @@ def get_bivariate_cmap(
 
 
 def _lerp(
-    c_a: "npt.NDArray[np.floating]", c_b: "npt.NDArray[np.floating]", t: float
+    c_a: "npt.NDArray[np.floating]",
+    c_b: "npt.NDArray[np.floating]",
+    t: "float | npt.NDArray[np.floating]",
 ) -> "npt.NDArray[np.floating]":
     return (1 - t) * c_a + t * c_b
 
@@ -388,6 +368,22 @@ def _validate_values(
     return values_a_array, values_b_array
 
 
+def _count_missing_values(values: "NumericArray") -> int:
+    # Only floats can hold NaN, nulls are converted to NaN by numpy
+    if values.dtype.kind != "f":
+        return 0
+
+    return int(np.isnan(values).sum())
+
+
+def _validate_missing_values(missing_a: int, missing_b: int) -> None:
+    if missing_a or missing_b:
+        raise ValueError(
+            "Values can't contain nulls or NaNs. "
+            f"Found {missing_a} missing values in values_a and {missing_b} in values_b."
+        )
+
+
 def _normalize_values(values: "NumericArray") -> "NumericArray":
     v_min: float = values.astype(float).min()
     v_max: float = values.astype(float).max()
@@ -400,7 +396,8 @@ def _values_to_numpy(values: "ValueInput") -> "NumericArray":
     try:
         values_array: np.ndarray = nw.from_native(values, series_only=True).to_numpy()
     except TypeError:
-        values_array = np.array(values)
+        # Already converted arrays aren't copied
+        values_array = np.asarray(values)
 
     _validate_numeric_noncomplex(values_array)
 
@@ -1,21 +1,40 @@
 """Example datasets for bivario package."""
 
+from functools import cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal, overload
+
+import numpy as np
 
 if TYPE_CHECKING:
     import geopandas as gpd
+    import pandas as pd
+
+__all__ = ["nyc_bike_trips", "synthetic_bike_trips"]
+
+_NYC_BIKE_TRIPS_PATH = Path(__file__).parent / "nyc_bike_trips.npz"
+_GEOMETRY_KEYS = ("geometry_coordinates", "geometry_ring_offsets", "geometry_polygon_offsets")
+_VALUE_COLUMNS = ["morning_starts", "morning_ends", "afternoon_starts", "afternoon_ends"]
+
+
+@overload
+def nyc_bike_trips(geometry: Literal[True] = True) -> "gpd.GeoDataFrame": ...
 
-__all__ = ["nyc_bike_trips"]
 
+@overload
+def nyc_bike_trips(geometry: Literal[False]) -> "pd.DataFrame": ...
 
-def nyc_bike_trips() -> "gpd.GeoDataFrame":
+
+def nyc_bike_trips(geometry: bool = True) -> "gpd.GeoDataFrame | pd.DataFrame":
     """
     Load example NYC bike trips data as a GeoDataFrame.
 
     Contains H3-indexed bike trip start and end locations in New York City.
     Starts and split into morning and afternoon trips.
 
+    Data is stored in a binary format with geometries saved as coordinates arrays, so no
+    geometry parsing is needed. Data is loaded once per process and each call returns a copy.
+
     Available columns:
         - h3: H3 index of the location
         - morning_starts: Number of bike trips starting in the morning
@@ -24,8 +43,14 @@ def nyc_bike_trips() -> "gpd.GeoDataFrame":
         - afternoon_ends: Number of bike trips ending in the afternoon
         - geometry: Geometry of the H3 cell
 
+    Args:
+        geometry (bool, optional): Whether to load geometries of the H3 cells. If False, returns
+            a DataFrame without the geometry column, to be plotted using the H3 cells indexes.
+            Defaults to True.
+
     Returns:
-        gpd.GeoDataFrame: A GeoDataFrame containing NYC bike trips data.
+        gpd.GeoDataFrame | pd.DataFrame: A GeoDataFrame containing NYC bike trips data or
+            a DataFrame without geometries.
 
     Examples:
         Plot example folium map with this data:
@@ -38,6 +63,105 @@ def nyc_bike_trips() -> "gpd.GeoDataFrame":
         ... )
         <folium.folium.Map object at 0x...>
     """
+    # Copies are returned, so modifying the data doesn't change the cached frames
+    return _load_nyc_bike_trips(geometry).copy()
+
+
+@overload
+def synthetic_bike_trips(
+    size: int = 100_000, geometry: Literal[True] = True, seed: int | None = 0
+) -> "gpd.GeoDataFrame": ...
+
+
+@overload
+def synthetic_bike_trips(
+    size: int, geometry: Literal[False], seed: int | None = 0
+) -> "pd.DataFrame": ...
+
+
+def synthetic_bike_trips(
+    size: int = 100_000, geometry: bool = True, seed: int | None = 0
+) -> "gpd.GeoDataFrame | pd.DataFrame":
+    """
+    Generate a synthetic dataset with the same columns as the NYC bike trips data.
+
+    Useful for benchmarking with larger data. Geometries are regular hexagons (of a similar size
+    to the NYC H3 cells) arranged in a grid starting in New York City. Rows of trips counts are
+    resampled from the NYC data and scaled with a smooth spatial trend, keeping the relation
+    between the columns.
+
+    The `h3` column contains sequential cell identifiers instead of real H3 indexes, so this
+    data can't be plotted using H3 cells indexes.
+
+    Args:
+        size (int, optional): Number of rows to generate. Defaults to 100 000.
+        geometry (bool, optional): Whether to generate geometries. If False, returns a DataFrame
+            without the geometry column. Defaults to True.
+        seed (int | None, optional): Seed of the random numbers generator. Defaults to 0.
+
+    Returns:
+        gpd.GeoDataFrame | pd.DataFrame: A GeoDataFrame with synthetic bike trips data or
+            a DataFrame without geometries.
+
+    Raises:
+        ValueError: If size is not positive.
+
+    Examples:
+        >>> from bivario.example_data import synthetic_bike_trips
+        >>> gdf = synthetic_bike_trips(10_000)
+        >>> len(gdf)
+        10000
+    """
+    if size < 1:
+        raise ValueError("size must be a positive integer.")
+
+    nyc_data = _load_nyc_bike_trips(geometry=True)
+
+    import geopandas as gpd
+
+    # Pointy-top hexagons with a radius of an average NYC cell, longitudes are scaled to keep
+    # the shape regular around the New York latitude
+    minx, miny, _, maxy = nyc_data.total_bounds
+    bounds = nyc_data.geometry.bounds
+    radius = float((bounds["maxy"] - bounds["miny"]).mean()) / 2
+    lon_scale = 1 / np.cos(np.deg2rad((miny + maxy) / 2))
+
+    columns = int(np.ceil(np.sqrt(size)))
+    indexes = np.arange(size)
+    rows, cols = np.divmod(indexes, columns)
+    centre_x = minx + (cols + 0.5 * (rows % 2)) * np.sqrt(3) * radius * lon_scale
+    centre_y = miny + rows * 1.5 * radius
+
+    # Counts are higher in the middle of the grid, similar to a city centre
+    grid_x = cols / max(columns - 1, 1) - 0.5
+    grid_y = rows / max(rows.max(), 1) - 0.5
+    trend = 0.25 + np.exp(-(grid_x**2 + grid_y**2) / 0.1)
+
+    rng = np.random.default_rng(seed)
+    sampled_values = nyc_data[_VALUE_COLUMNS].to_numpy()[rng.integers(len(nyc_data), size=size)]
+    values = rng.poisson(sampled_values * trend[:, None]).astype(np.int64)
+
+    df = gpd.pd.DataFrame(
+        {"h3": indexes.astype(np.int64), **dict(zip(_VALUE_COLUMNS, values.T, strict=True))}
+    )
+    if not geometry:
+        return df
+
+    import shapely
+
+    angles = np.deg2rad(30 + 60 * np.arange(7))
+    vertices = np.stack(
+        (
+            centre_x[:, None] + radius * lon_scale * np.cos(angles),
+            centre_y[:, None] + radius * np.sin(angles),
+        ),
+        axis=-1,
+    )
+    return gpd.GeoDataFrame(df, geometry=shapely.polygons(vertices), crs=4326)
+
+
+@cache
+def _load_nyc_bike_trips(geometry: bool) -> "gpd.GeoDataFrame | pd.DataFrame":
     try:
         import geopandas as gpd
     except (ImportError, ModuleNotFoundError) as ex:
@@ -48,7 +172,16 @@ def nyc_bike_trips() -> "gpd.GeoDataFrame":
             "or 'pip install geopandas'."
         ) from ex
 
-    data_path = Path(__file__).parent / "nyc_bike_trips.csv.gz"
-    df = gpd.pd.read_csv(data_path)
-    gdf = gpd.GeoDataFrame(df, geometry=gpd.GeoSeries.from_wkt(df["geometry"], crs=4326))
-    return gdf
+    with np.load(_NYC_BIKE_TRIPS_PATH) as data:
+        df = gpd.pd.DataFrame({key: data[key] for key in data.files if key not in _GEOMETRY_KEYS})
+        if not geometry:
+            return df
+
+        import shapely
+
+        coordinates, ring_offsets, polygon_offsets = (data[key] for key in _GEOMETRY_KEYS)
+
+    geometries = shapely.from_ragged_array(
+        shapely.GeometryType.POLYGON, coordinates, (ring_offsets, polygon_offsets)
+    )
+    return gpd.GeoDataFrame(df, geometry=geometries, crs=4326)
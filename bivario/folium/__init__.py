@@ -1,38 +1,59 @@
 """Bivariate folium maps module."""
 
 import warnings
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, cast
 
-from matplotlib.colors import rgb2hex
+import numpy as np
 
-from bivario._alpha import prepare_alpha_values
 from bivario._constants import DARK_MODE_TILES_KEYWORDS
-from bivario._scheme import SCHEME_TYPE, apply_mapclassify
-from bivario.cmap import BivariateColourmap, _validate_values, get_bivariate_cmap
-from bivario.legend import plot_bivariate_legend
+from bivario._prepared import prepare_bivariate_data
+from bivario._raster import rasterize_geometries
+from bivario._scheme import SCHEME_TYPE
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import BivariateColourmap, get_bivariate_cmap
 
 if TYPE_CHECKING:
     import folium
     import geopandas as gpd
+    import numpy.typing as npt
+    import pandas as pd
     import xyzservices
     from matplotlib.figure import Figure
 
-    from bivario.typing import ValueInput
+    from bivario.typing import BivariateColourmapArray, ValueInput
+
+# Same property as created by GeoPandas when passing a list of colours to the explore function,
+# excluded by GeoPandas from tooltip and popup fields
+_FOLIUM_COLOUR_PROPERTY = "__folium_color"
+_ALPHA_PROPERTY = "__bivario_alpha"
+_CLASS_PROPERTY = "__bivario_class"
+_GEOMETRY = "__bivario_geometry"
+_HEX_BYTES = np.array([f"{i:02x}" for i in range(256)])
 
 
 def explore_bivariate_data(
-    gdf: "gpd.GeoDataFrame",
+    gdf: "gpd.GeoDataFrame | pd.DataFrame",
     column_a: "str | ValueInput",
     column_b: "str | ValueInput",
     column_a_label: str | None = None,
     column_b_label: str | None = None,
-    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] = True,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
     k: int | tuple[int, int] = 5,
     tiles: "str | folium.TileLayer | xyzservices.TileProvider | None" = None,
     cmap: BivariateColourmap | str | None = None,
     dark_mode: bool | None = None,
     alpha: bool = True,
     alpha_norm_quantile: float = 0.9,
+    class_styles: bool = False,
+    alpha_bins: int = 10,
+    precision: int | None = None,
+    simplify_tolerance: float | None = None,
+    topojson: bool = False,
+    keep_columns: list[str] | None = None,
+    raster: bool = False,
+    raster_size_px: int = 2048,
+    h3_column: str | None = None,
     legend: bool = True,
     legend_size_px: int = 200,
     legend_max_grid_size: int | None = 100,
@@ -47,19 +68,23 @@ def explore_bivariate_data(
     Explore geospatial data with a bivariate colormap on a folium map.
 
     Args:
-        gdf (gpd.GeoDataFrame): Geospatial data to plot.
+        gdf (gpd.GeoDataFrame | pd.DataFrame): Geospatial data to plot. Can be a DataFrame
+            without geometries if `h3_column` is set.
         column_a (str | ValueInput): Column name for the first variable or list/array of values.
         column_b (str | ValueInput): Column name for the second variable or list/array of values.
         column_a_label (str | None, optional): Label for column a. If None, will use column name.
             Defaults to None.
         column_b_label (str | None, optional): Label for column b. If None, will use column name.
             Defaults to None.
-        scheme (str | None | bool | tuple, optional): Mapclassify binning scheme for the data.
-            If True, uses "NaturalBreaks". If False, no binning is applied.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Mapclassify binning
+            scheme for the data. If True, uses "NaturalBreaks". If False, no binning is applied.
             If str, uses the specified scheme. If None, no binning is applied. Can also define
-            two different values for columns a and b. Defaults to True.
+            two different values for columns a and b. If a fitted `BivariateClassifier`, its
+            classes are reused, so different datasets are coloured consistently.
+            Defaults to True.
         k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
-            different values for columns a and b. Defaults to 5.
+            different values for columns a and b. Ignored if scheme is a `BivariateClassifier`.
+            Defaults to 5.
         tiles (str | folium.TileLayer | xyzservices.TileProvider | None, optional): Tile layer
             for the map. If None, will set based on dark mode - "CartoDB DarkMatter" for the
             dark mode, and "CartoDB Positron" for the light mode. Defaults to None.
@@ -73,6 +98,37 @@ def explore_bivariate_data(
         alpha_norm_quantile (float, optional): Quantile for normalizing alpha transparency.
             Will be used to calculate the maximum value for alpha scaling. It is recommended to use
             value below 1 to avoid outliers affecting the transparency too much. Defaults to 0.9.
+        class_styles (bool, optional): Whether to write a table of unique styles to the map once
+            and only store a style class index in each feature. Reduces the size of the map for
+            binned data, where there are at most k_a * k_b colours. Alpha values are rounded
+            to `alpha_bins` steps in this mode. Defaults to False.
+        alpha_bins (int, optional): Number of alpha transparency steps used with
+            `class_styles=True`. Defaults to 10.
+        precision (int | None, optional): Number of decimal places kept in the geometry
+            coordinates (in EPSG:4326). Reduces the size of the map. If None, coordinates are
+            kept as is. Defaults to None.
+        simplify_tolerance (float | None, optional): Tolerance (in degrees) of
+            the topology-preserving simplification applied to geometries. If None, geometries
+            are not simplified. Defaults to None.
+        topojson (bool, optional): Whether to encode geometries as TopoJSON, storing borders
+            shared between features only once. Requires `topojson` package. Coordinates are
+            quantized during encoding and simplification doesn't break shared borders.
+            Defaults to False.
+        keep_columns (list[str] | None, optional): Columns kept in the features properties
+            written to the map. Columns used in the tooltip and popup are always kept, all other
+            columns are dropped before serialization. If set and tooltip isn't defined, tooltip
+            shows only the kept columns. Defaults to None.
+        raster (bool, optional): Whether to rasterize the coloured geometries into a single image
+            (in Web Mercator) added to the map as an image overlay. Useful for datasets too large
+            for vector layers in the browser. Tooltip, popup, styling and geometry encoding
+            options are not used in this mode. Defaults to False.
+        raster_size_px (int, optional): Size of the longer side of the raster image in pixels.
+            Used with `raster=True`. Defaults to 2048.
+        h3_column (str | None, optional): Column with H3 cells indexes (as integers or strings).
+            If set, only cells indexes and properties are written to the map and hexagons are
+            generated in the browser using `h3-js` library. Geometries are not used in this mode,
+            so `gdf` can be any pandas DataFrame. Geometry encoding options and raster mode are
+            not supported. Defaults to None.
         legend (bool, optional): Whether to add a bivariate legend to the map. Defaults to True.
         legend_size_px (int, optional): Size of the legend in pixels. Defaults to 200.
         legend_max_grid_size (int | None, optional): Max size of the legend grid used for plotting
@@ -122,6 +178,18 @@ def explore_bivariate_data(
         ... )
         <folium.folium.Map object at 0x...>
 
+        Plot H3 cells without parsing their geometries:
+        >>> from bivario.example_data import nyc_bike_trips
+        >>> from bivario import explore_bivariate_data
+        >>> df = nyc_bike_trips(geometry=False)
+        >>> explore_bivariate_data(
+        ...     df,
+        ...     column_a="morning_starts",
+        ...     column_b="morning_ends",
+        ...     h3_column="h3",
+        ... )
+        <folium.folium.Map object at 0x...>
+
         Plot without binning (numerical values) and different legend position:
         >>> from bivario.example_data import nyc_bike_trips
         >>> from bivario import explore_bivariate_data
@@ -136,8 +204,166 @@ def explore_bivariate_data(
         ... )
         <folium.folium.Map object at 0x...>
     """
+    m, _ = _explore_bivariate_data(
+        gdf=gdf,
+        column_a=column_a,
+        column_b=column_b,
+        column_a_label=column_a_label,
+        column_b_label=column_b_label,
+        scheme=scheme,
+        k=k,
+        tiles=tiles,
+        cmap=cmap,
+        dark_mode=dark_mode,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        class_styles=class_styles,
+        alpha_bins=alpha_bins,
+        precision=precision,
+        simplify_tolerance=simplify_tolerance,
+        topojson=topojson,
+        keep_columns=keep_columns,
+        raster=raster,
+        raster_size_px=raster_size_px,
+        h3_column=h3_column,
+        legend=legend,
+        legend_size_px=legend_size_px,
+        legend_max_grid_size=legend_max_grid_size,
+        legend_loc=legend_loc,
+        legend_offset_px=legend_offset_px,
+        legend_background=legend_background,
+        legend_border=legend_border,
+        legend_kwargs=legend_kwargs,
+        **kwargs,
+    )
+    return m
+
+
+def save_bivariate_map(
+    path: str | Path,
+    gdf: "gpd.GeoDataFrame | pd.DataFrame",
+    column_a: "str | ValueInput",
+    column_b: "str | ValueInput",
+    sidecar: bool = False,
+    **kwargs: Any,
+) -> None:
+    """
+    Save a folium map with bivariate data to an HTML file, streaming the features to the output.
+
+    Features are never converted to GeoJSON all at once, neither when building the map
+    nor when writing it, so the peak memory stays bounded for maps with many features.
+
+    Args:
+        path (str | Path): Path of the output HTML file.
+        gdf (gpd.GeoDataFrame | pd.DataFrame): Geospatial data to plot. Can be a DataFrame
+            without geometries if `h3_column` is set.
+        column_a (str | ValueInput): Column name for the first variable or list/array of values.
+        column_b (str | ValueInput): Column name for the second variable or list/array of values.
+        sidecar (bool, optional): Whether to write the features to a separate GeoJSON file next to
+            the HTML file (with the same name and `.geojson` suffix) loaded by the page. Such map
+            has to be served over HTTP, since browsers block loading local files. If False,
+            features are written inside the HTML file. Defaults to False.
+        **kwargs (Any): Additional keyword arguments for the `explore_bivariate_data` function.
+            TopoJSON encoding is not supported.
+
+    Examples:
+        Save NYC bike trips map to a file:
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> from bivario.example_data import nyc_bike_trips
+        >>> from bivario.folium import save_bivariate_map
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     save_bivariate_map(
+        ...         Path(tmpdir) / "map.html",
+        ...         nyc_bike_trips(),
+        ...         column_a="morning_starts",
+        ...         column_b="morning_ends",
+        ...     )
+    """
+    m, features_gdf = _explore_bivariate_data(
+        gdf, column_a=column_a, column_b=column_b, stream_features=True, **kwargs
+    )
+
+    import folium
+
+    from bivario.folium._geojson import StreamedFeatures, write_features
+
+    path = Path(path)
+    if features_gdf is None:
+        # Rasterized map doesn't contain any features and H3 cells are already stored compactly
+        m.save(path)
+        return
+
+    layer = next(child for child in m._children.values() if isinstance(child, folium.GeoJson))
+
+    if sidecar:
+        features_path = path.with_suffix(".geojson")
+        layer.embed = False
+        layer.embed_link = features_path.name
+
+        with features_path.open("w", encoding="utf-8") as file:
+            write_features(file, features_gdf)
+
+        m.save(path)
+    else:
+        streamed_features = StreamedFeatures()
+        layer.add_child(streamed_features)
+        html_head, html_tail = m.get_root().render().split(streamed_features.placeholder)
+
+        with path.open("w", encoding="utf-8") as file:
+            file.write(html_head)
+            write_features(file, features_gdf)
+            file.write(html_tail)
+
+
+def _explore_bivariate_data(
+    gdf: "gpd.GeoDataFrame | pd.DataFrame",
+    column_a: "str | ValueInput",
+    column_b: "str | ValueInput",
+    column_a_label: str | None = None,
+    column_b_label: str | None = None,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
+    k: int | tuple[int, int] = 5,
+    tiles: "str | folium.TileLayer | xyzservices.TileProvider | None" = None,
+    cmap: BivariateColourmap | str | None = None,
+    dark_mode: bool | None = None,
+    alpha: bool = True,
+    alpha_norm_quantile: float = 0.9,
+    class_styles: bool = False,
+    alpha_bins: int = 10,
+    precision: int | None = None,
+    simplify_tolerance: float | None = None,
+    topojson: bool = False,
+    keep_columns: list[str] | None = None,
+    raster: bool = False,
+    raster_size_px: int = 2048,
+    h3_column: str | None = None,
+    legend: bool = True,
+    legend_size_px: int = 200,
+    legend_max_grid_size: int | None = 100,
+    legend_loc: Literal["bl", "br", "tl", "tr"] | None = None,
+    legend_offset_px: float | tuple[float, float] | None = None,
+    legend_background: bool = True,
+    legend_border: bool = True,
+    legend_kwargs: dict[str, Any] | None = None,
+    stream_features: bool = False,
+    **kwargs: Any,
+) -> tuple["folium.Map", "gpd.GeoDataFrame | None"]:
     # alpha - yes / no - allow iterable as list of floats between 0 and 1
 
+    if stream_features and topojson:
+        raise ValueError("TopoJSON encoding is not supported with streamed features.")
+
+    if h3_column is not None:
+        if topojson or raster:
+            raise ValueError("TopoJSON encoding and raster mode are not supported for H3 cells.")
+        if h3_column not in gdf.columns:
+            raise ValueError(f"Column '{h3_column}' not found in GeoDataFrame.")
+
+        # Cells are converted to polygons in the browser
+        h3_cells = _to_h3_strings(gdf[h3_column].to_numpy())
+        gdf = _without_geometries(gdf)
+
     for column in (column_a, column_b):
         if isinstance(column, str) and column not in gdf.columns:
             raise ValueError(f"Column '{column}' not found in GeoDataFrame.")
@@ -145,8 +371,6 @@ def explore_bivariate_data(
     original_values_a = gdf[column_a] if isinstance(column_a, str) else column_a
     original_values_b = gdf[column_b] if isinstance(column_b, str) else column_b
 
-    values_a, values_b = _validate_values(original_values_a, original_values_b)
-
     # If tiles are not defined - set based on dark mode
     if tiles is None:
         if dark_mode is None:
@@ -169,30 +393,21 @@ def explore_bivariate_data(
 
     set_alpha = alpha  # now its bool, but can be a list of values, then check if not empty
 
-    if set_alpha:
-        alpha_values = prepare_alpha_values(
-            values_a=values_a, values_b=values_b, alpha_norm_quantile=alpha_norm_quantile
-        ).tolist()
-
-        if "style_kwds" not in kwargs:
-            kwargs["style_kwds"] = {}
-
-        kwargs["style_kwds"]["style_function"] = lambda x: dict(
-            opacity=0, fillOpacity=alpha_values[int(x["id"])]
-        )
-
-    scheme_result = apply_mapclassify(values_a=values_a, values_b=values_b, scheme=scheme, k=k)
+    # Values are validated, classified and scaled once for the colours, alpha and legend
+    prepared_data = prepare_bivariate_data(
+        original_values_a,
+        original_values_b,
+        scheme=scheme,
+        k=k,
+        alpha=set_alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        label_a=column_a_label,
+        label_b=column_b_label,
+    )
 
     cmap = get_bivariate_cmap(cmap)
 
-    values_cmap = cmap(
-        values_a=scheme_result.values_a,
-        values_b=scheme_result.values_b,
-        normalize=True,
-        dark_mode=dark_mode,
-    )
-
-    hex_values = [rgb2hex(tuple(values_cmap[i, :])) for i in range(values_cmap.shape[0])]
+    values_cmap = prepared_data.colour(cmap, dark_mode=dark_mode)
 
     if "legend" in kwargs:
         kwargs.pop("legend")
@@ -203,14 +418,158 @@ def explore_bivariate_data(
             "Embed folium parameter must be set to true. Ignoring user definition.", stacklevel=0
         )
 
-    m = gdf.explore(
-        color=hex_values,
-        legend=False,
-        tiles=tiles,
-        embed=True,
-        **kwargs,
+    # Resolve tooltip and popup fields before adding helper columns to the GeoDataFrame.
+    # Default tooltip would keep all the columns, so it's limited to the kept ones.
+    default_tooltip = True if keep_columns is None else (keep_columns or False)
+    for fields_key, default_fields in (("tooltip", default_tooltip), ("popup", False)):
+        kwargs[fields_key] = _resolve_fields(gdf, kwargs.get(fields_key, default_fields))
+
+    gdf = _select_columns(
+        gdf, keep_columns=keep_columns, fields=(kwargs["tooltip"], kwargs["popup"])
     )
 
+    if h3_column is None:
+        gdf = _reduce_geometries(
+            gdf,
+            precision=precision,
+            # TopoJSON simplification is done on shared arcs during encoding
+            simplify_tolerance=None if topojson else simplify_tolerance,
+        )
+
+    style_kwds = kwargs.get("style_kwds") or {}
+    set_stroke_colour = "color" not in style_kwds
+
+    alpha_values = prepared_data.alpha_values
+    static_style = {}
+    if set_alpha:
+        static_style["opacity"] = 0
+
+    rgb_values = _to_rgb_bytes(values_cmap)
+
+    image = None
+    if raster:
+        raster_colours = np.ones((len(rgb_values), 4), dtype=np.float64)
+        raster_colours[:, :3] = rgb_values / 255
+        if alpha_values is not None:
+            raster_colours[:, 3] = alpha_values
+
+        image, image_bounds = rasterize_geometries(
+            gdf.geometry, colours=raster_colours, size_px=raster_size_px
+        )
+    elif class_styles:
+        class_keys = (
+            rgb_values[:, 0].astype(np.int64) << 16
+            | rgb_values[:, 1].astype(np.int64) << 8
+            | rgb_values[:, 2]
+        ) * (alpha_bins + 1)
+        if alpha_values is not None:
+            class_keys += np.round(alpha_values * alpha_bins).astype(np.int64)
+
+        unique_class_keys, unique_rows, class_indexes = np.unique(
+            class_keys, return_index=True, return_inverse=True
+        )
+
+        class_styles_table = []
+        for hex_value, class_key in zip(
+            _to_hex_colours(rgb_values[unique_rows]), unique_class_keys.tolist(), strict=True
+        ):
+            class_style: dict[str, Any] = {"fillColor": hex_value}
+            if set_stroke_colour:
+                class_style["color"] = hex_value
+            if alpha_values is not None:
+                class_style["fillOpacity"] = (class_key % (alpha_bins + 1)) / alpha_bins
+            class_styles_table.append(class_style)
+
+        gdf = gdf.assign(**{_CLASS_PROPERTY: class_indexes.reshape(-1)})
+    else:
+        property_style = {"fillColor": _FOLIUM_COLOUR_PROPERTY}
+        if set_stroke_colour:
+            property_style["color"] = _FOLIUM_COLOUR_PROPERTY
+
+        gdf = gdf.assign(**{_FOLIUM_COLOUR_PROPERTY: _to_hex_colours(rgb_values)})
+
+        if alpha_values is not None:
+            gdf = gdf.assign(**{_ALPHA_PROPERTY: alpha_values})
+            property_style["fillOpacity"] = _ALPHA_PROPERTY
+
+    h3_properties = None
+    if h3_column is not None:
+        h3_properties = _to_properties_columns(gdf)
+        if h3_column in h3_properties:
+            # Integer indexes would lose precision as JavaScript numbers
+            h3_properties[h3_column] = h3_cells
+        # Folium needs a single feature with properties for the tooltip and popup fields, map is
+        # fitted to the cells bounds in the browser
+        gdf = _point_placeholder(gdf)
+
+    features_gdf = gdf if stream_features and not raster and h3_column is None else None
+    if image is not None or features_gdf is not None:
+        # Folium only gets the bounds of the data to set the map location and zoom,
+        # features are added as an image or written to the output separately
+        gdf = _bounds_placeholder(gdf)
+
+    m = gdf.explore(legend=False, tiles=tiles, embed=True, **kwargs)
+
+    try:
+        import folium
+
+        from bivario.folium._geojson import (
+            H3Features,
+            apply_class_style,
+            apply_property_style,
+            apply_topojson_encoding,
+        )
+    except (ImportError, ModuleNotFoundError) as ex:
+        raise ImportError(
+            "The 'folium>=0.12' package "
+            "is required for plotting folium map. You can install it using "
+            "'conda install -c conda-forge \"folium>=0.12\"' "
+            "or 'pip install \"folium>=0.12\"'."
+        ) from ex
+
+    if image is not None:
+        for child_name, child in list(m._children.items()):
+            if isinstance(child, folium.GeoJson):
+                del m._children[child_name]
+
+        minx, miny, maxx, maxy = image_bounds
+        folium.raster_layers.ImageOverlay(
+            image=image, bounds=[[miny, minx], [maxy, maxx]], name="bivariate data"
+        ).add_to(m)
+
+    fit_h3_bounds = False
+    if h3_properties is not None:
+        for child_name, child in list(m._children.items()):
+            if isinstance(child, folium.map.FitBounds):
+                del m._children[child_name]
+                fit_h3_bounds = True
+
+    for child in m._children.values():
+        if not isinstance(child, folium.GeoJson):
+            continue
+
+        if class_styles:
+            apply_class_style(
+                child,
+                class_property=_CLASS_PROPERTY,
+                class_styles=class_styles_table,
+                style=static_style,
+            )
+        else:
+            apply_property_style(child, property_style=property_style, style=static_style)
+
+        if topojson:
+            apply_topojson_encoding(child, simplify_tolerance=simplify_tolerance)
+
+        if features_gdf is not None or h3_properties is not None:
+            # Keep the first feature properties for the tooltip and popup fields validation
+            child.data["features"][0]["geometry"] = None
+
+        if h3_properties is not None:
+            child.add_child(
+                H3Features(cells=h3_cells, properties=h3_properties, fit_bounds=fit_h3_bounds)
+            )
+
     if legend:
         try:
             from bivario.folium._legend import FloatBivariateMatplotlibLegend
@@ -224,32 +583,12 @@ def explore_bivariate_data(
 
         legend_kwargs = legend_kwargs or {}
 
-        grid_size: int | tuple[int, int]
-        numerical_grid_size = legend_max_grid_size or legend_size_px
-        if scheme_result.scheme_a is scheme_result.scheme_b is None:
-            grid_size = numerical_grid_size
-        else:
-            grid_size_y = (
-                numerical_grid_size if scheme_result.scheme_a is None else scheme_result.k_a
-            )
-            grid_size_x = (
-                numerical_grid_size if scheme_result.scheme_b is None else scheme_result.k_b
-            )
-            grid_size = (grid_size_x, grid_size_y)
-
-        ax = plot_bivariate_legend(
-            values_a=original_values_a,
-            values_b=original_values_b,
-            cmap=cmap,
-            label_a=column_a_label,
-            label_b=column_b_label,
-            tick_labels_a=scheme_result.tick_labels_a,
-            tick_labels_b=scheme_result.tick_labels_b,
-            font_colour="#333" if legend_background else None,
-            grid_size=grid_size,
+        legend_spec = prepared_data.legend_spec(
+            cmap,
             dark_mode=dark_mode,
-            **legend_kwargs,
+            numerical_grid_size=legend_max_grid_size or legend_size_px,
         )
+        ax = legend_spec.plot(font_colour="#333" if legend_background else None, **legend_kwargs)
 
         fig = cast("Figure", ax.figure)
 
@@ -264,4 +603,117 @@ def explore_bivariate_data(
             padding_top_right_corner=scheme is not None,
         ).add_to(m)
 
-    return m
+    return m, features_gdf
+
+
+def _to_rgb_bytes(values_cmap: "BivariateColourmapArray") -> "npt.NDArray[np.uint8]":
+    return np.round(np.clip(values_cmap[:, :3], 0, 1) * 255).astype(np.uint8)
+
+
+def _to_hex_colours(rgb_values: "npt.NDArray[np.uint8]") -> list[str]:
+    hex_values = np.char.add(
+        np.char.add(np.char.add("#", _HEX_BYTES[rgb_values[:, 0]]), _HEX_BYTES[rgb_values[:, 1]]),
+        _HEX_BYTES[rgb_values[:, 2]],
+    )
+    return cast("list[str]", hex_values.tolist())
+
+
+def _reduce_geometries(
+    gdf: "gpd.GeoDataFrame", precision: int | None, simplify_tolerance: float | None
+) -> "gpd.GeoDataFrame":
+    if precision is None and simplify_tolerance is None:
+        return gdf
+
+    import shapely
+    from geopandas import GeoSeries
+
+    # Precision and tolerance are defined in degrees, same as the GeoJSON output
+    if gdf.crs is not None and not gdf.crs.equals(4326):
+        gdf = gdf.to_crs(4326)
+
+    geometries = gdf.geometry.to_numpy()
+    if simplify_tolerance is not None:
+        geometries = shapely.simplify(geometries, simplify_tolerance, preserve_topology=True)
+    if precision is not None:
+        geometries = shapely.transform(geometries, lambda coords: np.round(coords, precision))
+
+    return gdf.set_geometry(GeoSeries(geometries, index=gdf.index, crs=gdf.crs))
+
+
+def _bounds_placeholder(gdf: "gpd.GeoDataFrame") -> "gpd.GeoDataFrame":
+    import shapely
+    from geopandas import GeoSeries
+
+    placeholder = gdf.iloc[:1]
+    return placeholder.set_geometry(
+        GeoSeries([shapely.box(*gdf.total_bounds)], index=placeholder.index, crs=gdf.crs)
+    )
+
+
+def _without_geometries(df: "gpd.GeoDataFrame | pd.DataFrame") -> "gpd.GeoDataFrame":
+    from geopandas import GeoDataFrame, GeoSeries
+
+    if isinstance(df, GeoDataFrame):
+        df = df.drop(columns=df.geometry.name)
+
+    return GeoDataFrame(
+        df, geometry=GeoSeries(np.full(len(df), None), index=df.index, crs=4326, name=_GEOMETRY)
+    )
+
+
+def _to_h3_strings(cells: "npt.NDArray[Any]") -> list[str]:
+    if np.issubdtype(cells.dtype, np.integer):
+        return [format(cell, "x") for cell in cells.astype(np.uint64).tolist()]
+
+    return cast("list[str]", cells.astype(str).tolist())
+
+
+def _to_properties_columns(gdf: "gpd.GeoDataFrame") -> dict[str, list[Any]]:
+    properties = gdf.drop(columns=gdf.geometry.name)
+    # Missing values are written as nulls, same as in GeoPandas
+    columns = {}
+    for column in properties.columns:
+        values = properties[column].astype(object)
+        columns[str(column)] = values.where(values.notna(), None).tolist()
+
+    return columns
+
+
+def _point_placeholder(gdf: "gpd.GeoDataFrame") -> "gpd.GeoDataFrame":
+    import shapely
+    from geopandas import GeoSeries
+
+    placeholder = gdf.iloc[:1]
+    return placeholder.set_geometry(
+        GeoSeries([shapely.Point(0, 0)], index=placeholder.index, crs=4326)
+    )
+
+
+def _resolve_fields(gdf: "gpd.GeoDataFrame", fields: Any) -> Any:
+    # Mirrors GeoPandas explore parsing of tooltip and popup fields
+    if fields is True:
+        return gdf.columns.drop(gdf.geometry.name).to_list()
+    if isinstance(fields, int) and not isinstance(fields, bool) and fields > 0:
+        return gdf.columns.drop(gdf.geometry.name).to_list()[:fields]
+
+    return fields
+
+
+def _select_columns(
+    gdf: "gpd.GeoDataFrame", keep_columns: list[str] | None, fields: tuple[Any, ...]
+) -> "gpd.GeoDataFrame":
+    columns = list(keep_columns or [])
+    for field in fields:
+        if isinstance(field, str):
+            columns.append(field)
+        elif isinstance(field, (list, tuple)):
+            columns.extend(field)
+
+    for column in columns:
+        if column not in gdf.columns:
+            raise ValueError(f"Column '{column}' not found in GeoDataFrame.")
+
+    geometry_column = gdf.geometry.name
+    columns = [column for column in dict.fromkeys(columns) if column != geometry_column]
+
+    return gdf[[*columns, geometry_column]]
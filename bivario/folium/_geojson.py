@@ -0,0 +1,366 @@
+"""Client-side styling and encoding of Folium GeoJson layers."""
+
+import json
+from typing import TYPE_CHECKING, Any, TextIO, cast
+
+from branca.element import MacroElement
+from folium import GeoJson
+from folium.elements import JSCSSMixin
+from folium.template import Template
+from folium.utilities import JsCode
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    from folium.utilities import TypeJsonValueNoNone
+
+__all__ = [
+    "H3Features",
+    "StreamedFeatures",
+    "TopoJsonFeatures",
+    "apply_class_style",
+    "apply_property_style",
+    "apply_topojson_encoding",
+    "write_features",
+]
+
+_TOPOJSON_OBJECT_NAME = "data"
+_FEATURES_CHUNK_SIZE = 10_000
+
+
+class TopoJsonFeatures(JSCSSMixin, MacroElement):
+    """Adds features encoded as TopoJSON to the parent GeoJson layer."""
+
+    _template = Template(
+        """
+            {% macro script(this, kwargs) %}
+                var {{ this.get_name() }} = {{ this.topology|tojson }};
+                {{ this._parent.get_name() }}.addData(
+                    topojson.feature(
+                        {{ this.get_name() }},
+                        {{ this.get_name() }}.objects[{{ this.object_name|tojson }}]
+                    )
+                );
+            {% endmacro %}
+            """
+    )
+
+    default_js = [
+        ("topojson", "https://cdnjs.cloudflare.com/ajax/libs/topojson/1.6.9/topojson.min.js"),
+    ]
+
+    def __init__(self, topology: dict[str, Any], object_name: str = _TOPOJSON_OBJECT_NAME) -> None:
+        """
+        Create TopoJSON features element for a GeoJson layer.
+
+        Features are decoded in the browser and added to the parent layer, so they use its
+        style, highlight, tooltip and popup.
+
+        Args:
+            topology (dict[str, Any]): TopoJSON topology.
+            object_name (str, optional): Name of the topology object with features.
+                Defaults to "data".
+        """
+        super().__init__()  # type: ignore[no-untyped-call]
+        self._name = TopoJsonFeatures.__name__
+        self.topology = topology
+        self.object_name = object_name
+
+
+class StreamedFeatures(MacroElement):
+    """Adds features written directly to the output file to the parent GeoJson layer."""
+
+    _template = Template(
+        """
+            {% macro script(this, kwargs) %}
+                {{ this._parent.get_name() }}.addData({{ this.placeholder }});
+            {% endmacro %}
+            """
+    )
+
+    def __init__(self) -> None:
+        """
+        Create placeholder for features of a GeoJson layer.
+
+        Rendered map contains the `placeholder` string in place of the features, which has to be
+        replaced with a GeoJSON FeatureCollection when writing the map to a file.
+        """
+        super().__init__()  # type: ignore[no-untyped-call]
+        self._name = StreamedFeatures.__name__
+        self.placeholder = f"/* {self.get_name()} */"
+
+
+class H3Features(JSCSSMixin, MacroElement):
+    """Adds H3 cells, converted to polygons in the browser, to the parent GeoJson layer."""
+
+    _template = Template(
+        """
+            {% macro script(this, kwargs) %}
+                var {{ this.get_name() }} = {{ this.cells_data }};
+                {{ this._parent.get_name() }}.addData({
+                    "type": "FeatureCollection",
+                    "features": {{ this.get_name() }}.cells.map(function(cell, idx) {
+                        var properties = {};
+                        for (var key in {{ this.get_name() }}.properties) {
+                            properties[key] = {{ this.get_name() }}.properties[key][idx];
+                        }
+                        return {
+                            "type": "Feature",
+                            "geometry": {
+                                "type": "Polygon",
+                                "coordinates": [h3.cellToBoundary(cell, true)]
+                            },
+                            "properties": properties
+                        };
+                    })
+                });
+                {% if this.fit_bounds %}
+                {{ this._parent._parent.get_name() }}.fitBounds(
+                    {{ this._parent.get_name() }}.getBounds()
+                );
+                {% endif %}
+            {% endmacro %}
+            """
+    )
+
+    default_js = [
+        ("h3-js", "https://cdn.jsdelivr.net/npm/h3-js@4.1.0/dist/h3-js.umd.js"),
+    ]
+
+    def __init__(
+        self, cells: list[str], properties: dict[str, list[Any]], fit_bounds: bool = False
+    ) -> None:
+        """
+        Create H3 features element for a GeoJson layer.
+
+        Only cells indexes and properties columns are written to the map, instead of the polygons
+        coordinates and properties repeated for every feature. Features are added to the parent
+        layer, so they use its style, highlight, tooltip and popup.
+
+        Args:
+            cells (list[str]): H3 cells indexes as hexadecimal strings.
+            properties (dict[str, list[Any]]): Features properties, stored as a list of values
+                for each property.
+            fit_bounds (bool, optional): Whether to fit the map to the bounds of the cells after
+                adding them to the layer. Defaults to False.
+        """
+        super().__init__()  # type: ignore[no-untyped-call]
+        self._name = H3Features.__name__
+        self.cells_data = _to_html_safe_json({"cells": cells, "properties": properties})
+        self.fit_bounds = fit_bounds
+
+
+def write_features(
+    file: TextIO, gdf: "gpd.GeoDataFrame", chunk_size: int = _FEATURES_CHUNK_SIZE
+) -> None:
+    """
+    Write GeoDataFrame as a GeoJSON FeatureCollection, converting features in chunks.
+
+    Only a single chunk of features is kept in memory as Python objects, so the peak memory
+    doesn't depend on the number of features. Output is safe to embed in an HTML script tag.
+
+    Args:
+        file (TextIO): Opened text file to write to.
+        gdf (gpd.GeoDataFrame): Features to write.
+        chunk_size (int, optional): Number of features converted at once. Defaults to 10000.
+    """
+    if gdf.crs is not None and not gdf.crs.equals(4326):
+        gdf = gdf.to_crs(4326)
+
+    # Same as GeoPandas explore function, drop missing or empty geometries
+    gdf = gdf[~(gdf.geometry.isna() | gdf.geometry.is_empty)]
+
+    file.write('{"type":"FeatureCollection","features":[')
+    separator = ""
+    for chunk_start in range(0, len(gdf), chunk_size):
+        chunk = gdf.iloc[chunk_start : chunk_start + chunk_size]
+        for feature in chunk.iterfeatures(na="null", drop_id=True):
+            file.write(separator)
+            file.write(_to_html_safe_json(feature))
+            separator = ","
+    file.write("]}")
+
+
+def apply_property_style(
+    layer: GeoJson,
+    property_style: dict[str, str],
+    style: dict[str, Any] | None = None,
+) -> None:
+    """
+    Style GeoJson layer in the browser using values stored in the feature properties.
+
+    Folium calls `style_function` and `highlight_function` for every feature while rendering
+    the map. This replaces both with a single JavaScript function that reads style values from
+    the feature properties. Python callbacks are evaluated only once, on the first feature,
+    to keep the static part of the style (e.g. line weight) defined by the user.
+
+    Args:
+        layer (GeoJson): Layer to restyle.
+        property_style (dict[str, str]): Mapping between Leaflet style option and the name of
+            the feature property holding its value.
+        style (dict[str, Any] | None, optional): Static style options overriding both
+            the existing style and the property style. Defaults to None.
+    """
+    static_style = _get_static_style(layer, dynamic_keys=property_style, style=style)
+    if static_style is None:
+        return
+
+    properties_js = ", ".join(
+        f"{json.dumps(key)}: feature.properties[{json.dumps(property_name)}]"
+        for key, property_name in property_style.items()
+        if key not in static_style
+    )
+    _set_style_js(
+        layer,
+        f"function(feature) {{ return Object.assign({json.dumps(static_style)}, "
+        f"{{{properties_js}}}); }}",
+    )
+
+
+def apply_class_style(
+    layer: GeoJson,
+    class_property: str,
+    class_styles: list[dict[str, Any]],
+    style: dict[str, Any] | None = None,
+) -> None:
+    """
+    Style GeoJson layer in the browser using a table of styles indexed by a feature property.
+
+    Styles table is written to the map once and each feature only holds an index of its class.
+
+    Args:
+        layer (GeoJson): Layer to restyle.
+        class_property (str): Name of the feature property holding the class index.
+        class_styles (list[dict[str, Any]]): Leaflet style options for each class.
+        style (dict[str, Any] | None, optional): Static style options overriding both
+            the existing style and the class style. Defaults to None.
+    """
+    dynamic_keys = {key for class_style in class_styles for key in class_style}
+    static_style = _get_static_style(layer, dynamic_keys=dynamic_keys, style=style)
+    if static_style is None:
+        return
+
+    class_styles = [
+        {key: value for key, value in class_style.items() if key not in static_style}
+        for class_style in class_styles
+    ]
+    _set_style_js(
+        layer,
+        f"(function() {{ var classStyles = {json.dumps(class_styles, separators=(',', ':'))}; "
+        "return function(feature) { return Object.assign("
+        f"{json.dumps(static_style)}, "
+        f"classStyles[feature.properties[{json.dumps(class_property)}]]); }}; }})()",
+    )
+
+
+def apply_topojson_encoding(layer: GeoJson, simplify_tolerance: float | None = None) -> None:
+    """
+    Encode GeoJson layer features as TopoJSON with shared borders stored only once.
+
+    Coordinates are quantized and, optionally, arcs are simplified without breaking shared
+    borders between features.
+
+    Args:
+        layer (GeoJson): Layer to encode.
+        simplify_tolerance (float | None, optional): Tolerance for the topology-preserving
+            simplification in the layer coordinates units. Defaults to None.
+    """
+    try:
+        from topojson.core.topology import Topology
+    except (ImportError, ModuleNotFoundError) as ex:
+        raise ImportError(
+            "The 'topojson' package "
+            "is required for TopoJSON encoding. You can install it using "
+            "'conda install -c conda-forge topojson' "
+            "or 'pip install topojson'."
+        ) from ex
+
+    features = layer.data.get("features") or []
+    if not features:
+        return
+
+    topology = Topology(
+        layer.data,
+        object_name=_TOPOJSON_OBJECT_NAME,
+        prequantize=True,
+        toposimplify=simplify_tolerance or 0,
+    ).to_dict()
+
+    # Leaflet skips features without geometry, but folium still needs the properties of
+    # the first feature to validate tooltip and popup fields.
+    layer.data = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": None, "properties": features[0].get("properties")}
+        ],
+    }
+    layer.add_child(TopoJsonFeatures(topology))
+
+
+def _get_static_style(
+    layer: GeoJson, dynamic_keys: "set[str] | dict[str, str]", style: dict[str, Any] | None
+) -> dict[str, Any] | None:
+    features = layer.data.get("features") or []
+    if not features:
+        return None
+
+    static_style = {}
+    if layer.style:
+        static_style = {
+            key: value
+            for key, value in layer.style_function(features[0]).items()
+            if key not in dynamic_keys
+        }
+    static_style.update(style or {})
+
+    return static_style
+
+
+def _set_style_js(layer: GeoJson, style_js: str) -> None:
+    # Folium types options as JSON values, but renders JsCode values as JavaScript functions
+    options = cast("dict[str, TypeJsonValueNoNone | JsCode]", layer.options)
+    options["style"] = JsCode(style_js)
+
+    if layer.highlight:
+        highlight_style = layer.highlight_function(layer.data["features"][0])
+        layer.on_each_feature = JsCode(
+            _highlight_on_each_feature_js(
+                layer_name=layer.get_name(),
+                highlight_style=highlight_style,
+                on_each_feature=layer.on_each_feature,
+            )
+        )
+
+    # Skip the per-feature style mapping done by folium during rendering, functions are removed
+    # the same as for a layer created without them.
+    layer.style = layer.highlight = False
+    for function_name in ("style_function", "highlight_function"):
+        vars(layer).pop(function_name, None)
+
+
+def _highlight_on_each_feature_js(
+    layer_name: str, highlight_style: dict[str, Any], on_each_feature: JsCode | None
+) -> str:
+    user_on_each_feature = (
+        f"({on_each_feature.js_code})(feature, layer);" if on_each_feature is not None else ""
+    )
+    return (
+        "function(feature, layer) {"
+        f"{user_on_each_feature}"
+        "layer.on({"
+        "mouseover: function(e) { if (typeof e.target.setStyle === 'function') "
+        f"{{ e.target.setStyle({json.dumps(highlight_style)}); }} }},"
+        "mouseout: function(e) { if (typeof e.target.setStyle === 'function') "
+        f"{{ {layer_name}.resetStyle(e.target); }} }}"
+        "});"
+        "}"
+    )
+
+
+def _to_html_safe_json(value: Any) -> str:
+    # Values not supported by JSON (e.g. timestamps) are written as strings, same as in GeoPandas
+    return (
+        json.dumps(value, separators=(",", ":"), default=str)
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+    )
@@ -1,6 +1,7 @@
 """Bivariate legend plotting module."""
 
 from contextlib import suppress
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, cast
 
 import narwhals as nw
@@ -69,101 +70,220 @@ def plot_bivariate_legend(
     Returns:
         Axes: Matplotlib axes with plotted legend.
     """
-    if ax is None:
-        _, ax = plt.subplots(figsize=(8, 8), dpi=DPI, layout="compressed")
-
-    parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
-
-    label_a = label_a or _try_parse_label(values_a) or "Value A"
-    label_b = label_b or _try_parse_label(values_b) or "Value B"
-
-    if isinstance(grid_size, (tuple, list)):
-        grid_size_x, grid_size_y = grid_size
-    else:
-        grid_size_x = grid_size_y = grid_size or 100
-
-    xx, yy = np.mgrid[0:grid_size_y, 0:grid_size_x]
-
-    cmap = get_bivariate_cmap(cmap)
-
-    legend_cmap = cmap(values_a=xx, values_b=yy, normalize=True, dark_mode=dark_mode)
-
-    img = Image.fromarray(np.uint8((legend_cmap) * 255))
-
-    tick_fontsize_pt = tick_fontsize_px * 72 / ax.figure.dpi
-
-    colour = font_colour or ("white" if dark_mode else "black")
-    _set_colour_theme(ax, colour)
-    if tick_labels_a is None:
-        y_min = parsed_values_a.min()
-        y_max = parsed_values_a.max()
-    else:
-        y_min = 0
-        y_max = legend_cmap.shape[0]
-
-    if tick_labels_b is None:
-        x_min = parsed_values_b.min()
-        x_max = parsed_values_b.max()
-    else:
-        x_min = 0
-        x_max = legend_cmap.shape[1]
+    legend_spec = BivariateLegendSpec.from_values(
+        values_a=values_a,
+        values_b=values_b,
+        cmap=cmap,
+        grid_size=grid_size,
+        label_a=label_a,
+        label_b=label_b,
+        tick_labels_a=tick_labels_a,
+        tick_labels_b=tick_labels_b,
+        dark_mode=dark_mode,
+    )
 
-    height_range = y_max - y_min
-    width_range = x_max - x_min
-    aspect = width_range / height_range
+    return legend_spec.plot(ax=ax, font_colour=font_colour, tick_fontsize_px=tick_fontsize_px)
 
-    ax.imshow(
-        img,
-        origin="lower",
-        extent=(x_min, x_max, y_min, y_max),
-        aspect=aspect,
-        interpolation="nearest",
-    )
-    ax.tick_params(axis="both", which="both", length=0)
-
-    ax.annotate(
-        "",
-        xy=(0, 1),
-        xytext=(0, 0),
-        arrowprops=dict(
-            arrowstyle="->",
-            lw=1,
-            color=colour,
-            shrinkA=0,
-            shrinkB=0,
-        ),
-        xycoords="axes fraction",
-    )
-    ax.annotate(
-        "",
-        xy=(1, 0),
-        xytext=(0, 0),
-        arrowprops=dict(
-            arrowstyle="->",
-            lw=1,
-            color=colour,
-            shrinkA=0,
-            shrinkB=0,
-        ),
-        xycoords="axes fraction",
-    )
 
-    ax.set_ylabel(label_a, fontsize=tick_fontsize_pt)
-    ax.set_xlabel(label_b, fontsize=tick_fontsize_pt)
-    ax.tick_params(labelsize=tick_fontsize_pt)
+@dataclass(frozen=True)
+class BivariateLegendSpec:
+    """
+    Specification of a bivariate legend, independent from the size of the plotted data.
 
-    if tick_labels_a:
-        yticks = np.linspace(0, legend_cmap.shape[0], len(tick_labels_a))
-        ax.set_yticks(yticks)
-        ax.set_yticklabels(tick_labels_a)
+    Keeps only the values ranges and labels needed to plot the legend, so it can be stored
+    (or pickled) with a map without holding the data arrays.
 
-    if tick_labels_b:
-        xticks = np.linspace(0, legend_cmap.shape[1], len(tick_labels_b))
-        ax.set_xticks(xticks)
-        ax.set_xticklabels(tick_labels_b)
-        auto_rotate_xticks(ax)
+    Attributes:
+        range_a (tuple[float, float]): Minimum and maximum value of the first variable (Y axis).
+        range_b (tuple[float, float]): Minimum and maximum value of the second variable (X axis).
+        cmap (BivariateColourmap): Bivariate colourmap to use.
+        grid_size (int | tuple[int, int] | None, optional): Number of pixels in the legend grid.
+            Can define two different values for X and Y axis (in this order).
+            If None, will default to 100. Defaults to None.
+        label_a (str | None, optional): Label to use for the first variable (Y axis).
+            If None, defaults to "Value A". Defaults to None.
+        label_b (str | None, optional): Label to use for the second variable (X axis).
+            If None, defaults to "Value B". Defaults to None.
+        tick_labels_a (list[Any] | None, optional): List of predefined ticks to use for the first
+            variable (Y axis). Useful if binning has been applied. Defaults to None.
+        tick_labels_b (list[Any] | None, optional): List of predefined ticks to use for the second
+            variable (X axis). Useful if binning has been applied. Defaults to None.
+        dark_mode (bool, optional): Whether to use dark mode to select a proper order of colours in
+            the colourmap. Defaults to False.
+    """
 
-    return ax
+    range_a: tuple[float, float]
+    range_b: tuple[float, float]
+    cmap: BivariateColourmap
+    grid_size: int | tuple[int, int] | None = None
+    label_a: str | None = None
+    label_b: str | None = None
+    tick_labels_a: list[Any] | None = None
+    tick_labels_b: list[Any] | None = None
+    dark_mode: bool = False
+
+    @classmethod
+    def from_values(
+        cls,
+        values_a: "ValueInput",
+        values_b: "ValueInput",
+        cmap: BivariateColourmap | str | None = None,
+        grid_size: int | tuple[int, int] | None = None,
+        label_a: str | None = None,
+        label_b: str | None = None,
+        tick_labels_a: list[Any] | None = None,
+        tick_labels_b: list[Any] | None = None,
+        dark_mode: bool = False,
+    ) -> "BivariateLegendSpec":
+        """
+        Create legend specification from the values of both variables.
+
+        Args:
+            values_a (ValueInput): List or array of values for first variable.
+            values_b (ValueInput): List or array of values for second variable.
+            cmap (BivariateColourmap | str | None, optional): Bivariate colourmap to use.
+                If None, will load a default one. Defaults to None.
+            grid_size (int | tuple[int, int] | None, optional): Number of pixels in the legend
+                grid. Defaults to None.
+            label_a (str | None, optional): Label to use for the first variable. If None, will try
+                to read series name. Defaults to None.
+            label_b (str | None, optional): Label to use for the second variable. If None, will
+                try to read series name. Defaults to None.
+            tick_labels_a (list[Any] | None, optional): List of predefined ticks to use for the
+                first variable. Defaults to None.
+            tick_labels_b (list[Any] | None, optional): List of predefined ticks to use for the
+                second variable. Defaults to None.
+            dark_mode (bool, optional): Whether to use dark mode. Defaults to False.
+
+        Returns:
+            BivariateLegendSpec: Legend specification with values ranges.
+        """
+        parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
+
+        return cls(
+            range_a=(float(parsed_values_a.min()), float(parsed_values_a.max())),
+            range_b=(float(parsed_values_b.min()), float(parsed_values_b.max())),
+            cmap=get_bivariate_cmap(cmap),
+            grid_size=grid_size,
+            label_a=label_a or _try_parse_label(values_a),
+            label_b=label_b or _try_parse_label(values_b),
+            tick_labels_a=tick_labels_a,
+            tick_labels_b=tick_labels_b,
+            dark_mode=dark_mode,
+        )
+
+    def plot(
+        self,
+        ax: Axes | None = None,
+        font_colour: str | None = None,
+        tick_fontsize_px: int = 10,
+    ) -> Axes:
+        """
+        Plot bivariate 2D legend using Matplotlib.
+
+        Args:
+            ax (Axes | None, optional): Matplotlib axis to plot legend on. If None, will be
+                created. Defaults to None.
+            font_colour (str | None, optional): Font colour for the labels and ticks. If None,
+                will be selected based on dark_mode value - white or black. Defaults to None.
+            tick_fontsize_px (int, optional): Size of the ticksize and labels font in pixels.
+                Defaults to 10.
+
+        Returns:
+            Axes: Matplotlib axes with plotted legend.
+        """
+        if ax is None:
+            _, ax = plt.subplots(figsize=(8, 8), dpi=DPI, layout="compressed")
+
+        label_a = self.label_a or "Value A"
+        label_b = self.label_b or "Value B"
+        tick_labels_a = self.tick_labels_a
+        tick_labels_b = self.tick_labels_b
+        dark_mode = self.dark_mode
+
+        if isinstance(self.grid_size, (tuple, list)):
+            grid_size_x, grid_size_y = self.grid_size
+        else:
+            grid_size_x = grid_size_y = self.grid_size or 100
+
+        xx, yy = np.mgrid[0:grid_size_y, 0:grid_size_x]
+
+        legend_cmap = self.cmap(values_a=xx, values_b=yy, normalize=True, dark_mode=dark_mode)
+
+        img = Image.fromarray(np.uint8((legend_cmap) * 255))
+
+        tick_fontsize_pt = tick_fontsize_px * 72 / ax.figure.dpi
+
+        colour = font_colour or ("white" if dark_mode else "black")
+        _set_colour_theme(ax, colour)
+        if tick_labels_a is None:
+            y_min, y_max = self.range_a
+        else:
+            y_min = 0
+            y_max = legend_cmap.shape[0]
+
+        if tick_labels_b is None:
+            x_min, x_max = self.range_b
+        else:
+            x_min = 0
+            x_max = legend_cmap.shape[1]
+
+        height_range = y_max - y_min
+        width_range = x_max - x_min
+        aspect = width_range / height_range
+
+        ax.imshow(
+            img,
+            origin="lower",
+            extent=(x_min, x_max, y_min, y_max),
+            aspect=aspect,
+            interpolation="nearest",
+        )
+        ax.tick_params(axis="both", which="both", length=0)
+
+        ax.annotate(
+            "",
+            xy=(0, 1),
+            xytext=(0, 0),
+            arrowprops=dict(
+                arrowstyle="->",
+                lw=1,
+                color=colour,
+                shrinkA=0,
+                shrinkB=0,
+            ),
+            xycoords="axes fraction",
+        )
+        ax.annotate(
+            "",
+            xy=(1, 0),
+            xytext=(0, 0),
+            arrowprops=dict(
+                arrowstyle="->",
+                lw=1,
+                color=colour,
+                shrinkA=0,
+                shrinkB=0,
+            ),
+            xycoords="axes fraction",
+        )
+
+        ax.set_ylabel(label_a, fontsize=tick_fontsize_pt)
+        ax.set_xlabel(label_b, fontsize=tick_fontsize_pt)
+        ax.tick_params(labelsize=tick_fontsize_pt)
+
+        if tick_labels_a:
+            yticks = np.linspace(0, legend_cmap.shape[0], len(tick_labels_a))
+            ax.set_yticks(yticks)
+            ax.set_yticklabels(tick_labels_a)
+
+        if tick_labels_b:
+            xticks = np.linspace(0, legend_cmap.shape[1], len(tick_labels_b))
+            ax.set_xticks(xticks)
+            ax.set_xticklabels(tick_labels_b)
+            auto_rotate_xticks(ax)
+
+        return ax
 
 
 def _try_parse_label(values: "ValueInput") -> str | None:
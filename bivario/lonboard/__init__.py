@@ -1,21 +1,33 @@
 """Bivariate lonboard maps module."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
 from typing import TYPE_CHECKING, Any, Literal, cast, overload
 
 import narwhals as nw
 import numpy as np
 
-from bivario._alpha import prepare_alpha_values
+from bivario._colouring import ColouringBounds, colour_with_bounds
 from bivario._constants import DARK_MODE_TILES_KEYWORDS
-from bivario._scheme import SCHEME_TYPE, apply_mapclassify
+from bivario._lazy import prepare_lazy_colouring, supports_lazy_colouring
+from bivario._prepared import prepare_bivariate_data
+from bivario._scheme import SCHEME_TYPE
+from bivario.classifier import BivariateClassifier
 from bivario.cmap import BivariateColourmap, _validate_values, get_bivariate_cmap
-from bivario.legend import plot_bivariate_legend, resize_fig
+from bivario.legend import BivariateLegendSpec, _try_parse_label, resize_fig
+from bivario.lonboard._geoarrow import (
+    clear_geometry_cache,
+    is_geodataframe,
+    split_geometry_types,
+    to_geoarrow_table,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    import numpy.typing as npt
+    from arro3.core import ChunkedArray
     from lonboard._map import Map
+    from lonboard.basemap import MaplibreBasemap
     from lonboard.types.layer import (
         PathLayerKwargs,
         PolygonLayerKwargs,
@@ -26,20 +38,291 @@ if TYPE_CHECKING:
     from matplotlib.figure import Figure
     from narwhals.typing import IntoFrame
 
-    from bivario.typing import ValueInput
+    from bivario.typing import BivariateColourmapArray, NumericArray, ValueInput
+
+__all__ = ["LonboardMapWithLegend", "clear_geometry_cache", "viz_bivariate_data"]
+
+# Rows of the colours buffer assigned to a single layer
+_LayerRows = slice | np.ndarray
+
+
+@dataclass(frozen=True)
+class _ColouringParameters:
+    # None if values passed directly weren't kept after the colouring
+    column_a: "str | ValueInput | None"
+    column_b: "str | ValueInput | None"
+    column_a_label: str | None
+    column_b_label: str | None
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier
+    k: int | tuple[int, int]
+    tiles: str | None
+    cmap: BivariateColourmap | str | None
+    dark_mode: bool | None
+    alpha: bool
+    alpha_norm_quantile: float
+    legend_size_px: int
+    legend_max_grid_size: int | None
+    legend_tick_fontsize_px: int
+    legend_kwargs: dict[str, Any] | None
+    keep_values: bool
+
+
+@dataclass(frozen=True)
+class _Colouring:
+    colour_bytes: "npt.NDArray[np.uint8]"
+    tiles: str
+    legend: "Callable[..., Axes]"
+    legend_spec: BivariateLegendSpec
+    bounds: ColouringBounds
+    cmap: BivariateColourmap
+    dark_mode: bool
+    # Copies of the coloured values, None if they aren't kept or were classified by a lazy
+    # dataframe engine
+    values: "tuple[NumericArray, NumericArray] | None"
 
 
 @dataclass
 class LonboardMapWithLegend:
-    """Lonboard Map object with bivariate legend as Matplotlib Axes."""
+    """
+    Lonboard Map object with bivariate legend as Matplotlib Axes.
+
+    Legend is plotted from the `legend_spec`, which keeps only the values ranges and labels.
+    The input data isn't held by the object. Copies of the two plotted value columns are kept
+    only if the map was created with `keep_values=True`, to recolour the map with the `update`
+    method without passing the data again.
+    """
 
     m: "Map"
     legend: "Callable[..., Axes]"
+    legend_spec: BivariateLegendSpec | None = None
+    _parameters: _ColouringParameters | None = field(default=None, repr=False)
+    _colouring: _Colouring | None = field(default=None, repr=False)
+    _layers_rows: "list[_LayerRows] | None" = field(default=None, repr=False)
+
+    def update(self, data: Any = None, **kwargs: Any) -> None:
+        """
+        Recolour the map without rebuilding its layers.
+
+        Only colours are recomputed and assigned to the existing layers, so the geometries
+        aren't sent to the browser again. Legend plotting function is refreshed as well.
+
+        Args:
+            data (Any, optional): Data with the same rows as the plotted one, used to load columns
+                passed by name. Required to recolour columns passed by name, unless their values
+                were kept with `keep_values=True`. If None, the kept values of the plotted
+                columns are recoloured. Defaults to None.
+            **kwargs (Any): Parameters of the `viz_bivariate_data` function to change. Can be any
+                of: `column_a`, `column_b`, `column_a_label`, `column_b_label`, `scheme`, `k`,
+                `tiles`, `cmap`, `dark_mode`, `alpha`, `alpha_norm_quantile`, `legend_size_px`,
+                `legend_max_grid_size`, `legend_tick_fontsize_px`, `legend_kwargs` and
+                `keep_values`. Values passed directly as `column_a` or `column_b` have to be
+                passed again, unless they were kept.
+
+        Examples:
+            Switch plotted columns and colourmap of the existing map:
+            >>> from bivario.example_data import nyc_bike_trips
+            >>> from bivario import viz_bivariate_data
+            >>> gdf = nyc_bike_trips()
+            >>> x = viz_bivariate_data(
+            ...     gdf,
+            ...     column_a="morning_starts",
+            ...     column_b="morning_ends",
+            ... )
+            >>> x.update(
+            ...     gdf, column_a="afternoon_starts", column_b="afternoon_ends", cmap="bubblegum"
+            ... )
+            >>> x.legend()
+            <Axes: xlabel='afternoon_ends', ylabel='afternoon_starts'>
+
+            Keep the plotted values to change the binning without passing the data again:
+            >>> x = viz_bivariate_data(
+            ...     gdf,
+            ...     column_a="morning_starts",
+            ...     column_b="morning_ends",
+            ...     keep_values=True,
+            ... )
+            >>> x.update(scheme="Quantiles", k=3)
+        """
+        if self._parameters is None or self._colouring is None:
+            raise ValueError("Only maps created by the viz_bivariate_data function can be updated.")
+
+        supported_parameters = {parameter.name for parameter in fields(_ColouringParameters)}
+        unsupported_parameters = sorted(set(kwargs).difference(supported_parameters))
+        if unsupported_parameters:
+            raise TypeError(f"Unsupported parameters: {', '.join(unsupported_parameters)}.")
+
+        parameters = replace(self._parameters, **kwargs)
+        colouring_parameters = (
+            parameters if data is not None else self._with_kept_values(parameters, kwargs)
+        )
+        if data is None and (
+            isinstance(colouring_parameters.column_a, str)
+            or isinstance(colouring_parameters.column_b, str)
+        ):
+            raise ValueError(
+                "Data is required to load columns by name. Pass it with the data argument "
+                "or create the map with keep_values=True."
+            )
+
+        colouring = _colour_data(data, colouring_parameters)
+
+        _set_layers_colours(self.m, colouring.colour_bytes, self._layers_rows)
+        self.m.basemap = _get_basemap(colouring.tiles, self.m.basemap)
+        self.legend = colouring.legend
+        self.legend_spec = colouring.legend_spec
+        self._parameters = _without_values(parameters, colouring)
+        self._colouring = colouring
+
+    def update_rows(
+        self, indices: "npt.ArrayLike", values_a: "ValueInput", values_b: "ValueInput"
+    ) -> None:
+        """
+        Recolour only the given rows of the map using new values.
+
+        Only the new values are classified and coloured, using the classification bins,
+        normalization range and alpha scaling of the last full colouring, so the legend stays
+        valid. Use `update` method to recompute them from the whole data.
+
+        Colours are written in place into the colours buffer shared with the layers. If the map
+        was created with `keep_values=True`, the new values replace the kept ones, so the
+        following `update` call recolours them as well. Otherwise, the data passed to `update`
+        should contain the changed values. Lonboard can't send a part of a layer accessor,
+        so the whole colours column of each layer with changed rows is sent again
+        to the browser.
+
+        Args:
+            indices (npt.ArrayLike): Positional indices of the rows to recolour.
+            values_a (ValueInput): New values for the first variable of the given rows.
+            values_b (ValueInput): New values for the second variable of the given rows.
+
+        Examples:
+            Recolour first two rows of the map:
+            >>> from bivario.example_data import nyc_bike_trips
+            >>> from bivario import viz_bivariate_data
+            >>> x = viz_bivariate_data(
+            ...     nyc_bike_trips(),
+            ...     column_a="morning_starts",
+            ...     column_b="morning_ends",
+            ... )
+            >>> x.update_rows([0, 1], values_a=[100, 200], values_b=[50, 0])
+        """
+        if self._colouring is None or self._parameters is None:
+            raise ValueError("Only maps created by the viz_bivariate_data function can be updated.")
+
+        colouring = self._colouring
+        row_indices, values_a, values_b = self._patch_rows(
+            colouring.colour_bytes, indices, values_a, values_b
+        )
+
+        if colouring.values is not None:
+            kept_values_a, kept_values_b = colouring.values
+            self._colouring = replace(
+                colouring,
+                values=(
+                    _patch_values(kept_values_a, row_indices, values_a),
+                    _patch_values(kept_values_b, row_indices, values_b),
+                ),
+            )
+            self._parameters = _without_values(self._parameters, self._colouring)
+
+        _send_layers_colours(self.m, colouring.colour_bytes, self._layers_rows, row_indices)
+
+    def patch_colours(
+        self,
+        colours: "npt.NDArray[np.uint8]",
+        indices: "npt.ArrayLike",
+        values_a: "ValueInput",
+        values_b: "ValueInput",
+    ) -> None:
+        """
+        Write colours of new values into the given rows of a colours array in place.
+
+        Values are coloured the same way as in the `update_rows` method, using the bounds of
+        the last full colouring of the map, but the map itself isn't changed. Can be used to
+        keep own copies of the colours (e.g. of other widgets) in sync with the map.
+
+        Args:
+            colours (npt.NDArray[np.uint8]): Array of RGB or RGBA colours with one row per
+                feature. Must have 4 columns if the map is coloured with alpha values.
+            indices (npt.ArrayLike): Positional indices of the rows to recolour.
+            values_a (ValueInput): New values for the first variable of the given rows.
+            values_b (ValueInput): New values for the second variable of the given rows.
+
+        Examples:
+            Recolour first two rows of a copy of the map colours:
+            >>> import numpy as np
+            >>> from bivario.example_data import nyc_bike_trips
+            >>> from bivario import viz_bivariate_data
+            >>> gdf = nyc_bike_trips()
+            >>> x = viz_bivariate_data(gdf, column_a="morning_starts", column_b="morning_ends")
+            >>> colours = np.zeros((len(gdf), 4), dtype=np.uint8)
+            >>> x.patch_colours(colours, [0, 1], values_a=[100, 200], values_b=[50, 0])
+        """
+        if self._colouring is None:
+            raise ValueError("Only maps created by the viz_bivariate_data function can be updated.")
+
+        self._patch_rows(colours, indices, values_a, values_b)
+
+    def _patch_rows(
+        self,
+        colours: "npt.NDArray[np.uint8]",
+        indices: "npt.ArrayLike",
+        values_a: "ValueInput",
+        values_b: "ValueInput",
+    ) -> "tuple[npt.NDArray[np.intp], NumericArray, NumericArray]":
+        colouring = cast("_Colouring", self._colouring)
+
+        parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
+        row_indices = np.asarray(indices, dtype=np.intp)
+        if row_indices.shape != parsed_values_a.shape:
+            raise ValueError("Number of indices must match the number of values.")
+
+        values_cmap, alpha_values = colour_with_bounds(
+            values_a=parsed_values_a,
+            values_b=parsed_values_b,
+            bounds=colouring.bounds,
+            cmap=colouring.cmap,
+            dark_mode=colouring.dark_mode,
+        )
+        colour_bytes = _to_colour_bytes(values_cmap, alpha_values)
+
+        if colours.dtype != np.uint8:
+            raise TypeError(f"Colours must be an uint8 array, got {colours.dtype}.")
+        if colours.ndim != 2 or colours.shape[1] != colour_bytes.shape[1]:
+            raise ValueError(
+                f"Colours must have {colour_bytes.shape[1]} columns, got shape {colours.shape}."
+            )
+
+        colours[row_indices] = colour_bytes
+
+        return row_indices, parsed_values_a, parsed_values_b
+
+    def _with_kept_values(
+        self, parameters: _ColouringParameters, changed: dict[str, Any]
+    ) -> _ColouringParameters:
+        # Columns that weren't changed are recoloured from the values kept after the last colouring
+        colouring = cast("_Colouring", self._colouring)
+        if colouring.values is not None:
+            values_a, values_b = colouring.values
+            if "column_a" not in changed:
+                parameters = replace(
+                    parameters,
+                    column_a=values_a,
+                    column_a_label=parameters.column_a_label or colouring.legend_spec.label_a,
+                )
+            if "column_b" not in changed:
+                parameters = replace(
+                    parameters,
+                    column_b=values_b,
+                    column_b_label=parameters.column_b_label or colouring.legend_spec.label_b,
+                )
+
+        return parameters
 
     def _repr_mimebundle_(self, **kwargs: dict) -> tuple[dict, dict] | None:  # type: ignore[type-arg]
         # Delegate rendering to the map object
         if hasattr(self.m, "_repr_mimebundle_"):
-            return self.m._repr_mimebundle_(**kwargs)  # type: ignore[no-any-return]
+            return self.m._repr_mimebundle_(**kwargs)
 
         return None
 
@@ -51,13 +334,15 @@ def viz_bivariate_data(
     column_b: "str | ValueInput",
     column_a_label: str | None = None,
     column_b_label: str | None = None,
-    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] = True,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
     k: int | tuple[int, int] = 5,
     tiles: str | None = None,
     cmap: BivariateColourmap | str | None = None,
     dark_mode: bool | None = None,
     alpha: bool = True,
     alpha_norm_quantile: float = 0.9,
+    keep_columns: list[str] | None = None,
+    h3_column: str | None = None,
     legend: Literal[True] = True,
     legend_size_px: int = 400,
     legend_max_grid_size: int | None = 100,
@@ -67,6 +352,7 @@ def viz_bivariate_data(
     path_kwargs: "PathLayerKwargs | None" = None,
     polygon_kwargs: "PolygonLayerKwargs | None" = None,
     map_kwargs: "MapKwargs | None" = None,
+    keep_values: bool = False,
 ) -> "LonboardMapWithLegend": ...
 
 
@@ -77,13 +363,15 @@ def viz_bivariate_data(
     column_b: "str | ValueInput",
     column_a_label: str | None = None,
     column_b_label: str | None = None,
-    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] = True,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
     k: int | tuple[int, int] = 5,
     tiles: str | None = None,
     cmap: BivariateColourmap | str | None = None,
     dark_mode: bool | None = None,
     alpha: bool = True,
     alpha_norm_quantile: float = 0.9,
+    keep_columns: list[str] | None = None,
+    h3_column: str | None = None,
     legend: Literal[False] = False,
     legend_size_px: int = 400,
     legend_max_grid_size: int | None = 100,
@@ -93,6 +381,7 @@ def viz_bivariate_data(
     path_kwargs: "PathLayerKwargs | None" = None,
     polygon_kwargs: "PolygonLayerKwargs | None" = None,
     map_kwargs: "MapKwargs | None" = None,
+    keep_values: bool = False,
 ) -> "Map": ...
 
 
@@ -102,13 +391,15 @@ def viz_bivariate_data(
     column_b: "str | ValueInput",
     column_a_label: str | None = None,
     column_b_label: str | None = None,
-    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] = True,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
     k: int | tuple[int, int] = 5,
     tiles: str | None = None,
     cmap: BivariateColourmap | str | None = None,
     dark_mode: bool | None = None,
     alpha: bool = True,
     alpha_norm_quantile: float = 0.9,
+    keep_columns: list[str] | None = None,
+    h3_column: str | None = None,
     legend: bool = True,
     legend_size_px: int = 400,
     legend_max_grid_size: int | None = 100,
@@ -118,25 +409,33 @@ def viz_bivariate_data(
     path_kwargs: "PathLayerKwargs | None" = None,
     polygon_kwargs: "PolygonLayerKwargs | None" = None,
     map_kwargs: "MapKwargs | None" = None,
+    keep_values: bool = False,
 ) -> "Map | LonboardMapWithLegend":
     """
     Visualize geospatial data with a bivariate colormap on a lonboard map.
 
     Args:
         data (Any | list[Any] | tuple[Any, ...]): Geospatial data to plot. Any compatible with
-            lonboard viz function.
+            lonboard viz function. GeoDataFrame geometries are converted to GeoArrow once and
+            cached, so plotting the same geometries again skips the conversion. Cache can be
+            emptied with `bivario.lonboard.clear_geometry_cache` function. Multiple tables can
+            be passed as a list or tuple, their values are classified and coloured together and
+            each layer gets the colours of its own rows.
         column_a (str | ValueInput): Column name for the first variable or list/array of values.
         column_b (str | ValueInput): Column name for the second variable or list/array of values.
         column_a_label (str | None, optional): Label for column a. If None, will use column name.
             Defaults to None.
         column_b_label (str | None, optional): Label for column b. If None, will use column name.
             Defaults to None.
-        scheme (str | None | bool | tuple, optional): Mapclassify binning scheme for the data.
-            If True, uses "NaturalBreaks". If False, no binning is applied.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Mapclassify binning
+            scheme for the data. If True, uses "NaturalBreaks". If False, no binning is applied.
             If str, uses the specified scheme. If None, no binning is applied. Can also define
-            two different values for columns a and b. Defaults to True.
+            two different values for columns a and b. If a fitted `BivariateClassifier`, its
+            classes are reused, so different datasets are coloured consistently.
+            Defaults to True.
         k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
-            different values for columns a and b. Defaults to 5.
+            different values for columns a and b. Ignored if scheme is a `BivariateClassifier`.
+            Defaults to 5.
         tiles (str | None, optional): Tile layer for the map. If None, will set based
             on dark mode - "CartoDB DarkMatter" for the dark mode, and "CartoDB Positron"
             for the light mode. Defaults to None.
@@ -150,6 +449,15 @@ def viz_bivariate_data(
         alpha_norm_quantile (float, optional): Quantile for normalizing alpha transparency.
             Will be used to calculate the maximum value for alpha scaling. It is recommended to use
             value below 1 to avoid outliers affecting the transparency too much. Defaults to 0.9.
+        keep_columns (list[str] | None, optional): Columns kept in the data of generated layers
+            (e.g. to show in the tooltip). Geometry column is always kept and all other columns are
+            dropped before sending the data to the widget. If None, all columns are kept.
+            Defaults to None.
+        h3_column (str | None, optional): Column with H3 cells indexes (as integers or strings).
+            If set, data is plotted as a single lonboard.H3HexagonLayer and hexagons are generated
+            in the browser, so geometries are neither parsed nor sent to the widget. Data can be
+            any dataframe supported by narwhals and columns that can't be converted to Arrow
+            (e.g. geometries) are dropped. Defaults to None.
         legend (bool, optional): Whether to return a lonboard map with a legend plotting function.
             If True, will return LonboardMapWithLegend object with lonboard map and legend function.
             If False, will return lonboard.Map. Defaults to True.
@@ -165,9 +473,12 @@ def viz_bivariate_data(
         path_kwargs: a `dict` of parameters to pass down to all generated
             lonboard.PathLayers.
         polygon_kwargs: a `dict` of parameters to pass down to all generated
-            lonboard.PolygonLayers.
+            lonboard.PolygonLayers and lonboard.H3HexagonLayer.
         map_kwargs: a `dict` of parameters to pass down to the generated
             lonboard.Map.
+        keep_values (bool, optional): Whether to keep copies of the plotted values in the returned
+            LonboardMapWithLegend object, so it can be recoloured with the `update` method without
+            passing the data again. Values aren't kept with `legend=False`. Defaults to False.
 
     Returns:
         lonboard.Map | LonboardMapWithLegend: Lonboard map with the bivariate colormap applied or
@@ -238,16 +549,132 @@ def viz_bivariate_data(
     """
     try:
         from lonboard import viz
-        from lonboard.basemap import CartoBasemap
     except (ImportError, ModuleNotFoundError) as ex:
         raise ImportError(
-            "The 'lonboard>=0.10' package "
+            "The 'lonboard>=0.13' package "
             "is required for plotting lonboard map. You can install it using "
-            "'conda install -c conda-forge \"lonboard>=0.10\"' "
-            "or 'pip install \"lonboard>=0.10\"'."
+            "'conda install -c conda-forge \"lonboard>=0.13\"' "
+            "or 'pip install \"lonboard>=0.13\"'."
         ) from ex
 
-    narwhals_df = None
+    parameters = _ColouringParameters(
+        column_a=column_a,
+        column_b=column_b,
+        column_a_label=column_a_label,
+        column_b_label=column_b_label,
+        scheme=scheme,
+        k=k,
+        tiles=tiles,
+        cmap=cmap,
+        dark_mode=dark_mode,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        legend_size_px=legend_size_px,
+        legend_max_grid_size=legend_max_grid_size,
+        legend_tick_fontsize_px=legend_tick_fontsize_px,
+        legend_kwargs=legend_kwargs,
+        keep_values=keep_values and legend,
+    )
+    colouring = _colour_data(data, parameters)
+
+    map_kwargs = map_kwargs or {}
+    polygon_kwargs = polygon_kwargs or {}
+    scatterplot_kwargs = scatterplot_kwargs or {}
+    path_kwargs = path_kwargs or {}
+
+    map_kwargs["basemap"] = _get_basemap(colouring.tiles, map_kwargs.get("basemap"))
+
+    # Colours are assigned to the layers after creating them, each layer gets its rows of the buffer
+
+    # Polygon layer
+    polygon_kwargs["filled"] = True
+
+    if "stroked" not in polygon_kwargs:
+        polygon_kwargs["stroked"] = False
+    if "opacity" not in polygon_kwargs:
+        polygon_kwargs["opacity"] = 1
+
+    # Scatterplot layer
+    scatterplot_kwargs["filled"] = True
+
+    if "stroked" not in scatterplot_kwargs:
+        scatterplot_kwargs["stroked"] = False
+    if "opacity" not in scatterplot_kwargs:
+        scatterplot_kwargs["opacity"] = 1
+
+    # Path layer
+    if "opacity" not in path_kwargs:
+        path_kwargs["opacity"] = 1
+
+    if h3_column is not None:
+        m = _viz_h3_cells(
+            data,
+            h3_column=h3_column,
+            keep_columns=keep_columns,
+            polygon_kwargs=polygon_kwargs,
+            map_kwargs=map_kwargs,
+        )
+        layers_rows: list[_LayerRows] = [slice(None)]
+    else:
+        tables = data if isinstance(data, (list, tuple)) else [data]
+        tables_layers = [_prepare_table_layers(table, keep_columns) for table in tables]
+
+        m = viz(
+            data=[layer_data for table_layers in tables_layers for layer_data, _ in table_layers],
+            map_kwargs=map_kwargs,
+            polygon_kwargs=polygon_kwargs,
+            scatterplot_kwargs=scatterplot_kwargs,
+            path_kwargs=path_kwargs,
+        )
+
+        layers_rows = _get_layers_rows(
+            m,
+            tables_layers_indices=[
+                [indices for _, indices in table_layers] for table_layers in tables_layers
+            ],
+            number_of_values=len(colouring.colour_bytes),
+        )
+
+        if keep_columns is not None:
+            _select_layers_columns(m, keep_columns=keep_columns)
+
+    _set_layers_colours(m, colouring.colour_bytes, layers_rows)
+
+    if legend:
+        return LonboardMapWithLegend(
+            m=m,
+            legend=colouring.legend,
+            legend_spec=colouring.legend_spec,
+            _parameters=_without_values(parameters, colouring),
+            _colouring=colouring,
+            _layers_rows=layers_rows,
+        )
+
+    return m
+
+
+def _colour_data(data: Any, parameters: "_ColouringParameters") -> "_Colouring":
+    from lonboard.basemap import CartoStyle
+
+    column_a = parameters.column_a
+    column_b = parameters.column_b
+    if column_a is None or column_b is None:
+        raise ValueError(
+            "Values passed directly weren't kept. Pass them again with the column_a and "
+            "column_b arguments or create the map with keep_values=True."
+        )
+
+    label_a = parameters.column_a_label or (
+        column_a if isinstance(column_a, str) else _try_parse_label(column_a)
+    )
+    label_b = parameters.column_b_label or (
+        column_b if isinstance(column_b, str) else _try_parse_label(column_b)
+    )
+
+    narwhals_df: nw.DataFrame[Any] | nw.LazyFrame[Any] | dict[str, npt.NDArray[Any]] | None = None
+    prepared_data = None
+    original_values_a: ValueInput
+    original_values_b: ValueInput
 
     if isinstance(column_a, str) or isinstance(column_b, str):
         try:
@@ -257,13 +684,37 @@ def viz_bivariate_data(
             if isinstance(column_b, str):
                 cols_to_select.append(column_b)
 
-            narwhals_df = nw.from_native(cast("IntoFrame", data)).select(*cols_to_select)
+            if isinstance(data, (list, tuple)):
+                narwhals_df = _concat_tables_columns(data, cols_to_select)
+            else:
+                narwhals_df = nw.from_native(cast("IntoFrame", data)).select(*cols_to_select)
 
-            if isinstance(narwhals_df, nw.LazyFrame):
+            if (
+                isinstance(narwhals_df, nw.LazyFrame)
+                and isinstance(column_a, str)
+                and isinstance(column_b, str)
+                and supports_lazy_colouring(scheme=parameters.scheme, k=parameters.k)
+            ):
+                # Statistics and classification are computed by the engine, only the class codes
+                # and alpha values are collected
+                prepared_data = prepare_lazy_colouring(
+                    narwhals_df,
+                    column_a=column_a,
+                    column_b=column_b,
+                    scheme=parameters.scheme,
+                    k=parameters.k,
+                    alpha=parameters.alpha,
+                    alpha_norm_quantile=parameters.alpha_norm_quantile,
+                    label_a=label_a,
+                    label_b=label_b,
+                )
+            elif isinstance(narwhals_df, nw.LazyFrame):
                 narwhals_df = narwhals_df.collect()
 
-            original_values_a = narwhals_df[column_a] if isinstance(column_a, str) else column_a
-            original_values_b = narwhals_df[column_b] if isinstance(column_b, str) else column_b
+            if prepared_data is None:
+                narwhals_df = cast("nw.DataFrame[Any] | dict[str, npt.NDArray[Any]]", narwhals_df)
+                original_values_a = narwhals_df[column_a] if isinstance(column_a, str) else column_a
+                original_values_b = narwhals_df[column_b] if isinstance(column_b, str) else column_b
         except TypeError as ex:
             raise TypeError(
                 "Cannot parse provided input as a source for loading str column."
@@ -272,14 +723,15 @@ def viz_bivariate_data(
         original_values_a = column_a
         original_values_b = column_b
 
-    values_a, values_b = _validate_values(original_values_a, original_values_b)
+    tiles = parameters.tiles
+    dark_mode = parameters.dark_mode
 
     # If tiles are not defined - set based on dark mode
     if tiles is None:
         if dark_mode is None:
             dark_mode = False
 
-        tiles = CartoBasemap.DarkMatter if dark_mode else CartoBasemap.Positron
+        tiles = CartoStyle.DarkMatter if dark_mode else CartoStyle.Positron
     # If tiles are defined, set dark mode based on tiles if not defined
     elif dark_mode is None:
         dark_mode = False
@@ -290,107 +742,306 @@ def viz_bivariate_data(
                 dark_mode = True
                 break
 
-    set_alpha = alpha  # now its bool, but can be a list of values, then check if not empty
+    values: tuple[NumericArray, NumericArray] | None = None
+    if prepared_data is None:
+        if parameters.keep_values:
+            values_a, values_b = _validate_values(original_values_a, original_values_b)
+            # Values are copied, so the kept ones don't reference the input data
+            values = (np.array(values_a), np.array(values_b))
+            original_values_a, original_values_b = values
+
+        prepared_data = prepare_bivariate_data(
+            original_values_a,
+            original_values_b,
+            scheme=parameters.scheme,
+            k=parameters.k,
+            alpha=parameters.alpha,  # now its bool, but can be a list of values
+            alpha_norm_quantile=parameters.alpha_norm_quantile,
+            label_a=label_a,
+            label_b=label_b,
+        )
 
-    alpha_values = None
+    cmap = get_bivariate_cmap(parameters.cmap)
 
-    if set_alpha:
-        alpha_values = prepare_alpha_values(
-            values_a=values_a, values_b=values_b, alpha_norm_quantile=alpha_norm_quantile
-        ).reshape(-1, 1)
+    values_cmap = prepared_data.colour(cmap, dark_mode=dark_mode)
 
-    scheme_result = apply_mapclassify(values_a=values_a, values_b=values_b, scheme=scheme, k=k)
+    colour_bytes = _to_colour_bytes(values_cmap, prepared_data.alpha_values)
 
-    cmap = get_bivariate_cmap(cmap)
+    legend_kwargs = parameters.legend_kwargs or {}
+    legend_size_px = parameters.legend_size_px
+    tick_fontsize_px = parameters.legend_tick_fontsize_px
 
-    values_cmap = cmap(
-        values_a=scheme_result.values_a,
-        values_b=scheme_result.values_b,
-        normalize=True,
+    # Legend keeps only the values ranges, not the data arrays
+    legend_spec = prepared_data.legend_spec(
+        cmap,
         dark_mode=dark_mode,
+        numerical_grid_size=parameters.legend_max_grid_size or legend_size_px,
     )
 
-    if alpha_values is not None:
-        values_cmap = np.concatenate([values_cmap, alpha_values], axis=1)
+    def display_legend() -> "Axes":
+        ax = legend_spec.plot(
+            font_colour="black", tick_fontsize_px=tick_fontsize_px, **legend_kwargs
+        )
+        fig = cast("Figure", ax.figure)
+        resize_fig(fig=fig, ax=ax, legend_size_px=legend_size_px)
 
-    values_cmap = (values_cmap * 255).astype(np.uint8)
+        return ax
 
-    map_kwargs = map_kwargs or {}
-    polygon_kwargs = polygon_kwargs or {}
-    scatterplot_kwargs = scatterplot_kwargs or {}
-    path_kwargs = path_kwargs or {}
+    return _Colouring(
+        colour_bytes=colour_bytes,
+        tiles=tiles,
+        legend=display_legend,
+        legend_spec=legend_spec,
+        bounds=prepared_data.bounds,
+        cmap=cmap,
+        dark_mode=dark_mode,
+        values=values,
+    )
 
-    map_kwargs["basemap_style"] = tiles
 
-    # Polygon layer
-    polygon_kwargs["filled"] = True
-    polygon_kwargs["get_fill_color"] = values_cmap
+def _without_values(
+    parameters: _ColouringParameters, colouring: _Colouring
+) -> _ColouringParameters:
+    # Values passed directly are replaced by their copies or dropped, so the input data isn't
+    # referenced
+    values_a, values_b = colouring.values or (None, None)
+    return replace(
+        parameters,
+        column_a=parameters.column_a if isinstance(parameters.column_a, str) else values_a,
+        column_b=parameters.column_b if isinstance(parameters.column_b, str) else values_b,
+    )
 
-    if "stroked" not in polygon_kwargs:
-        polygon_kwargs["stroked"] = False
-    if "opacity" not in polygon_kwargs:
-        polygon_kwargs["opacity"] = 1
 
-    # Scatterplot layer
-    scatterplot_kwargs["filled"] = True
-    scatterplot_kwargs["get_fill_color"] = values_cmap
+def _viz_h3_cells(
+    data: Any,
+    h3_column: str,
+    keep_columns: list[str] | None,
+    polygon_kwargs: "PolygonLayerKwargs",
+    map_kwargs: "MapKwargs",
+) -> "Map":
+    import pyarrow as pa
+    from lonboard import H3HexagonLayer, Map
 
-    if "stroked" not in scatterplot_kwargs:
-        scatterplot_kwargs["stroked"] = False
-    if "opacity" not in scatterplot_kwargs:
-        scatterplot_kwargs["opacity"] = 1
+    try:
+        narwhals_df = nw.from_native(cast("IntoFrame", data))
+    except TypeError as ex:
+        raise TypeError("Cannot parse provided input as a source for loading H3 cells.") from ex
 
-    # Path layer
-    path_kwargs["get_color"] = values_cmap
+    if isinstance(narwhals_df, nw.LazyFrame):
+        narwhals_df = narwhals_df.collect()
 
-    if "opacity" not in path_kwargs:
-        path_kwargs["opacity"] = 1
+    if keep_columns is None:
+        # Geometries can't be converted to Arrow and aren't used by the H3 layer
+        columns = [
+            column
+            for column, dtype in narwhals_df.schema.items()
+            if not isinstance(dtype, (nw.Object, nw.Unknown))
+        ]
+    else:
+        columns = keep_columns
 
-    m = viz(
-        data=data,
-        map_kwargs=map_kwargs,
-        polygon_kwargs=polygon_kwargs,
-        scatterplot_kwargs=scatterplot_kwargs,
-        path_kwargs=path_kwargs,
-    )
+    columns = list(dict.fromkeys([h3_column, *columns]))
+    for column in columns:
+        if column not in narwhals_df.columns:
+            raise ValueError(f"Column '{column}' not found in data.")
 
-    if legend:
-        legend_kwargs = legend_kwargs or {}
-
-        grid_size: int | tuple[int, int]
-        numerical_grid_size = legend_max_grid_size or legend_size_px
-        if scheme_result.scheme_a is scheme_result.scheme_b is None:
-            grid_size = numerical_grid_size
-        else:
-            grid_size_y = (
-                numerical_grid_size if scheme_result.scheme_a is None else scheme_result.k_a
-            )
-            grid_size_x = (
-                numerical_grid_size if scheme_result.scheme_b is None else scheme_result.k_b
-            )
-            grid_size = (grid_size_x, grid_size_y)
-
-        def display_legend() -> "Axes":
-            ax = plot_bivariate_legend(
-                values_a=original_values_a,
-                values_b=original_values_b,
-                cmap=cmap,
-                label_a=column_a_label,
-                label_b=column_b_label,
-                tick_labels_a=scheme_result.tick_labels_a,
-                tick_labels_b=scheme_result.tick_labels_b,
-                font_colour="black",
-                grid_size=grid_size,
-                dark_mode=dark_mode,
-                tick_fontsize_px=legend_tick_fontsize_px,
-                **legend_kwargs,
-            )
-            fig = cast("Figure", ax.figure)
-            resize_fig(fig=fig, ax=ax, legend_size_px=legend_size_px)
-            # plt.show()
+    table = narwhals_df.select(*columns).to_arrow()
 
-            return ax
+    cells = table[h3_column]
+    if pa.types.is_signed_integer(cells.type):
+        # H3 indexes are unsigned 64-bit integers, read as signed ones by most dataframe libraries
+        cells = cells.cast(pa.uint64())
 
-        return LonboardMapWithLegend(m=m, legend=display_legend)
+    layer = H3HexagonLayer(table, get_hexagon=cells, **polygon_kwargs)
+    return Map(layer, **map_kwargs)
 
-    return m
+
+def _concat_tables_columns(
+    tables: "list[Any] | tuple[Any, ...]", columns: list[str]
+) -> "dict[str, npt.NDArray[Any]]":
+    # Values of all tables are concatenated, so the classification and normalization are shared
+    tables_values = []
+    for table in tables:
+        narwhals_df = nw.from_native(cast("IntoFrame", table)).select(*columns)
+        if isinstance(narwhals_df, nw.LazyFrame):
+            narwhals_df = narwhals_df.collect()
+
+        tables_values.append(narwhals_df)
+
+    return {
+        column: np.concatenate([table_values[column].to_numpy() for table_values in tables_values])
+        for column in columns
+    }
+
+
+def _prepare_table_layers(
+    table: Any, keep_columns: list[str] | None
+) -> "list[tuple[Any, npt.NDArray[np.intp] | None]]":
+    # Returns data of each layer created for the table with positions of its rows in the table
+    # or None, if the whole table is plotted as a single layer
+    if not is_geodataframe(table):
+        return [(table, None)]
+
+    # Dropped columns aren't converted to Arrow at all
+    geoarrow_table = to_geoarrow_table(table, columns=keep_columns)
+    if geoarrow_table is not None:
+        return [(geoarrow_table, None)]
+
+    # Mixed geometry types are split into separate layers by bivario, to know their rows order
+    layers: list[tuple[Any, npt.NDArray[np.intp] | None]] = []
+    for indices in split_geometry_types(table):
+        partial_gdf = table.iloc[indices]
+        partial_table = to_geoarrow_table(partial_gdf, columns=keep_columns)
+        layers.append((partial_gdf if partial_table is None else partial_table, indices))
+
+    return layers
+
+
+def _get_layers_rows(
+    m: "Map",
+    tables_layers_indices: "list[list[npt.NDArray[np.intp] | None]]",
+    number_of_values: int,
+) -> "list[_LayerRows]":
+    if len(m.layers) != sum(len(table_layers) for table_layers in tables_layers_indices):
+        raise ValueError(
+            "Data with mixed geometry types is only supported for GeoDataFrame inputs."
+        )
+
+    layers = iter(m.layers)
+    layers_rows: list[_LayerRows] = []
+    offset = 0
+    for table_layers_indices in tables_layers_indices:
+        table_size = 0
+        for indices in table_layers_indices:
+            layer = next(layers)
+            if indices is None:
+                # Contiguous rows are passed to the layer as a view of the colours buffer
+                table_size = layer.table.num_rows
+                layers_rows.append(slice(offset, offset + table_size))
+            else:
+                table_size += len(indices)
+                layers_rows.append(indices + offset)
+
+        offset += table_size
+
+    if offset != number_of_values:
+        raise ValueError(
+            f"Number of values ({number_of_values}) doesn't match "
+            f"the number of rows in data ({offset})."
+        )
+
+    return layers_rows
+
+
+def _set_layers_colours(
+    m: "Map", colour_bytes: "npt.NDArray[np.uint8]", layers_rows: "list[_LayerRows] | None"
+) -> None:
+    layers_rows = layers_rows or [slice(None)] * len(m.layers)
+    for layer, rows in zip(m.layers, layers_rows, strict=True):
+        trait_name = _get_colour_trait_name(layer)
+        if trait_name is not None:
+            setattr(layer, trait_name, _to_arrow_colours(colour_bytes[rows]))
+
+
+def _send_layers_colours(
+    m: "Map",
+    colour_bytes: "npt.NDArray[np.uint8]",
+    layers_rows: "list[_LayerRows] | None",
+    row_indices: "npt.NDArray[np.intp]",
+) -> None:
+    # Buffer is already patched in place, only layers with changed rows are synced
+    layers_rows = layers_rows or [slice(None)] * len(m.layers)
+    for layer, rows in zip(m.layers, layers_rows, strict=True):
+        trait_name = _get_colour_trait_name(layer)
+        if trait_name is None:
+            continue
+
+        if isinstance(rows, slice):
+            start, stop, _ = rows.indices(len(colour_bytes))
+            if np.any((row_indices >= start) & (row_indices < stop)):
+                # Layer colours are a view of the buffer, so they only have to be sent again.
+                # Assigning them would be ignored, since they are equal to the current ones.
+                layer.send_state(trait_name)
+        elif np.isin(row_indices, rows).any():
+            setattr(layer, trait_name, _to_arrow_colours(colour_bytes[rows]))
+
+
+def _get_basemap(tiles: str, basemap: "MaplibreBasemap | None" = None) -> "MaplibreBasemap":
+    from lonboard.basemap import MaplibreBasemap
+
+    # Existing basemap keeps its mode, new one is interleaved like in lonboard.viz
+    if basemap is None:
+        return MaplibreBasemap(mode="interleaved", style=tiles)
+
+    basemap.style = tiles
+    return basemap
+
+
+def _get_colour_trait_name(layer: Any) -> str | None:
+    from lonboard import H3HexagonLayer, PathLayer, PolygonLayer, ScatterplotLayer
+
+    if isinstance(layer, PathLayer):
+        return "get_color"
+    if isinstance(layer, (H3HexagonLayer, PolygonLayer, ScatterplotLayer)):
+        return "get_fill_color"
+
+    return None
+
+
+def _patch_values(
+    values: "NumericArray", row_indices: "npt.NDArray[np.intp]", new_values: "NumericArray"
+) -> "NumericArray":
+    # Kept values are upcast if the new ones don't fit their type (e.g. floats into integers)
+    dtype = np.result_type(values, new_values)
+    if dtype != values.dtype:
+        values = values.astype(dtype)
+
+    values[row_indices] = new_values
+    return values
+
+
+def _to_colour_bytes(
+    values_cmap: "BivariateColourmapArray", alpha_values: "npt.NDArray[np.float64] | None"
+) -> "npt.NDArray[np.uint8]":
+    # Colours are written directly to a single uint8 buffer without intermediate copies
+    list_size = 3 if alpha_values is None else 4
+    colour_bytes = np.empty((len(values_cmap), list_size), dtype=np.uint8)
+    np.multiply(values_cmap[:, :3], 255, out=colour_bytes[:, :3], casting="unsafe")
+    if alpha_values is not None:
+        np.multiply(alpha_values, 255, out=colour_bytes[:, 3], casting="unsafe")
+
+    return colour_bytes
+
+
+def _to_arrow_colours(colour_bytes: "npt.NDArray[np.uint8]") -> "ChunkedArray":
+    # Buffer (or its rows slice) is wrapped as an Arrow array without copying it
+    from arro3.core import ChunkedArray, fixed_size_list_array
+
+    return ChunkedArray([fixed_size_list_array(colour_bytes.reshape(-1), colour_bytes.shape[1])])
+
+
+def _select_layers_columns(m: "Map", keep_columns: list[str]) -> None:
+    tables = [layer.table for layer in m.layers if hasattr(layer, "table")]
+
+    available_columns = {column for table in tables for column in table.column_names}
+    for column in keep_columns:
+        if column not in available_columns:
+            raise ValueError(f"Column '{column}' not found in data.")
+
+    for layer in m.layers:
+        if not hasattr(layer, "table"):
+            continue
+
+        schema = layer.table.schema
+        layer.table = layer.table.select(
+            [
+                field.name
+                for field in (schema.field(idx) for idx in range(len(schema)))
+                if field.name in keep_columns or _is_geometry_field(field)
+            ]
+        )
+
+
+def _is_geometry_field(field: Any) -> bool:
+    extension_name = (field.metadata or {}).get(b"ARROW:extension:name", b"")
+    return cast("bytes", extension_name).startswith(b"geoarrow.")
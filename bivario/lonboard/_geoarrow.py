@@ -0,0 +1,158 @@
+"""Cached conversion of GeoDataFrames to GeoArrow tables for lonboard layers."""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy.typing as npt
+    from arro3.core import ChunkedArray, Field, Table
+
+__all__ = [
+    "clear_geometry_cache",
+    "is_geodataframe",
+    "split_geometry_types",
+    "to_geoarrow_table",
+]
+
+# Total size of cached entries, the least recently used ones are evicted first
+_GEOMETRY_CACHE_MAX_BYTES = 2**30
+# Approximate memory used by a Shapely geometry object and by each of its coordinates
+_SHAPELY_GEOMETRY_BYTES = 200
+_SHAPELY_COORDINATE_BYTES = 32
+
+
+@dataclass(frozen=True)
+class _CachedGeometry:
+    # Keeps the geometry objects alive, so their addresses identifying the entry aren't reused
+    geometries: "npt.NDArray[np.object_]"
+    field: "Field"
+    column: "ChunkedArray"
+    # Size of the GeoArrow column and estimated size of the Shapely objects kept alive
+    nbytes: int
+
+
+_GEOMETRY_CACHE: "OrderedDict[tuple[bytes, Any], _CachedGeometry]" = OrderedDict()
+
+
+def to_geoarrow_table(gdf: "gpd.GeoDataFrame", columns: list[str] | None = None) -> "Table | None":
+    """
+    Convert GeoDataFrame to an Arrow table with a GeoArrow geometry column in EPSG:4326.
+
+    Converted geometries are cached and reused for the same geometry objects and CRS, so plotting
+    the same GeoDataFrame again (e.g. with different columns or colourmap) skips the geometries
+    conversion and reprojection. Only the attribute columns are converted on every call.
+
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame to convert.
+        columns (list[str] | None, optional): Attribute columns to convert, other ones are
+            skipped. If None, all columns are converted. Defaults to None.
+
+    Returns:
+        Table | None: Arrow table with the attribute columns and the geometry column or None,
+            if geometries can't be stored in a single GeoArrow column (e.g. mixed points
+            and polygons).
+    """
+    import pyarrow as pa
+    import shapely
+    from arro3.core import Array, ChunkedArray, Table
+
+    geometries = np.asarray(gdf.geometry.array)
+    # Shapely geometries are immutable, so the same objects always have the same coordinates
+    key = (hashlib.blake2b(geometries.tobytes(), digest_size=16).digest(), gdf.crs)
+
+    cached_geometry = _GEOMETRY_CACHE.get(key)
+    if cached_geometry is None:
+        geometry = gdf.geometry
+        if geometry.crs is not None and not geometry.crs.equals(4326):
+            geometry = geometry.to_crs(4326)
+
+        try:
+            geometry_array = Array.from_arrow(geometry.to_arrow(geometry_encoding="geoarrow"))
+        except ValueError:
+            return None
+
+        geometry_column = ChunkedArray([geometry_array])
+        cached_geometry = _CachedGeometry(
+            geometries=geometries.copy(),
+            field=geometry_array.field,
+            column=geometry_column,
+            nbytes=geometry_column.nbytes
+            + len(geometries) * _SHAPELY_GEOMETRY_BYTES
+            + int(shapely.get_num_coordinates(geometries).sum()) * _SHAPELY_COORDINATE_BYTES,
+        )
+        _add_to_cache(key, cached_geometry)
+    else:
+        _GEOMETRY_CACHE.move_to_end(key)
+
+    attribute_columns = [
+        column
+        for column in gdf.columns
+        if column != gdf.geometry.name and (columns is None or column in columns)
+    ]
+    attributes = pa.Table.from_pandas(gdf[attribute_columns])
+    # Same geometries can be cached under a different column name
+    return Table.from_arrow(attributes).append_column(
+        cached_geometry.field.with_name(gdf.geometry.name), cached_geometry.column
+    )
+
+
+def split_geometry_types(gdf: "gpd.GeoDataFrame") -> "list[npt.NDArray[np.intp]]":
+    """
+    Split rows of GeoDataFrame with mixed geometry types into groups with a single type.
+
+    Groups are ordered from polygons, through linestrings, to points, same as the layers created
+    by lonboard, so the points are rendered on top. Other geometries (e.g. geometry collections)
+    are kept in a separate group at the end.
+
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame to split.
+
+    Returns:
+        list[npt.NDArray[np.intp]]: Positional indices of the rows in each non-empty group.
+    """
+    import shapely
+
+    type_ids = shapely.get_type_id(np.asarray(gdf.geometry.array))
+    groups = [
+        np.isin(type_ids, [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON]),
+        np.isin(
+            type_ids,
+            [
+                shapely.GeometryType.LINESTRING,
+                shapely.GeometryType.LINEARRING,
+                shapely.GeometryType.MULTILINESTRING,
+            ],
+        ),
+        np.isin(type_ids, [shapely.GeometryType.POINT, shapely.GeometryType.MULTIPOINT]),
+    ]
+    groups.append(~np.logical_or.reduce(groups))
+
+    return [np.flatnonzero(group) for group in groups if group.any()]
+
+
+def is_geodataframe(data: Any) -> bool:
+    """Check if data is a GeoDataFrame without importing GeoPandas."""
+    return bool(
+        data.__class__.__module__.startswith("geopandas")
+        and data.__class__.__name__ == "GeoDataFrame"
+    )
+
+
+def clear_geometry_cache() -> None:
+    """Remove all cached GeoArrow geometries."""
+    _GEOMETRY_CACHE.clear()
+
+
+def _add_to_cache(key: tuple[bytes, Any], cached_geometry: _CachedGeometry) -> None:
+    _GEOMETRY_CACHE[key] = cached_geometry
+
+    cache_size = sum(entry.nbytes for entry in _GEOMETRY_CACHE.values())
+    # The newest entry is always kept, even if it exceeds the limit by itself
+    while cache_size > _GEOMETRY_CACHE_MAX_BYTES and len(_GEOMETRY_CACHE) > 1:
+        _, evicted_geometry = _GEOMETRY_CACHE.popitem(last=False)
+        cache_size -= evicted_geometry.nbytes
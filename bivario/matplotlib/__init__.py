@@ -0,0 +1,276 @@
+"""Bivariate Matplotlib maps module."""
+
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.path import Path
+
+from bivario._prepared import prepare_bivariate_data
+from bivario._scheme import SCHEME_TYPE
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import BivariateColourmap, get_bivariate_cmap
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy.typing as npt
+
+    from bivario.typing import ValueInput
+
+__all__ = ["plot_bivariate_data"]
+
+# Vector layers above this number of geometries are rasterized by default in vector outputs
+_RASTERIZE_THRESHOLD = 10_000
+
+# Shapely geometry type ids
+_POINT_TYPE_ID = 0
+_LINE_TYPE_IDS = (1, 2)
+_POLYGON_TYPE_ID = 3
+
+# Default offsets of the legend from the axes corner, leaving space for labels and ticks
+_LEGEND_OFFSETS = {"bl": (0.12, 0.12), "br": (0.03, 0.12), "tl": (0.12, 0.03), "tr": (0.03, 0.03)}
+
+
+def plot_bivariate_data(
+    gdf: "gpd.GeoDataFrame",
+    column_a: "str | ValueInput",
+    column_b: "str | ValueInput",
+    ax: Axes | None = None,
+    column_a_label: str | None = None,
+    column_b_label: str | None = None,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
+    k: int | tuple[int, int] = 5,
+    cmap: BivariateColourmap | str | None = None,
+    dark_mode: bool = False,
+    alpha: bool = True,
+    alpha_norm_quantile: float = 0.9,
+    rasterized: bool | None = None,
+    markersize: float | None = None,
+    legend: bool = True,
+    legend_size: float = 0.25,
+    legend_max_grid_size: int = 100,
+    legend_loc: Literal["bl", "br", "tl", "tr"] | None = None,
+    legend_offset: float | tuple[float, float] | None = None,
+    legend_kwargs: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> Axes:
+    """
+    Plot geospatial data with a bivariate colourmap on a static Matplotlib map.
+
+    All geometries of the same kind are drawn as a single collection with an array of colours,
+    instead of a separate artist for each geometry. Polygons are drawn as one `PathCollection`
+    (with holes), lines as one `LineCollection` and points as one scatter plot.
+
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with geometries and values to plot.
+        column_a (str | ValueInput): Column name for the first variable or list/array of values.
+        column_b (str | ValueInput): Column name for the second variable or list/array of values.
+        ax (Axes | None, optional): Matplotlib axis to plot the map on. If None, will be created.
+            Defaults to None.
+        column_a_label (str | None, optional): Label for column a. If None, will use column name.
+            Defaults to None.
+        column_b_label (str | None, optional): Label for column b. If None, will use column name.
+            Defaults to None.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Mapclassify binning
+            scheme for the data. If True, uses "NaturalBreaks". If False or None, no binning is
+            applied. If str, uses the specified scheme. Can also define two different values for
+            columns a and b. If a fitted `BivariateClassifier`, its classes are reused.
+            Defaults to True.
+        k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
+            different values for columns a and b. Defaults to 5.
+        cmap (BivariateColourmap | str | None, optional): Bivariate colourmap to use.
+            If None, will load a default one. Defaults to None.
+        dark_mode (bool, optional): Whether to use dark mode to select a proper order of colours
+            in the colourmap. A new axis gets a black background. Defaults to False.
+        alpha (bool, optional): Whether to apply alpha transparency based on the data values.
+            Defaults to True.
+        alpha_norm_quantile (float, optional): Quantile for normalizing alpha transparency.
+            Used with alpha=True. Defaults to 0.9.
+        rasterized (bool | None, optional): Whether to rasterize the geometries in vector outputs
+            (e.g. PDF or SVG), keeping the axis, labels and legend as vectors. If None, layers with
+            more than 10 000 geometries are rasterized. Defaults to None.
+        markersize (float | None, optional): Size of the points markers. If None, will use
+            Matplotlib default. Defaults to None.
+        legend (bool, optional): Whether to add a bivariate legend to the map. Defaults to True.
+        legend_size (float, optional): Size of the legend as a fraction of the axis size.
+            Defaults to 0.25.
+        legend_max_grid_size (int, optional): Max size of the legend grid used for plotting
+            the legend. Used with scheme=False. Defaults to 100.
+        legend_loc (Literal["bl", "br", "tl", "tr"] | None, optional): Location of the legend
+            on the map. Can be "bl" (bottom-left), "br" (bottom-right), "tl" (top-left),
+            or "tr" (top-right). Defaults to "bl".
+        legend_offset (float | tuple[float, float] | None, optional): Offset of the legend from
+            the specified location as a fraction of the axis size. If None, uses default offsets
+            based on location. Defaults to None.
+        legend_kwargs (dict[str, Any] | None, optional): Additional keyword arguments passed to
+            the legend plotting function. Defaults to None.
+        **kwargs (Any): Additional keyword arguments passed to the Matplotlib collections,
+            e.g. `edgecolor`, `linewidth` or `zorder`.
+
+    Returns:
+        Axes: Matplotlib axes with plotted map and the legend as an inset axis.
+
+    Raises:
+        ValueError: If a column is missing or the legend location is unknown.
+
+    Examples:
+        >>> import matplotlib.pyplot as plt
+        >>> from bivario import plot_bivariate_data
+        >>> from bivario.example_data import nyc_bike_trips
+        >>> gdf = nyc_bike_trips()
+        >>> ax = plot_bivariate_data(gdf, "morning_starts", "morning_ends")
+        >>> plt.close("all")
+    """
+    import shapely
+
+    for column in (column_a, column_b):
+        if isinstance(column, str) and column not in gdf.columns:
+            raise ValueError(f"Column '{column}' not found in GeoDataFrame.")
+
+    legend_loc = legend_loc or "bl"
+    if legend_loc not in _LEGEND_OFFSETS:
+        raise ValueError(f"Unknown legend location: {legend_loc}. Available: bl, br, tl, tr.")
+
+    prepared_data = prepare_bivariate_data(
+        gdf[column_a] if isinstance(column_a, str) else column_a,
+        gdf[column_b] if isinstance(column_b, str) else column_b,
+        scheme=scheme,
+        k=k,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        label_a=column_a_label,
+        label_b=column_b_label,
+    )
+    bivariate_cmap = get_bivariate_cmap(cmap)
+
+    colours = np.ones((len(gdf), 4), dtype=np.float64)
+    colours[:, :3] = prepared_data.colour(bivariate_cmap, dark_mode=dark_mode)
+    if prepared_data.alpha_values is not None:
+        colours[:, 3] = prepared_data.alpha_values
+
+    if ax is None:
+        background = "black" if dark_mode else "white"
+        _, ax = plt.subplots(figsize=(10, 10), facecolor=background)
+        ax.set_facecolor(background)
+
+    if rasterized is None:
+        rasterized = len(gdf) > _RASTERIZE_THRESHOLD
+
+    # Multi-part geometries and collections are split into parts sharing the geometry colour
+    parts, geometry_indexes = shapely.get_parts(gdf.geometry.values, return_index=True)
+    not_empty = ~shapely.is_empty(parts)
+    parts, geometry_indexes = parts[not_empty], geometry_indexes[not_empty]
+    type_ids = shapely.get_type_id(parts)
+
+    is_polygon = type_ids == _POLYGON_TYPE_ID
+    if is_polygon.any():
+        paths, path_geometry_indexes = _get_polygon_paths(
+            parts[is_polygon], geometry_indexes[is_polygon]
+        )
+        polygons_collection = PathCollection(
+            paths,
+            facecolors=colours[path_geometry_indexes],
+            rasterized=rasterized,
+            **{"edgecolor": "none", **kwargs},
+        )
+        ax.add_collection(polygons_collection, autolim=True)
+
+    is_line = np.isin(type_ids, _LINE_TYPE_IDS)
+    if is_line.any():
+        coordinates, line_indexes = shapely.get_coordinates(parts[is_line], return_index=True)
+        line_starts = np.flatnonzero(np.diff(line_indexes, prepend=-1))
+        lines_collection = LineCollection(
+            np.split(coordinates, line_starts[1:]),
+            colors=colours[geometry_indexes[is_line]],
+            rasterized=rasterized,
+            **kwargs,
+        )
+        ax.add_collection(lines_collection, autolim=True)
+
+    is_point = type_ids == _POINT_TYPE_ID
+    if is_point.any():
+        ax.scatter(
+            shapely.get_x(parts[is_point]),
+            shapely.get_y(parts[is_point]),
+            s=markersize,
+            c=colours[geometry_indexes[is_point]],
+            rasterized=rasterized,
+            **kwargs,
+        )
+
+    ax.autoscale_view()
+    # Same aspect as in GeoPandas plots, geographic coordinates are scaled at the middle latitude
+    if gdf.crs is not None and gdf.crs.is_geographic:
+        _, miny, _, maxy = gdf.total_bounds
+        ax.set_aspect(1 / np.cos(np.deg2rad((miny + maxy) / 2)))
+    else:
+        ax.set_aspect("equal")
+
+    if legend:
+        offset_x, offset_y = (
+            _LEGEND_OFFSETS[legend_loc]
+            if legend_offset is None
+            else (
+                legend_offset
+                if isinstance(legend_offset, (tuple, list))
+                else (legend_offset, legend_offset)
+            )
+        )
+        x = offset_x if legend_loc[1] == "l" else 1 - legend_size - offset_x
+        y = offset_y if legend_loc[0] == "b" else 1 - legend_size - offset_y
+        legend_ax = ax.inset_axes((x, y, legend_size, legend_size))
+        legend_spec = prepared_data.legend_spec(
+            bivariate_cmap, dark_mode=dark_mode, numerical_grid_size=legend_max_grid_size
+        )
+        legend_spec.plot(ax=legend_ax, **(legend_kwargs or {}))
+
+    return ax
+
+
+def _get_polygon_paths(
+    polygons: "npt.NDArray[Any]", polygon_geometry_indexes: "npt.NDArray[np.int64]"
+) -> tuple[list[Path], "npt.NDArray[np.int64]"]:
+    # Builds a single compound path for all rings of all parts of each geometry, with
+    # coordinates read in one call and exteriors and holes oriented in opposite directions
+    import shapely
+
+    rings, ring_polygon_indexes = shapely.get_rings(polygons, return_index=True)
+    coordinates, coordinate_ring_indexes = shapely.get_coordinates(rings, return_index=True)
+
+    ring_starts = np.flatnonzero(np.diff(coordinate_ring_indexes, prepend=-1))
+    ring_ends = np.append(ring_starts[1:], len(coordinates)) - 1
+
+    # Matplotlib fills paths with the nonzero rule, so holes must be oriented against exteriors
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    same_ring = coordinate_ring_indexes[:-1] == coordinate_ring_indexes[1:]
+    signed_areas = np.bincount(
+        coordinate_ring_indexes[:-1][same_ring],
+        weights=(x[:-1] * y[1:] - x[1:] * y[:-1])[same_ring],
+        minlength=len(rings),
+    )
+    is_exterior = np.diff(ring_polygon_indexes, prepend=-1) != 0
+    reverse_ring = (signed_areas < 0) == is_exterior
+    reverse_coordinate = reverse_ring[coordinate_ring_indexes]
+    order = np.arange(len(coordinates))
+    order[reverse_coordinate] = (ring_starts + ring_ends)[
+        coordinate_ring_indexes[reverse_coordinate]
+    ] - order[reverse_coordinate]
+    coordinates = coordinates[order]
+
+    codes = np.full(len(coordinates), Path.LINETO, dtype=Path.code_type)
+    codes[ring_starts] = Path.MOVETO
+    codes[ring_ends] = Path.CLOSEPOLY
+
+    coordinate_geometry_indexes = polygon_geometry_indexes[
+        ring_polygon_indexes[coordinate_ring_indexes]
+    ]
+    path_geometry_indexes, path_starts = np.unique(coordinate_geometry_indexes, return_index=True)
+    paths = [
+        Path(vertices, path_codes)
+        for vertices, path_codes in zip(
+            np.split(coordinates, path_starts[1:]), np.split(codes, path_starts[1:]), strict=True
+        )
+    ]
+    return paths, path_geometry_indexes
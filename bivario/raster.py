@@ -0,0 +1,244 @@
+"""Bivariate rasterization of large point datasets."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+from bivario._prepared import prepare_bivariate_data
+from bivario._scheme import SCHEME_TYPE
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import BivariateColourmap, _validate_values, get_bivariate_cmap
+from bivario.legend import BivariateLegendSpec, _try_parse_label
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    from matplotlib.axes import Axes
+
+    from bivario.typing import ValueInput
+
+__all__ = ["BivariateRaster", "rasterize_bivariate"]
+
+
+@dataclass(frozen=True)
+class BivariateRaster:
+    """
+    Bivariate colours of points aggregated into a grid of pixels.
+
+    Attributes:
+        image (npt.NDArray[np.uint8]): RGBA image with shape (height, width, 4). First row is
+            the top of the image (maximum y). Pixels without points are fully transparent.
+        bounds (tuple[float, float, float, float]): Bounds of the image (minx, miny, maxx, maxy)
+            in the coordinates of the points.
+        counts (npt.NDArray[np.int64]): Number of points in each pixel, with shape
+            (height, width).
+        legend_spec (BivariateLegendSpec): Legend specification of the aggregated values.
+    """
+
+    image: "npt.NDArray[np.uint8]"
+    bounds: tuple[float, float, float, float]
+    counts: "npt.NDArray[np.int64]"
+    legend_spec: BivariateLegendSpec
+
+    def plot(self, ax: "Axes | None" = None, **imshow_kwargs: Any) -> "Axes":
+        """
+        Plot the image on Matplotlib axes in the coordinates of the points.
+
+        Args:
+            ax (Axes | None, optional): Matplotlib axis to plot the image on. If None, will be
+                created. Defaults to None.
+            **imshow_kwargs (Any): Additional keyword arguments passed to the `imshow` function.
+
+        Returns:
+            Axes: Matplotlib axes with plotted image.
+        """
+        if ax is None:
+            from matplotlib import pyplot as plt
+
+            _, ax = plt.subplots(figsize=(8, 8))
+
+        minx, miny, maxx, maxy = self.bounds
+        imshow_kwargs = {"interpolation": "nearest", **imshow_kwargs}
+        ax.imshow(self.image, extent=(minx, maxx, miny, maxy), origin="upper", **imshow_kwargs)
+        return ax
+
+
+def rasterize_bivariate(
+    x: "ValueInput",
+    y: "ValueInput",
+    values_a: "ValueInput",
+    values_b: "ValueInput",
+    size_px: int | tuple[int, int] = 1024,
+    bounds: tuple[float, float, float, float] | None = None,
+    aggregation: Literal["mean", "sum"] = "mean",
+    label_a: str | None = None,
+    label_b: str | None = None,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
+    k: int | tuple[int, int] = 5,
+    cmap: BivariateColourmap | str | None = None,
+    dark_mode: bool = False,
+    alpha: bool = False,
+    alpha_norm_quantile: float = 0.9,
+    legend_max_grid_size: int = 100,
+) -> BivariateRaster:
+    """
+    Aggregate points into a grid of pixels and colour it with a bivariate colourmap.
+
+    Values of both variables are aggregated per pixel with a single pass over the points,
+    so the colouring and the returned image depend only on the number of pixels, not points.
+    Coordinates are used as they are, so the pixels are square in the CRS of the points
+    (e.g. use Web Mercator coordinates for an overlay on a web map).
+
+    Args:
+        x (ValueInput): List or array of x coordinates of the points.
+        y (ValueInput): List or array of y coordinates of the points.
+        values_a (ValueInput): List or array of values for the first variable.
+        values_b (ValueInput): List or array of values for the second variable.
+        size_px (int | tuple[int, int], optional): Size of the longer side of the image in pixels
+            or the width and height of the image. Defaults to 1024.
+        bounds (tuple[float, float, float, float] | None, optional): Bounds of the image
+            (minx, miny, maxx, maxy). Points outside of the bounds are skipped. If None, will use
+            the bounds of all points. Defaults to None.
+        aggregation (Literal["mean", "sum"], optional): Aggregation of the values of points
+            within a single pixel. Defaults to "mean".
+        label_a (str | None, optional): Label for the first variable. If None, will try to read
+            series name. Defaults to None.
+        label_b (str | None, optional): Label for the second variable. If None, will try to read
+            series name. Defaults to None.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Mapclassify binning
+            scheme for the aggregated values. If True, uses "NaturalBreaks". If False or None,
+            no binning is applied. If str, uses the specified scheme. Can also define two
+            different values for both variables. If a fitted `BivariateClassifier`, its classes
+            are reused. Defaults to True.
+        k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
+            different values for both variables. Defaults to 5.
+        cmap (BivariateColourmap | str | None, optional): Bivariate colourmap to use.
+            If None, will load a default one. Defaults to None.
+        dark_mode (bool, optional): Whether to use dark mode to select a proper order of colours
+            in the colourmap. Defaults to False.
+        alpha (bool, optional): Whether to scale the transparency of the pixels with the
+            aggregated values. Defaults to False.
+        alpha_norm_quantile (float, optional): Quantile of the aggregated values used as the
+            fully opaque value. Used with alpha=True. Defaults to 0.9.
+        legend_max_grid_size (int, optional): Number of pixels in the legend grid of variables
+            without binning. Defaults to 100.
+
+    Returns:
+        BivariateRaster: RGBA image with its bounds, number of points in pixels and legend.
+
+    Raises:
+        ValueError: If the number of coordinates and values doesn't match, the size or
+            aggregation is invalid, or there are no points within the bounds.
+    """
+    parsed_x, parsed_y = _validate_values(x, y)
+    parsed_values_a, parsed_values_b = _validate_values(values_a, values_b)
+    if not len(parsed_x) == len(parsed_y) == len(parsed_values_a) == len(parsed_values_b):
+        raise ValueError("Coordinates and values must have the same length.")
+    if aggregation not in ("mean", "sum"):
+        raise ValueError(f"Unknown aggregation: {aggregation}. Available aggregations: mean, sum.")
+
+    if bounds is None:
+        bounds = _get_bounds(parsed_x, parsed_y)
+    minx, miny, maxx, maxy = (float(bound) for bound in bounds)
+    if not (maxx > minx and maxy > miny):
+        raise ValueError("Bounds must have a positive width and height.")
+
+    width_px, height_px = _get_image_size(size_px, maxx - minx, maxy - miny)
+
+    # Points are mapped to flat pixel indexes, the first row of the image is the maximum y.
+    # Operations are done in place to allocate only one array per axis
+    columns = np.subtract(parsed_x, minx, dtype=np.float64)
+    columns *= width_px / (maxx - minx)
+    np.floor(columns, out=columns)
+    rows = np.subtract(maxy, parsed_y, dtype=np.float64)
+    rows *= height_px / (maxy - miny)
+    np.floor(rows, out=rows)
+    # Points on the maximum x and minimum y edges belong to the last column and row
+    columns[parsed_x == maxx] = width_px - 1
+    rows[parsed_y == miny] = height_px - 1
+    mask = (
+        (columns >= 0)
+        & (columns < width_px)
+        & (rows >= 0)
+        & (rows < height_px)
+        & np.isfinite(parsed_values_a)
+        & np.isfinite(parsed_values_b)
+    )
+    pixels = rows[mask].astype(np.int64) * width_px + columns[mask].astype(np.int64)
+    if not len(pixels):
+        raise ValueError("There are no points with values within the bounds.")
+
+    n_pixels = width_px * height_px
+    counts = np.bincount(pixels, minlength=n_pixels)
+    occupied = np.flatnonzero(counts)
+    sums_a = np.bincount(pixels, weights=parsed_values_a[mask], minlength=n_pixels)
+    sums_b = np.bincount(pixels, weights=parsed_values_b[mask], minlength=n_pixels)
+    # Weighted counts are already floats, so the values aren't copied again
+    aggregated_a = sums_a[occupied].astype(np.float64, copy=False)
+    aggregated_b = sums_b[occupied].astype(np.float64, copy=False)
+    if aggregation == "mean":
+        aggregated_a /= counts[occupied]
+        aggregated_b /= counts[occupied]
+
+    prepared_data = prepare_bivariate_data(
+        aggregated_a,
+        aggregated_b,
+        scheme=scheme,
+        k=k,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        label_a=label_a or _try_parse_label(values_a),
+        label_b=label_b or _try_parse_label(values_b),
+    )
+    bivariate_cmap = get_bivariate_cmap(cmap)
+    values_cmap = prepared_data.colour(bivariate_cmap, dark_mode=dark_mode)
+
+    # Only the occupied pixels are coloured, the other ones stay transparent
+    occupied_colours = np.full((len(occupied), 4), 255, dtype=np.uint8)
+    np.multiply(values_cmap[:, :3], 255, out=occupied_colours[:, :3], casting="unsafe")
+    if prepared_data.alpha_values is not None:
+        np.multiply(prepared_data.alpha_values, 255, out=occupied_colours[:, 3], casting="unsafe")
+
+    image = np.zeros((n_pixels, 4), dtype=np.uint8)
+    image[occupied] = occupied_colours
+
+    return BivariateRaster(
+        image=image.reshape(height_px, width_px, 4),
+        bounds=(minx, miny, maxx, maxy),
+        counts=counts.reshape(height_px, width_px),
+        legend_spec=prepared_data.legend_spec(
+            bivariate_cmap, dark_mode=dark_mode, numerical_grid_size=legend_max_grid_size
+        ),
+    )
+
+
+def _get_bounds(x: "npt.NDArray[Any]", y: "npt.NDArray[Any]") -> tuple[float, float, float, float]:
+    if not len(x):
+        raise ValueError("There are no points with values within the bounds.")
+
+    minx, maxx = float(np.nanmin(x)), float(np.nanmax(x))
+    miny, maxy = float(np.nanmin(y)), float(np.nanmax(y))
+    # Keep a non-zero extent for a single point or points on a horizontal / vertical line
+    if maxx == minx:
+        minx, maxx = minx - 0.5, maxx + 0.5
+    if maxy == miny:
+        miny, maxy = miny - 0.5, maxy + 0.5
+
+    return minx, miny, maxx, maxy
+
+
+def _get_image_size(size_px: int | tuple[int, int], width: float, height: float) -> tuple[int, int]:
+    if isinstance(size_px, tuple):
+        width_px, height_px = size_px
+    else:
+        width_px = height_px = size_px
+
+    if width_px < 1 or height_px < 1:
+        raise ValueError("size_px must be a positive integer.")
+
+    if not isinstance(size_px, tuple):
+        scale = size_px / max(width, height)
+        width_px = max(1, round(width * scale))
+        height_px = max(1, round(height * scale))
+
+    return width_px, height_px
@@ -0,0 +1,206 @@
+"""Bivariate map tiles module."""
+
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from bivario._prepared import prepare_bivariate_data
+from bivario._raster import (
+    _MAX_GEOMETRIES,
+    WEB_MERCATOR_CRS,
+    draw_geometry_ids,
+    get_colours_lookup,
+)
+from bivario._scheme import SCHEME_TYPE
+from bivario._tiles import (
+    RENDER_STATE,
+    TILE,
+    TilesetMetadata,
+    query_bounds,
+    tile_bounds,
+    validate_zoom_range,
+    write_tiles,
+)
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import BivariateColourmap, get_bivariate_cmap
+from bivario.legend import BivariateLegendSpec
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy.typing as npt
+
+    from bivario.typing import ValueInput
+
+__all__ = ["render_bivariate_tiles"]
+
+# Markers and lines drawn over the tile border are rendered in the neighbouring tiles
+_TILE_MARGIN_PX = 8
+
+
+def render_bivariate_tiles(
+    gdf: "gpd.GeoDataFrame",
+    column_a: "str | ValueInput",
+    column_b: "str | ValueInput",
+    output: str | Path,
+    min_zoom: int = 0,
+    max_zoom: int = 12,
+    column_a_label: str | None = None,
+    column_b_label: str | None = None,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
+    k: int | tuple[int, int] = 5,
+    cmap: BivariateColourmap | str | None = None,
+    dark_mode: bool = False,
+    alpha: bool = True,
+    alpha_norm_quantile: float = 0.9,
+    tile_size_px: int = 256,
+    processes: int | None = None,
+    name: str | None = None,
+    legend_max_grid_size: int = 100,
+) -> BivariateLegendSpec:
+    """
+    Render geospatial data with a bivariate colourmap into a pyramid of XYZ PNG tiles.
+
+    Colours are computed once for all geometries and each tile is rasterized in a separate
+    process, drawing only the geometries intersecting the tile. Empty tiles are skipped.
+    Tiles can be served as a static layer by any web map (e.g. with
+    `folium.TileLayer("tiles/{z}/{x}/{y}.png")`) without embedding the geometries in the page.
+
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with geometries and values to plot.
+        column_a (str | ValueInput): Column name or list / array of values for the first
+            variable.
+        column_b (str | ValueInput): Column name or list / array of values for the second
+            variable.
+        output (str | Path): Output path. If it ends with ".mbtiles" or ".pmtiles", tiles are
+            written to a single MBTiles or PMTiles archive. Otherwise, tiles are written to
+            a directory as {z}/{x}/{y}.png files with a metadata.json file.
+        min_zoom (int, optional): Minimum zoom of the tiles. Defaults to 0.
+        max_zoom (int, optional): Maximum zoom of the tiles. Defaults to 12.
+        column_a_label (str | None, optional): Label for the first variable. If None, will try
+            to read series name. Defaults to None.
+        column_b_label (str | None, optional): Label for the second variable. If None, will try
+            to read series name. Defaults to None.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Mapclassify binning
+            scheme for the data. If True, uses "NaturalBreaks". If False or None, no binning is
+            applied. If str, uses the specified scheme. Can also define two different values for
+            both variables. If a fitted `BivariateClassifier`, its classes are reused.
+            Defaults to True.
+        k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
+            different values for both variables. Defaults to 5.
+        cmap (BivariateColourmap | str | None, optional): Bivariate colourmap to use.
+            If None, will load a default one. Defaults to None.
+        dark_mode (bool, optional): Whether to use dark mode to select a proper order of colours
+            in the colourmap. Defaults to False.
+        alpha (bool, optional): Whether to scale the transparency of the geometries with the
+            values. Defaults to True.
+        alpha_norm_quantile (float, optional): Quantile of the values used as the fully opaque
+            value. Used with alpha=True. Defaults to 0.9.
+        tile_size_px (int, optional): Size of the tiles in pixels. Defaults to 256.
+        processes (int | None, optional): Number of processes rendering the tiles. If 1, tiles
+            are rendered in the current process. If None, will use the number of processors.
+            Defaults to None.
+        name (str | None, optional): Name of the tileset saved in the metadata. If None, will
+            use the output file name. Defaults to None.
+        legend_max_grid_size (int, optional): Number of pixels in the legend grid of variables
+            without binning. Defaults to 100.
+
+    Returns:
+        BivariateLegendSpec: Legend specification of the rendered data, e.g. for plotting
+            the legend next to the map.
+
+    Raises:
+        ValueError: If geometries don't have a defined CRS, there are too many geometries,
+            a column is missing or the zoom range or tile size is invalid.
+    """
+    validate_zoom_range(min_zoom, max_zoom)
+    if tile_size_px < 1:
+        raise ValueError("tile_size_px must be a positive integer.")
+    if gdf.crs is None:
+        raise ValueError("Geometries must have a defined CRS to be rendered.")
+    if len(gdf) > _MAX_GEOMETRIES:
+        raise ValueError(f"Cannot render more than {_MAX_GEOMETRIES:,} geometries.")
+    for column in (column_a, column_b):
+        if isinstance(column, str) and column not in gdf.columns:
+            raise ValueError(f"Column '{column}' not found in GeoDataFrame.")
+
+    prepared_data = prepare_bivariate_data(
+        gdf[column_a] if isinstance(column_a, str) else column_a,
+        gdf[column_b] if isinstance(column_b, str) else column_b,
+        scheme=scheme,
+        k=k,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        label_a=column_a_label,
+        label_b=column_b_label,
+    )
+    bivariate_cmap = get_bivariate_cmap(cmap)
+
+    # Colours are computed once, tiles only look up the colours of the drawn geometries
+    colours = np.ones((len(gdf), 4), dtype=np.float64)
+    colours[:, :3] = prepared_data.colour(bivariate_cmap, dark_mode=dark_mode)
+    if prepared_data.alpha_values is not None:
+        colours[:, 3] = prepared_data.alpha_values
+
+    geometries = gdf.geometry.reset_index(drop=True).to_crs(WEB_MERCATOR_CRS)
+    render_state = {
+        "geometries": geometries,
+        "colours_lookup": get_colours_lookup(colours),
+        "tile_size_px": tile_size_px,
+    }
+
+    minx, miny, maxx, maxy = gdf.geometry.to_crs(4326).total_bounds
+    metadata = TilesetMetadata(
+        name=name or Path(output).stem,
+        tile_format="png",
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
+        bounds=(float(minx), float(miny), float(maxx), float(maxy)),
+        description="Bivariate map created with bivario.",
+    )
+
+    write_tiles(
+        _render_tile,
+        render_state=render_state,
+        geometries=geometries,
+        output=output,
+        metadata=metadata,
+        margin_px=_TILE_MARGIN_PX,
+        tile_size_px=tile_size_px,
+        processes=processes,
+    )
+
+    return prepared_data.legend_spec(
+        bivariate_cmap, dark_mode=dark_mode, numerical_grid_size=legend_max_grid_size
+    )
+
+
+def _render_tile(tile: TILE) -> bytes | None:
+    geometries: gpd.GeoSeries = RENDER_STATE["geometries"]
+    colours_lookup: npt.NDArray[np.uint8] = RENDER_STATE["colours_lookup"]
+    tile_size_px: int = RENDER_STATE["tile_size_px"]
+
+    import shapely
+
+    geometry_indexes = geometries.sindex.query(
+        shapely.box(*query_bounds(tile, _TILE_MARGIN_PX, tile_size_px))
+    )
+    if not len(geometry_indexes):
+        return None
+
+    pixel_ids = draw_geometry_ids(
+        geometries.iloc[geometry_indexes],
+        geometry_ids=geometry_indexes.astype(np.int64) + 1,
+        bounds=tile_bounds(tile),
+        width_px=tile_size_px,
+        height_px=tile_size_px,
+    )
+    image = colours_lookup[pixel_ids]
+    if not image[..., 3].any():
+        return None
+
+    png_bytes = io.BytesIO()
+    Image.fromarray(image).save(png_bytes, format="png")
+    return png_bytes.getvalue()
@@ -0,0 +1,304 @@
+"""Bivariate vector tiles module."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+from bivario._prepared import prepare_bivariate_data
+from bivario._raster import WEB_MERCATOR_CRS
+from bivario._scheme import SCHEME_TYPE
+from bivario._tiles import (
+    RENDER_STATE,
+    TILE,
+    TilesetMetadata,
+    query_bounds,
+    tile_bounds,
+    validate_zoom_range,
+    write_tiles,
+)
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import BivariateColourmap, get_bivariate_cmap
+from bivario.legend import BivariateLegendSpec
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy.typing as npt
+
+    from bivario.typing import ValueInput
+
+__all__ = ["export_bivariate_vector_tiles"]
+
+COLOUR_ENCODING = Literal["palette", "rgba"]
+
+_COLOUR_INDEX_PROPERTY = "colour_index"
+_COLOUR_PROPERTY = "colour"
+# Simplification tolerance and buffer are defined in pixels of a 256 px tile
+_REFERENCE_TILE_SIZE_PX = 256
+
+
+def export_bivariate_vector_tiles(
+    gdf: "gpd.GeoDataFrame",
+    column_a: "str | ValueInput",
+    column_b: "str | ValueInput",
+    output: str | Path,
+    min_zoom: int = 0,
+    max_zoom: int = 14,
+    column_a_label: str | None = None,
+    column_b_label: str | None = None,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = True,
+    k: int | tuple[int, int] = 5,
+    cmap: BivariateColourmap | str | None = None,
+    dark_mode: bool = False,
+    alpha: bool = True,
+    alpha_norm_quantile: float = 0.9,
+    colour_encoding: COLOUR_ENCODING = "palette",
+    keep_columns: list[str] | None = None,
+    layer_name: str = "bivariate",
+    simplify_tolerance_px: float = 1.0,
+    buffer_px: float = 4.0,
+    extent: int = 4096,
+    processes: int | None = None,
+    name: str | None = None,
+    legend_max_grid_size: int = 100,
+) -> BivariateLegendSpec:
+    """
+    Export geospatial data with precomputed bivariate colours to Mapbox Vector Tiles.
+
+    Colours are computed once for all geometries and stored as compact feature attributes,
+    so a map client only looks up the colour of each feature instead of classifying the values.
+    Geometries are clipped to each tile and simplified for its zoom. Tiles are encoded in
+    a process pool, empty tiles are skipped.
+
+    With the "palette" colour encoding, each feature has a `colour_index` attribute pointing to
+    a list of unique "#rrggbbaa" colours saved in the tileset metadata under the
+    `bivario_palette` key, e.g. for a MapLibre expression
+    `["at", ["get", "colour_index"], ["literal", palette]]`. With the "rgba" colour encoding,
+    each feature has a `colour` attribute with the colour packed into a 0xRRGGBBAA integer.
+
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with geometries and values to export.
+        column_a (str | ValueInput): Column name or list / array of values for the first
+            variable.
+        column_b (str | ValueInput): Column name or list / array of values for the second
+            variable.
+        output (str | Path): Output path. If it ends with ".mbtiles" or ".pmtiles", tiles are
+            written (gzip compressed) to a single MBTiles or PMTiles archive. Otherwise, tiles
+            are written to a directory as {z}/{x}/{y}.pbf files with a metadata.json file.
+        min_zoom (int, optional): Minimum zoom of the tiles. Defaults to 0.
+        max_zoom (int, optional): Maximum zoom of the tiles. Defaults to 14.
+        column_a_label (str | None, optional): Label for the first variable. If None, will try
+            to read series name. Defaults to None.
+        column_b_label (str | None, optional): Label for the second variable. If None, will try
+            to read series name. Defaults to None.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Mapclassify binning
+            scheme for the data. If True, uses "NaturalBreaks". If False or None, no binning is
+            applied. If str, uses the specified scheme. Can also define two different values for
+            both variables. If a fitted `BivariateClassifier`, its classes are reused.
+            Defaults to True.
+        k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
+            different values for both variables. Defaults to 5.
+        cmap (BivariateColourmap | str | None, optional): Bivariate colourmap to use.
+            If None, will load a default one. Defaults to None.
+        dark_mode (bool, optional): Whether to use dark mode to select a proper order of colours
+            in the colourmap. Defaults to False.
+        alpha (bool, optional): Whether to scale the transparency of the geometries with the
+            values. Defaults to True.
+        alpha_norm_quantile (float, optional): Quantile of the values used as the fully opaque
+            value. Used with alpha=True. Defaults to 0.9.
+        colour_encoding (Literal["palette", "rgba"], optional): Encoding of the colours in the
+            feature attributes. Defaults to "palette".
+        keep_columns (list[str] | None, optional): Columns saved as additional feature
+            attributes. Missing values are skipped. Defaults to None.
+        layer_name (str, optional): Name of the layer in the tiles. Defaults to "bivariate".
+        simplify_tolerance_px (float, optional): Simplification tolerance in pixels of a 256 px
+            tile. Defaults to 1.0.
+        buffer_px (float, optional): Size of the buffer around each tile in pixels of a 256 px
+            tile, to avoid clipping artifacts at the tile borders. Defaults to 4.0.
+        extent (int, optional): Extent of the tile coordinates grid. Defaults to 4096.
+        processes (int | None, optional): Number of processes encoding the tiles. If 1, tiles
+            are encoded in the current process. If None, will use the number of processors.
+            Defaults to None.
+        name (str | None, optional): Name of the tileset saved in the metadata. If None, will
+            use the output file name. Defaults to None.
+        legend_max_grid_size (int, optional): Number of pixels in the legend grid of variables
+            without binning. Defaults to 100.
+
+    Returns:
+        BivariateLegendSpec: Legend specification of the exported data, e.g. for plotting
+            the legend next to the map.
+
+    Raises:
+        ValueError: If geometries don't have a defined CRS, a column is missing, or the zoom
+            range, colour encoding or tiles parameters are invalid.
+    """
+    try:
+        import mapbox_vector_tile  # noqa: F401
+    except (ImportError, ModuleNotFoundError) as ex:
+        raise ImportError(
+            "The 'mapbox-vector-tile' package "
+            "is required for exporting vector tiles. You can install it using "
+            "'conda install -c conda-forge mapbox-vector-tile' "
+            "or 'pip install mapbox-vector-tile'."
+        ) from ex
+
+    validate_zoom_range(min_zoom, max_zoom)
+    if colour_encoding not in ("palette", "rgba"):
+        raise ValueError(
+            f"Unknown colour encoding: {colour_encoding}. Available encodings: palette, rgba."
+        )
+    if extent < 1 or simplify_tolerance_px < 0 or buffer_px < 0:
+        raise ValueError(
+            "extent must be positive, simplify_tolerance_px and buffer_px can't be negative."
+        )
+    if gdf.crs is None:
+        raise ValueError("Geometries must have a defined CRS to be exported.")
+    keep_columns = keep_columns or []
+    for column in (column_a, column_b, *keep_columns):
+        if isinstance(column, str) and column not in gdf.columns:
+            raise ValueError(f"Column '{column}' not found in GeoDataFrame.")
+
+    prepared_data = prepare_bivariate_data(
+        gdf[column_a] if isinstance(column_a, str) else column_a,
+        gdf[column_b] if isinstance(column_b, str) else column_b,
+        scheme=scheme,
+        k=k,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        label_a=column_a_label,
+        label_b=column_b_label,
+    )
+    bivariate_cmap = get_bivariate_cmap(cmap)
+
+    # Same colour bytes as written to the lonboard layers, packed into a single integer
+    colour_bytes = np.full((len(gdf), 4), 255, dtype=np.uint8)
+    values_cmap = prepared_data.colour(bivariate_cmap, dark_mode=dark_mode)
+    np.multiply(values_cmap[:, :3], 255, out=colour_bytes[:, :3], casting="unsafe")
+    if prepared_data.alpha_values is not None:
+        np.multiply(prepared_data.alpha_values, 255, out=colour_bytes[:, 3], casting="unsafe")
+    packed_colours = colour_bytes.view(">u4").ravel()
+
+    json_metadata: dict[str, Any] = {}
+    fields = {column: _get_field_type(gdf[column]) for column in keep_columns}
+    if colour_encoding == "palette":
+        palette, colour_values = np.unique(packed_colours, return_inverse=True)
+        json_metadata["bivario_palette"] = [f"#{colour:08x}" for colour in palette]
+        fields[_COLOUR_INDEX_PROPERTY] = "Number"
+        colour_property = _COLOUR_INDEX_PROPERTY
+    else:
+        colour_values = packed_colours
+        fields[_COLOUR_PROPERTY] = "Number"
+        colour_property = _COLOUR_PROPERTY
+    json_metadata["vector_layers"] = [
+        {"id": layer_name, "fields": fields, "minzoom": min_zoom, "maxzoom": max_zoom}
+    ]
+
+    geometries = gdf.geometry.reset_index(drop=True).to_crs(WEB_MERCATOR_CRS)
+    render_state = {
+        "geometries": geometries,
+        "properties": {
+            colour_property: colour_values.astype(np.int64),
+            **{column: gdf[column].to_numpy() for column in keep_columns},
+        },
+        "layer_name": layer_name,
+        "simplify_tolerance_px": simplify_tolerance_px,
+        "buffer_px": buffer_px,
+        "extent": extent,
+    }
+
+    minx, miny, maxx, maxy = gdf.geometry.to_crs(4326).total_bounds
+    metadata = TilesetMetadata(
+        name=name or Path(output).stem,
+        tile_format="pbf",
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
+        bounds=(float(minx), float(miny), float(maxx), float(maxy)),
+        description="Bivariate map created with bivario.",
+        json_metadata=json_metadata,
+    )
+
+    write_tiles(
+        _encode_tile,
+        render_state=render_state,
+        geometries=geometries,
+        output=output,
+        metadata=metadata,
+        margin_px=buffer_px,
+        tile_size_px=_REFERENCE_TILE_SIZE_PX,
+        processes=processes,
+    )
+
+    return prepared_data.legend_spec(
+        bivariate_cmap, dark_mode=dark_mode, numerical_grid_size=legend_max_grid_size
+    )
+
+
+def _encode_tile(tile: TILE) -> bytes | None:
+    geometries: gpd.GeoSeries = RENDER_STATE["geometries"]
+    properties: dict[str, npt.NDArray[Any]] = RENDER_STATE["properties"]
+    simplify_tolerance_px: float = RENDER_STATE["simplify_tolerance_px"]
+    buffer_px: float = RENDER_STATE["buffer_px"]
+    extent: int = RENDER_STATE["extent"]
+
+    import shapely
+    from mapbox_vector_tile import encode
+    from mapbox_vector_tile.encoder import on_invalid_geometry_make_valid
+
+    clip_bounds = query_bounds(tile, buffer_px, _REFERENCE_TILE_SIZE_PX)
+    geometry_indexes = geometries.sindex.query(shapely.box(*clip_bounds))
+    if not len(geometry_indexes):
+        return None
+
+    # Geometries are clipped to the buffered tile first, so only the visible parts are simplified
+    minx, _, maxx, _ = bounds = tile_bounds(tile)
+    tile_geometries = shapely.simplify(
+        shapely.clip_by_rect(geometries.values[geometry_indexes], *clip_bounds),
+        tolerance=simplify_tolerance_px * (maxx - minx) / _REFERENCE_TILE_SIZE_PX,
+        preserve_topology=True,
+    )
+    non_empty = ~shapely.is_empty(tile_geometries)
+    if not non_empty.any():
+        return None
+
+    features = []
+    for geometry, index in zip(
+        tile_geometries[non_empty], geometry_indexes[non_empty], strict=True
+    ):
+        feature_properties = {}
+        for key, values in properties.items():
+            value = _to_property_value(values[index])
+            if value is not None:
+                feature_properties[key] = value
+        features.append({"geometry": geometry, "properties": feature_properties, "id": int(index)})
+
+    tile_bytes: bytes = encode(
+        [{"name": RENDER_STATE["layer_name"], "features": features}],
+        default_options={
+            "quantize_bounds": bounds,
+            "extents": extent,
+            "on_invalid_geometry": on_invalid_geometry_make_valid,
+        },
+    )
+    return tile_bytes
+
+
+def _to_property_value(value: Any) -> bool | int | float | str | None:
+    # Feature attributes can only have simple types, missing values are skipped
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (bool, int, float, str)):
+        return value
+
+    return str(value)
+
+
+def _get_field_type(values: Any) -> str:
+    # Field types of the TileJSON vector layers
+    if values.dtype.kind == "b":
+        return "Boolean"
+    if values.dtype.kind in ("i", "u", "f"):
+        return "Number"
+
+    return "String"
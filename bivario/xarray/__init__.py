@@ -0,0 +1,407 @@
+"""Bivariate xarray rasters module."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from bivario._colouring import ColouringBounds, _classify_with_bins, colour_with_bounds
+from bivario._lazy import _get_bins, _get_tick_labels, supports_lazy_colouring
+from bivario._native_schemes import quantile_percentiles
+from bivario._prepared import PreparedBivariateData
+from bivario._quantiles import (
+    QUANTILE_METHOD,
+    ExactQuantileEstimator,
+    KLLQuantileEstimator,
+    get_quantile_estimator,
+)
+from bivario._scheme import SCHEME_TYPE, MapclassifyResult, normalize_scheme_name, parse_schemes
+from bivario.classifier import BivariateClassifier
+from bivario.cmap import BivariateColourmap, get_bivariate_cmap
+from bivario.legend import BivariateLegendSpec
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    import xarray as xr
+
+    from bivario.typing import NumericArray
+
+__all__ = ["BivariateDataArray", "colour_bivariate_dataarray"]
+
+_BAND_DIM = "band"
+_BANDS = ["red", "green", "blue", "alpha"]
+
+
+@dataclass(frozen=True)
+class BivariateDataArray:
+    """
+    Bivariate colours of two co-registered rasters.
+
+    Attributes:
+        image (xr.DataArray): RGBA image as uint8 values, with the dimensions of the rasters and
+            an additional "band" dimension. Evaluated lazily if the rasters are dask arrays.
+            Pixels without values of both variables are fully transparent.
+        legend_spec (BivariateLegendSpec): Legend specification of the coloured values.
+    """
+
+    image: "xr.DataArray"
+    legend_spec: BivariateLegendSpec
+
+
+@dataclass(frozen=True)
+class _ValuesStatistics:
+    count: int
+    min: float
+    max: float
+    estimator: ExactQuantileEstimator | KLLQuantileEstimator | None
+
+    def merge(self, other: "_ValuesStatistics") -> "_ValuesStatistics":
+        estimator = self.estimator
+        if estimator is not None and other.estimator is not None:
+            # Estimators of all the chunks are created with the same method
+            estimator = estimator.merge(other.estimator)  # type: ignore[arg-type]
+
+        return _ValuesStatistics(
+            count=self.count + other.count,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+            estimator=estimator,
+        )
+
+
+def colour_bivariate_dataarray(
+    data_a: "xr.DataArray",
+    data_b: "xr.DataArray",
+    label_a: str | None = None,
+    label_b: str | None = None,
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier = "Quantiles",
+    k: int | tuple[int, int] = 5,
+    cmap: BivariateColourmap | str | None = None,
+    dark_mode: bool = False,
+    alpha: bool = False,
+    alpha_norm_quantile: float = 0.9,
+    quantile_method: QUANTILE_METHOD = "kll",
+    legend_max_grid_size: int = 100,
+) -> BivariateDataArray:
+    """
+    Colour two co-registered rasters with a bivariate colourmap.
+
+    Ranges, bins and alpha normalization values are computed once for the whole rasters with
+    reductions over the chunks (in parallel if the rasters are dask arrays). The colours are
+    then applied chunk by chunk, so the returned image is evaluated lazily and can be larger
+    than the available memory (e.g. written to a Zarr or GeoTIFF file).
+
+    Only binning schemes that can be computed from the reductions are supported: "Quantiles"
+    and "EqualInterval". Other schemes (like NaturalBreaks) can be used by fitting
+    a `BivariateClassifier` on a sample of the values and passing it as the scheme.
+
+    Args:
+        data_a (xr.DataArray): Raster with values for the first variable.
+        data_b (xr.DataArray): Raster with values for the second variable. Must have the same
+            dimensions and coordinates as the first raster.
+        label_a (str | None, optional): Label for the first variable. If None, will use the name
+            of the raster. Defaults to None.
+        label_b (str | None, optional): Label for the second variable. If None, will use the name
+            of the raster. Defaults to None.
+        scheme (str | None | bool | tuple | BivariateClassifier, optional): Binning scheme for
+            the data. If False or None, no binning is applied. If str, uses the specified
+            scheme. Can also define two different values for both variables. If a fitted
+            `BivariateClassifier`, its classes are reused. Defaults to "Quantiles".
+        k (int | tuple[int, int], optional): Number of classes for binning. Can also define two
+            different values for both variables. Defaults to 5.
+        cmap (BivariateColourmap | str | None, optional): Bivariate colourmap to use.
+            If None, will load a default one. Defaults to None.
+        dark_mode (bool, optional): Whether to use dark mode to select a proper order of colours
+            in the colourmap. Defaults to False.
+        alpha (bool, optional): Whether to scale the transparency of the pixels with the values.
+            Defaults to False.
+        alpha_norm_quantile (float, optional): Quantile of the values used as the fully opaque
+            value. Used with alpha=True. Defaults to 0.9.
+        quantile_method (Literal["exact", "kll"], optional): Method of computing the quantiles.
+            "kll" merges bounded size sketches of the chunks and returns approximate quantiles,
+            "exact" keeps all the values in memory. Defaults to "kll".
+        legend_max_grid_size (int, optional): Number of pixels in the legend grid of variables
+            without binning. Defaults to 100.
+
+    Returns:
+        BivariateDataArray: RGBA image with the legend specification.
+
+    Raises:
+        ValueError: If the rasters are not aligned, the scheme can't be computed with reductions
+            or there are no pixels with values of both variables.
+
+    Examples:
+        >>> import numpy as np
+        >>> import xarray as xr
+        >>> from bivario import colour_bivariate_dataarray
+        >>> rng = np.random.default_rng(0)
+        >>> population = xr.DataArray(rng.lognormal(size=(100, 200)), dims=("y", "x"))
+        >>> night_light = xr.DataArray(rng.random((100, 200)), dims=("y", "x"))
+        >>> coloured = colour_bivariate_dataarray(
+        ...     population.chunk(50), night_light.chunk(50), scheme="Quantiles", k=4
+        ... )
+        >>> coloured.image.sizes
+        Frozen({'y': 100, 'x': 200, 'band': 4})
+    """
+    try:
+        import xarray as xr
+    except (ImportError, ModuleNotFoundError) as ex:
+        raise ImportError(
+            "The 'xarray' package "
+            "is required for colouring xarray rasters. You can install it using "
+            "'conda install -c conda-forge xarray' "
+            "or 'pip install xarray'."
+        ) from ex
+
+    if not supports_lazy_colouring(scheme=scheme, k=k):
+        raise ValueError(
+            f"Scheme {scheme} can't be computed for xarray rasters. Use one of: Quantiles, "
+            "EqualInterval, or fit a BivariateClassifier on a sample of values."
+        )
+
+    # Rasters must share the coordinates, dimensions order and chunks
+    data_a, data_b = xr.align(data_a, data_b, join="exact")
+    data_b = data_b.transpose(*data_a.dims)
+    if data_a.chunks is not None or data_b.chunks is not None:
+        if data_a.chunks is None:
+            data_a = data_a.chunk(data_b.chunksizes)
+        elif data_b.chunks is None:
+            data_b = data_b.chunk(data_a.chunksizes)
+        data_a, data_b = xr.unify_chunks(data_a, data_b)
+
+    prepared_data = _prepare_statistics(
+        data_a=data_a,
+        data_b=data_b,
+        scheme=scheme,
+        k=k,
+        alpha=alpha,
+        alpha_norm_quantile=alpha_norm_quantile,
+        quantile_method=quantile_method,
+        label_a=label_a or _get_name(data_a),
+        label_b=label_b or _get_name(data_b),
+    )
+    bivariate_cmap = get_bivariate_cmap(cmap)
+
+    image = xr.apply_ufunc(
+        _colour_block,
+        data_a,
+        data_b,
+        kwargs={"bounds": prepared_data.bounds, "cmap": bivariate_cmap, "dark_mode": dark_mode},
+        output_core_dims=[[_BAND_DIM]],
+        dask="parallelized",
+        output_dtypes=[np.uint8],
+        dask_gufunc_kwargs={"output_sizes": {_BAND_DIM: len(_BANDS)}},
+    ).assign_coords({_BAND_DIM: _BANDS})
+
+    return BivariateDataArray(
+        image=image,
+        legend_spec=prepared_data.legend_spec(
+            bivariate_cmap, dark_mode=dark_mode, numerical_grid_size=legend_max_grid_size
+        ),
+    )
+
+
+def _prepare_statistics(
+    data_a: "xr.DataArray",
+    data_b: "xr.DataArray",
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE] | BivariateClassifier,
+    k: int | tuple[int, int],
+    alpha: bool,
+    alpha_norm_quantile: float,
+    quantile_method: QUANTILE_METHOD,
+    label_a: str | None,
+    label_b: str | None,
+) -> PreparedBivariateData:
+    classifier = None
+    if isinstance(scheme, BivariateClassifier):
+        classifier = scheme
+        classifier._check_is_fitted()
+        scheme_a, scheme_b, k_a, k_b = (
+            classifier.scheme_a,
+            classifier.scheme_b,
+            classifier.k_a,
+            classifier.k_b,
+        )
+    else:
+        scheme_a, scheme_b, k_a, k_b = parse_schemes(scheme=scheme, k=k)
+
+    needs_quantiles_a, needs_quantiles_b = (
+        alpha
+        or (
+            classifier is None
+            and column_scheme is not None
+            and normalize_scheme_name(column_scheme) == "quantiles"
+        )
+        for column_scheme in (scheme_a, scheme_b)
+    )
+
+    # Statistics of the chunks are small, so they are merged after computing them in parallel
+    block_kwargs: dict[str, Any] = {
+        "quantile_method": quantile_method,
+        "needs_quantiles_a": needs_quantiles_a,
+        "needs_quantiles_b": needs_quantiles_b,
+    }
+    if data_a.chunks is None:
+        blocks_statistics = [_block_statistics(data_a.values, data_b.values, **block_kwargs)]
+    else:
+        from dask.base import compute
+        from dask.delayed import delayed
+
+        blocks_statistics = compute(  # type: ignore[no-untyped-call]
+            *(
+                delayed(_block_statistics)(block_a, block_b, **block_kwargs)
+                for block_a, block_b in zip(
+                    data_a.data.to_delayed().ravel(), data_b.data.to_delayed().ravel(), strict=True
+                )
+            )
+        )
+
+    statistics_a, statistics_b = blocks_statistics[0]
+    for block_statistics_a, block_statistics_b in blocks_statistics[1:]:
+        statistics_a = statistics_a.merge(block_statistics_a)
+        statistics_b = statistics_b.merge(block_statistics_b)
+
+    if not statistics_a.count:
+        raise ValueError("There are no pixels with values of both variables.")
+
+    # Same statistics names as computed by the lazy colouring of dataframes
+    statistics: dict[str, float] = {}
+    columns = {"a": (statistics_a, scheme_a, k_a), "b": (statistics_b, scheme_b, k_b)}
+    for key, (values_statistics, column_scheme, column_k) in columns.items():
+        statistics[f"{key}_min"] = values_statistics.min
+        statistics[f"{key}_max"] = values_statistics.max
+        if values_statistics.estimator is None:
+            continue
+        if alpha:
+            statistics[f"{key}_alpha_norm"] = values_statistics.estimator.quantile(
+                alpha_norm_quantile
+            )
+        if column_scheme is not None and normalize_scheme_name(column_scheme) == "quantiles":
+            for idx, level in enumerate(quantile_percentiles(column_k) / 100):
+                statistics[f"{key}_q{idx}"] = values_statistics.estimator.quantile(level)
+
+    bins: dict[str, npt.NDArray[np.float64] | None]
+    if classifier is not None:
+        bins = {"a": classifier.bins_a, "b": classifier.bins_b}
+        tick_labels = {"a": classifier.tick_labels_a, "b": classifier.tick_labels_b}
+        range_a, range_b, class_range_a, class_range_b = classifier._ranges()
+    else:
+        bins = {
+            key: None
+            if column_scheme is None
+            else _get_bins(key, normalize_scheme_name(column_scheme), column_k, statistics)
+            for key, (_, column_scheme, column_k) in columns.items()
+        }
+        tick_labels = {key: _get_tick_labels(key, bins[key], statistics) for key in columns}
+        range_a = (statistics["a_min"], statistics["a_max"])
+        range_b = (statistics["b_min"], statistics["b_max"])
+        # Classification is monotonic, so the classes of the extremes are the classes range
+        class_range_a = _get_class_range(range_a, bins["a"])
+        class_range_b = _get_class_range(range_b, bins["b"])
+
+    # Values are coloured lazily, so only the bins and ranges are kept
+    empty_values = np.empty(0, dtype=np.float64)
+    return PreparedBivariateData(
+        scheme_result=MapclassifyResult(
+            values_a=empty_values,
+            values_b=empty_values,
+            tick_labels_a=tick_labels["a"],
+            tick_labels_b=tick_labels["b"],
+            scheme_a=scheme_a,
+            scheme_b=scheme_b,
+            k_a=k_a if bins["a"] is None else len(bins["a"]),
+            k_b=k_b if bins["b"] is None else len(bins["b"]),
+            bins_a=bins["a"],
+            bins_b=bins["b"],
+        ),
+        range_a=range_a,
+        range_b=range_b,
+        class_range_a=class_range_a,
+        class_range_b=class_range_b,
+        alpha_norm_values=(
+            (statistics["a_alpha_norm"], statistics["b_alpha_norm"]) if alpha else None
+        ),
+        alpha_values=None,
+        label_a=label_a,
+        label_b=label_b,
+    )
+
+
+def _block_statistics(
+    values_a: "NumericArray",
+    values_b: "NumericArray",
+    quantile_method: QUANTILE_METHOD,
+    needs_quantiles_a: bool,
+    needs_quantiles_b: bool,
+) -> tuple[_ValuesStatistics, _ValuesStatistics]:
+    mask = _get_valid_mask(values_a, values_b)
+    return (
+        _values_statistics(np.asarray(values_a)[mask], quantile_method, needs_quantiles_a),
+        _values_statistics(np.asarray(values_b)[mask], quantile_method, needs_quantiles_b),
+    )
+
+
+def _values_statistics(
+    values: "NumericArray", quantile_method: QUANTILE_METHOD, needs_quantiles: bool
+) -> _ValuesStatistics:
+    estimator = None
+    if needs_quantiles:
+        estimator = get_quantile_estimator(quantile_method).update(values)
+
+    if not len(values):
+        return _ValuesStatistics(count=0, min=np.inf, max=-np.inf, estimator=estimator)
+
+    return _ValuesStatistics(
+        count=len(values),
+        min=float(values.min()),
+        max=float(values.max()),
+        estimator=estimator,
+    )
+
+
+def _colour_block(
+    values_a: "NumericArray",
+    values_b: "NumericArray",
+    bounds: ColouringBounds,
+    cmap: BivariateColourmap,
+    dark_mode: bool,
+) -> "npt.NDArray[np.uint8]":
+    mask = _get_valid_mask(values_a, values_b)
+    colour_bytes = np.zeros((*mask.shape, len(_BANDS)), dtype=np.uint8)
+    if not mask.any():
+        return colour_bytes
+
+    # Only pixels with values of both variables are coloured, the other ones stay transparent
+    values_cmap, alpha_values = colour_with_bounds(
+        values_a=values_a[mask],
+        values_b=values_b[mask],
+        bounds=bounds,
+        cmap=cmap,
+        dark_mode=dark_mode,
+    )
+    valid_colour_bytes = np.full((len(values_cmap), len(_BANDS)), 255, dtype=np.uint8)
+    np.multiply(values_cmap[:, :3], 255, out=valid_colour_bytes[:, :3], casting="unsafe")
+    if alpha_values is not None:
+        np.multiply(alpha_values, 255, out=valid_colour_bytes[:, 3], casting="unsafe")
+
+    colour_bytes[mask] = valid_colour_bytes
+    return colour_bytes
+
+
+def _get_valid_mask(values_a: "NumericArray", values_b: "NumericArray") -> "npt.NDArray[np.bool_]":
+    mask: npt.NDArray[np.bool_] = np.isfinite(values_a) & np.isfinite(values_b)
+    return mask
+
+
+def _get_class_range(
+    value_range: tuple[float, float], bins: "npt.NDArray[np.float64] | None"
+) -> tuple[float, float]:
+    if bins is None:
+        return value_range
+
+    min_class, max_class = _classify_with_bins(np.array(value_range), bins)
+    return float(min_class), float(max_class)
+
+
+def _get_name(data: "xr.DataArray") -> str | None:
+    return None if data.name is None else str(data.name)
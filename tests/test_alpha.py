@@ -0,0 +1,95 @@
+"""Test alpha values scaling and quantile estimators."""
+
+import numpy as np
+import pytest
+
+from bivario._alpha import get_alpha_norm_values, scale_alpha_values
+from bivario._quantiles import ExactQuantileEstimator, KLLQuantileEstimator, get_quantile_estimator
+
+
+def test_scale_alpha_values_in_place() -> None:
+    """Test that alpha values are scaled into the output buffer."""
+    rng = np.random.default_rng(0)
+    values_a, values_b = rng.lognormal(size=100_001), rng.integers(0, 100, size=100_001)
+    out = np.empty(len(values_a), dtype=np.float64)
+
+    alpha_values = scale_alpha_values(values_a, values_b, 2.5, 30.0, out=out)
+
+    assert alpha_values is out
+    np.testing.assert_array_equal(
+        alpha_values, np.sqrt(np.minimum(1, np.maximum(values_a / 2.5, values_b / 30.0)))
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])  # type: ignore
+def test_exact_estimator_chunks(chunk_size: int) -> None:
+    """Test that exact estimator fed in chunks returns the same values as np.quantile."""
+    rng = np.random.default_rng(0)
+    values_a, values_b = rng.lognormal(size=1000), rng.normal(size=1000)
+
+    norm_values = get_alpha_norm_values(
+        values_a, values_b, alpha_norm_quantile=0.9, chunk_size=chunk_size
+    )
+
+    assert norm_values == (np.quantile(values_a, 0.9), np.quantile(values_b, 0.9))
+
+
+@pytest.mark.parametrize("q", [0, 0.1, 0.5, 0.9, 0.99, 1])  # type: ignore
+def test_kll_estimator_accuracy(q: float) -> None:
+    """Test that sketch quantiles are close to the exact ones while keeping few items."""
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=1_000_000)
+
+    estimator = KLLQuantileEstimator(capacity=1024)
+    for chunk in np.array_split(values, 50):
+        estimator.update(chunk)
+
+    assert estimator.count == len(values)
+    assert sum(len(items) for items in estimator._levels) < 20_000
+    assert abs(np.mean(values <= estimator.quantile(q)) - q) < 0.01
+
+
+def test_kll_estimator_merge() -> None:
+    """Test that merged sketches estimate quantiles of all the values."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=200_000)
+
+    estimator = KLLQuantileEstimator().update(values[:100_000])
+    estimator.merge(KLLQuantileEstimator(seed=1).update(values[100_000:]))
+
+    assert estimator.count == len(values)
+    assert abs(np.mean(values <= estimator.quantile(0.9)) - 0.9) < 0.01
+
+
+def test_kll_estimator_extremes() -> None:
+    """Test that minimum and maximum are exact after compacting and merging sketches."""
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=100_000)
+
+    estimator = KLLQuantileEstimator(capacity=64).update(values[:50_000])
+    estimator.merge(KLLQuantileEstimator(capacity=64).update(values[50_000:]))
+
+    assert estimator.quantile(0) == values.min()
+    assert estimator.quantile(1) == values.max()
+
+
+def test_exact_estimator_merge() -> None:
+    """Test that merged exact estimators return exact quantiles."""
+    values = np.arange(100.0)
+
+    estimator = (
+        ExactQuantileEstimator()
+        .update(values[:30])
+        .merge(ExactQuantileEstimator().update(values[30:]))
+    )
+
+    assert estimator.quantile(0.9) == np.quantile(values, 0.9)
+
+
+def test_quantile_estimator_raises() -> None:
+    """Test that unknown methods and empty estimators raise errors."""
+    with pytest.raises(ValueError, match="Unknown quantile method"):
+        get_quantile_estimator("unknown")  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError, match="without any values"):
+        KLLQuantileEstimator().quantile(0.5)
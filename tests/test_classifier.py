@@ -0,0 +1,98 @@
+"""Test bivariate classifier functionality."""
+
+import numpy as np
+import pytest
+
+from bivario import BivariateClassifier
+from bivario._prepared import prepare_bivariate_data
+from bivario._scheme import apply_mapclassify
+
+
+def test_fit_transform_same_as_mapclassify() -> None:
+    """Test that fitted classes are the same as applying mapclassify to the values."""
+    rng = np.random.default_rng(0)
+    values_a, values_b = rng.lognormal(size=1000), rng.integers(0, 100, size=1000)
+
+    classifier = BivariateClassifier(scheme=("Quantiles", "EqualInterval"), k=(4, 6))
+    classes_a, classes_b = classifier.fit_transform(values_a, values_b)
+    scheme_result = apply_mapclassify(
+        values_a, values_b, scheme=("Quantiles", "EqualInterval"), k=(4, 6)
+    )
+
+    assert classifier.is_fitted
+    np.testing.assert_array_equal(classes_a, scheme_result.values_a)
+    np.testing.assert_array_equal(classes_b, scheme_result.values_b)
+    np.testing.assert_array_equal(classifier.bins_a, scheme_result.bins_a)
+    np.testing.assert_array_equal(classifier.bins_b, scheme_result.bins_b)
+    assert classifier.tick_labels_a == scheme_result.tick_labels_a
+    assert classifier.tick_labels_b == scheme_result.tick_labels_b
+
+
+def test_transform_batches() -> None:
+    """Test that batches are assigned to the classes fitted on the reference values."""
+    rng = np.random.default_rng(0)
+    values_a, values_b = rng.normal(size=1000), rng.normal(size=1000)
+    classifier = BivariateClassifier(scheme=(True, False), k=5).fit(values_a, values_b)
+
+    classes_a, classes_b = classifier.transform(values_a, values_b)
+    batch_classes_a, batch_classes_b = classifier.transform(values_a[:10], values_b[:10])
+
+    np.testing.assert_array_equal(batch_classes_a, classes_a[:10])
+    np.testing.assert_array_equal(batch_classes_b, values_b[:10])
+    # Values outside of the reference range are assigned to the first and last class
+    np.testing.assert_array_equal(classifier.transform([-100, 100], [0, 0])[0], [0, 4])
+
+
+def test_from_breaks() -> None:
+    """Test that classifier can be created from explicit breaks."""
+    classifier = BivariateClassifier.from_breaks([1, 2, 3], None, range_b=(0, 10))
+
+    classes_a, classes_b = classifier.transform([0, 1, 1.5, 3, 4], [0, 1, 2, 5, 10])
+
+    assert classifier.is_fitted
+    assert classifier.tick_labels_a == ["-inf", "1", "2", "3"]
+    assert classifier.tick_labels_b is None
+    np.testing.assert_array_equal(classes_a, [0, 0, 1, 2, 2])
+    np.testing.assert_array_equal(classes_b, [0, 1, 2, 5, 10])
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "bins_a,bins_b,range_b",
+    [
+        ([1, 2], None, None),
+        ([], [1, 2], None),
+        ([2, 1], [1, 2], None),
+    ],
+)
+def test_from_breaks_raises(bins_a: list[float], bins_b: list[float] | None, range_b: None) -> None:
+    """Test that invalid breaks are rejected."""
+    with pytest.raises(ValueError):
+        BivariateClassifier.from_breaks(bins_a, bins_b, range_b=range_b)
+
+
+def test_not_fitted_raises() -> None:
+    """Test that not fitted classifier can't transform values."""
+    with pytest.raises(ValueError, match="must be fitted"):
+        BivariateClassifier().transform([1, 2], [3, 4])
+
+
+def test_prepared_data_with_classifier() -> None:
+    """Test that batches are coloured the same as the full dataset."""
+    from bivario import get_bivariate_cmap
+
+    rng = np.random.default_rng(0)
+    values_a, values_b = rng.lognormal(size=1000), rng.lognormal(size=1000)
+    classifier = BivariateClassifier(scheme=("Quantiles", False), k=5).fit(values_a, values_b)
+    cmap = get_bivariate_cmap()
+
+    full_data = prepare_bivariate_data(
+        values_a, values_b, scheme=classifier, k=5, alpha=False, alpha_norm_quantile=0.9
+    )
+    batch_data = prepare_bivariate_data(
+        values_a[:3], values_b[:3], scheme=classifier, k=5, alpha=False, alpha_norm_quantile=0.9
+    )
+
+    np.testing.assert_array_equal(
+        batch_data.colour(cmap, dark_mode=False), full_data.colour(cmap, dark_mode=False)[:3]
+    )
+    assert batch_data.legend_spec(cmap, False, 100) == full_data.legend_spec(cmap, False, 100)
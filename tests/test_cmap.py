@@ -5,6 +5,13 @@ from typing import Any
 import numpy as np
 import pytest
 
+from bivario.cmap import (
+    AccentsBivariateColourmap,
+    BivariateColourmap,
+    MplCmapBivariateColourmap,
+    NamedBivariateColourmap,
+)
+
 
 def test_default_bivariate_colourmap() -> None:
     """Test that default colourmap can be run without error."""
@@ -59,3 +66,52 @@ def test_disallow_nonnumeric_inputs(values_input: list[Any]) -> None:
     cmap = get_bivariate_cmap()
     with pytest.raises(TypeError):
         cmap(values_a=values_input, values_b=[0, 1])
+
+
+@pytest.mark.parametrize("scheme", ["Quantiles", False, ("EqualInterval", False)])  # type: ignore
+def test_prepared_data_colours(scheme: Any) -> None:
+    """Test that colours of prepared data are the same as applying colourmap to the classes."""
+    from bivario import get_bivariate_cmap
+    from bivario._alpha import prepare_alpha_values
+    from bivario._prepared import prepare_bivariate_data
+    from bivario._scheme import apply_mapclassify
+
+    rng = np.random.default_rng(0)
+    values_a, values_b = rng.lognormal(size=100), rng.integers(0, 10, size=100)
+    cmap = get_bivariate_cmap()
+
+    prepared_data = prepare_bivariate_data(
+        values_a, values_b, scheme=scheme, k=5, alpha=True, alpha_norm_quantile=0.9
+    )
+    scheme_result = apply_mapclassify(values_a, values_b, scheme=scheme, k=5)
+
+    np.testing.assert_array_equal(
+        prepared_data.colour(cmap, dark_mode=False),
+        cmap(values_a=scheme_result.values_a, values_b=scheme_result.values_b),
+    )
+    np.testing.assert_array_equal(
+        prepared_data.alpha_values, prepare_alpha_values(values_a, values_b)
+    )
+    assert prepared_data.range_a == (values_a.min(), values_a.max())
+    assert prepared_data.range_b == (values_b.min(), values_b.max())
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "cmap",
+    [
+        NamedBivariateColourmap("rosewood_pine"),
+        MplCmapBivariateColourmap(cmap_a="Oranges", cmap_b="Blues"),
+        AccentsBivariateColourmap(accent_a=(0.95, 0.40, 0.20), accent_b=(0.10, 0.70, 0.65)),
+    ],
+)
+def test_colours_same_as_single_values(cmap: BivariateColourmap) -> None:
+    """Test that colours of a values grid are the same as colours of single values."""
+    values_a, values_b = np.mgrid[0:1:6j, 0:1:4j]
+
+    colours = cmap(values_a, values_b, normalize=False)
+
+    assert colours.shape == (6, 4, 3)
+    for index in np.ndindex(values_a.shape):
+        np.testing.assert_allclose(
+            colours[index], cmap([values_a[index]], [values_b[index]], normalize=False)[0]
+        )
@@ -0,0 +1,62 @@
+"""Test example datasets functionality."""
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+from bivario.example_data import nyc_bike_trips, synthetic_bike_trips
+
+
+def test_nyc_bike_trips_copies() -> None:
+    """Test that cached data isn't changed by modifying the returned frames."""
+    gdf = nyc_bike_trips()
+    gdf["morning_starts"] = 0
+    gdf.drop(index=gdf.index[:10], inplace=True)
+
+    reloaded_gdf = nyc_bike_trips()
+
+    assert len(reloaded_gdf) == 1569
+    assert reloaded_gdf["morning_starts"].sum() > 0
+    assert reloaded_gdf.crs == 4326
+    assert (reloaded_gdf.geometry.geom_type == "Polygon").all()
+
+
+def test_nyc_bike_trips_without_geometry() -> None:
+    """Test that data without geometries has the same values."""
+    df = nyc_bike_trips(geometry=False)
+    gdf = nyc_bike_trips()
+
+    assert not isinstance(df, gpd.GeoDataFrame)
+    pd.testing.assert_frame_equal(df, pd.DataFrame(gdf.drop(columns="geometry")))
+
+
+def test_synthetic_bike_trips_schema() -> None:
+    """Test that synthetic data has the same columns and types as the NYC data."""
+    nyc_gdf = nyc_bike_trips()
+    gdf = synthetic_bike_trips(5_000)
+
+    assert len(gdf) == 5_000
+    assert gdf.crs == nyc_gdf.crs
+    pd.testing.assert_series_equal(gdf.dtypes, nyc_gdf.dtypes)
+    assert gdf["h3"].is_unique
+    assert gdf.geometry.is_valid.all()
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(gdf.drop(columns="geometry")), synthetic_bike_trips(5_000, geometry=False)
+    )
+
+
+def test_synthetic_bike_trips_seed() -> None:
+    """Test that synthetic data is reproducible with the same seed."""
+    pd.testing.assert_frame_equal(
+        synthetic_bike_trips(1_000, geometry=False, seed=1),
+        synthetic_bike_trips(1_000, geometry=False, seed=1),
+    )
+    assert not synthetic_bike_trips(1_000, geometry=False, seed=1).equals(
+        synthetic_bike_trips(1_000, geometry=False, seed=2)
+    )
+
+
+def test_synthetic_bike_trips_invalid_size() -> None:
+    """Test that invalid size raises an error."""
+    with pytest.raises(ValueError):
+        synthetic_bike_trips(0)
@@ -1,13 +1,16 @@
 """Test folium plotting functionality."""
 
-from typing import Literal
+import json
+from pathlib import Path
+from typing import Any, Literal
 
 import folium
 import geopandas as gpd
 import pytest
 
-from bivario import explore_bivariate_data
+from bivario import BivariateClassifier, explore_bivariate_data, save_bivariate_map
 from bivario._scheme import SCHEME_TYPE
+from bivario.folium._geojson import H3Features
 from bivario.folium._legend import FloatBivariateMatplotlibLegend
 
 
@@ -67,6 +70,21 @@ def test_different_schemes(
     )
 
 
+def test_classifier_scheme(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that a fitted classifier can be used as a scheme."""
+    classifier = BivariateClassifier.from_breaks([10, 50, 100], [10, 50, 100])
+
+    m = explore_bivariate_data(
+        nyc_data.iloc[:100],
+        column_a="morning_starts",
+        column_b="morning_ends",
+        scheme=classifier,
+        legend_size_px=32,
+    )
+
+    assert isinstance(m, folium.Map)
+
+
 @pytest.mark.parametrize("legend_loc", ["bl", "br", "tl", "tr", None])  # type: ignore
 @pytest.mark.parametrize("legend_background", [True, False])  # type: ignore
 @pytest.mark.parametrize("legend_border", [True, False])  # type: ignore
@@ -109,3 +127,191 @@ def test_different_legend_positions(
             assert "border" in legend_object.css
             assert "border-radius" in legend_object.css
             assert "background-clip" in legend_object.css
+
+
+def test_alpha_styled_from_properties(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that colours and alpha are read from feature properties in the browser."""
+    m = explore_bivariate_data(dummy_data, column_a="a", column_b="b")
+
+    geojson_layer = [v for v in m._children.values() if isinstance(v, folium.GeoJson)][0]
+    tooltip = [v for v in geojson_layer._children.values() if isinstance(v, folium.GeoJsonTooltip)][
+        0
+    ]
+    html = m.get_root().render()
+
+    assert not geojson_layer.style
+    assert "_styler" not in html
+    assert 'feature.properties["__bivario_alpha"]' in html
+    assert "__bivario_alpha" not in tooltip.fields
+
+
+@pytest.mark.parametrize("alpha", [True, False])  # type: ignore
+def test_class_styles(nyc_data: gpd.GeoDataFrame, alpha: bool) -> None:
+    """Test that features only hold a style class index with class_styles mode."""
+    m = explore_bivariate_data(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        k=3,
+        alpha=alpha,
+        class_styles=True,
+        alpha_bins=4,
+    )
+
+    geojson_layer = [v for v in m._children.values() if isinstance(v, folium.GeoJson)][0]
+    properties = geojson_layer.data["features"][0]["properties"]
+    class_indexes = {f["properties"]["__bivario_class"] for f in geojson_layer.data["features"]}
+
+    assert "__folium_color" not in properties
+    assert "__bivario_alpha" not in properties
+    assert len(class_indexes) <= 3 * 3 * (5 if alpha else 1)
+    assert "classStyles[" in m.get_root().render()
+
+
+@pytest.mark.parametrize(
+    "payload_kwargs",
+    [
+        dict(precision=4),
+        dict(simplify_tolerance=0.001),
+        dict(topojson=True),
+        dict(topojson=True, simplify_tolerance=0.001),
+    ],
+)  # type: ignore
+def test_reduced_payload(nyc_data: gpd.GeoDataFrame, payload_kwargs: dict[str, Any]) -> None:
+    """Test that geometry encoding options reduce the map size."""
+    default_size = len(
+        explore_bivariate_data(nyc_data, column_a="morning_starts", column_b="morning_ends")
+        .get_root()
+        .render()
+        .encode()
+    )
+    reduced_size = len(
+        explore_bivariate_data(
+            nyc_data, column_a="morning_starts", column_b="morning_ends", **payload_kwargs
+        )
+        .get_root()
+        .render()
+        .encode()
+    )
+
+    assert reduced_size < default_size, f"{default_size:,} B -> {reduced_size:,} B"
+
+
+def test_keep_columns(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that only kept and tooltip columns are written to the features properties."""
+    m = explore_bivariate_data(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        tooltip=["morning_starts"],
+        keep_columns=["h3"],
+    )
+
+    geojson_layer = [v for v in m._children.values() if isinstance(v, folium.GeoJson)][0]
+    properties = geojson_layer.data["features"][0]["properties"]
+
+    assert set(properties) == {"h3", "morning_starts", "__folium_color", "__bivario_alpha"}
+
+
+def test_keep_columns_default_tooltip(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that columns not kept are dropped from the map without defining the tooltip."""
+    m = explore_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", keep_columns=["h3"]
+    )
+
+    html = m.get_root().render()
+    dropped_columns = set(nyc_data.columns) - {"h3", nyc_data.geometry.name}
+
+    assert '"h3"' in html
+    assert dropped_columns
+    assert not any(f'"{column}"' in html for column in dropped_columns)
+
+
+def test_keep_columns_raises_missing_column(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that kept columns must exist in the GeoDataFrame."""
+    with pytest.raises(ValueError):
+        explore_bivariate_data(dummy_data, column_a="a", column_b="b", keep_columns=["c"])
+
+
+def test_save_bivariate_map(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that all features are streamed to the saved HTML file."""
+    path = tmp_path / "map.html"
+    save_bivariate_map(path, nyc_data, column_a="morning_starts", column_b="morning_ends")
+
+    html = path.read_text(encoding="utf-8")
+
+    assert html.count('"type":"Feature"') == len(nyc_data)
+    assert "StreamedFeatures" not in html
+
+
+def test_save_bivariate_map_sidecar(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that features are written to a GeoJSON file loaded by the saved HTML file."""
+    path = tmp_path / "map.html"
+    save_bivariate_map(
+        path, nyc_data, column_a="morning_starts", column_b="morning_ends", sidecar=True
+    )
+
+    features = json.loads((tmp_path / "map.geojson").read_text(encoding="utf-8"))["features"]
+
+    assert len(features) == len(nyc_data)
+    assert '"map.geojson"' in path.read_text(encoding="utf-8")
+
+
+def test_save_bivariate_map_raises_topojson(dummy_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that TopoJSON encoding can't be used with streamed features."""
+    with pytest.raises(ValueError):
+        save_bivariate_map(
+            tmp_path / "map.html", dummy_data, column_a="a", column_b="b", topojson=True
+        )
+
+
+def test_raster(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that coloured geometries are added to the map as a single image."""
+    m = explore_bivariate_data(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        raster=True,
+        raster_size_px=256,
+    )
+
+    image_overlays = [
+        v for v in m._children.values() if isinstance(v, folium.raster_layers.ImageOverlay)
+    ]
+
+    assert len(image_overlays) == 1
+    assert not any(isinstance(v, folium.GeoJson) for v in m._children.values())
+    assert image_overlays[0].url.startswith("data:image/png;base64,")
+
+
+def test_h3_column(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that only H3 cells indexes and properties columns are written to the map."""
+    m = explore_bivariate_data(
+        nyc_data.drop(columns="geometry"),
+        column_a="morning_starts",
+        column_b="morning_ends",
+        h3_column="h3",
+    )
+
+    layer = next(v for v in m._children.values() if isinstance(v, folium.GeoJson))
+    h3_features = next(v for v in layer._children.values() if isinstance(v, H3Features))
+    cells_data = json.loads(h3_features.cells_data)
+
+    assert layer.data["features"][0]["geometry"] is None
+    assert cells_data["cells"] == [f"{cell:x}" for cell in nyc_data["h3"]]
+    assert cells_data["properties"]["h3"] == cells_data["cells"]
+    assert len(cells_data["properties"]["morning_starts"]) == len(nyc_data)
+    assert h3_features.fit_bounds
+    assert not any(isinstance(v, folium.map.FitBounds) for v in m._children.values())
+
+
+def test_h3_column_raises_raster(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that H3 cells can't be rasterized."""
+    with pytest.raises(ValueError):
+        explore_bivariate_data(
+            nyc_data,
+            column_a="morning_starts",
+            column_b="morning_ends",
+            h3_column="h3",
+            raster=True,
+        )
@@ -1,9 +1,13 @@
 """Test legend plotting functionality."""
 
+import pickle
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from bivario.cmap import BivariateColourmap, NamedBivariateColourmap
-from bivario.legend import plot_bivariate_legend
+from bivario.legend import BivariateLegendSpec, plot_bivariate_legend
 
 
 def test_plot_bivariate_legend() -> None:
@@ -73,3 +77,29 @@ def test_mixed_axis() -> None:
         tick_labels_b=["a", "b", "c", "d"],
         grid_size=(3, 100),
     )
+
+
+def test_legend_spec_from_values() -> None:
+    """Test that legend spec keeps only the values ranges."""
+    legend_spec = BivariateLegendSpec.from_values(
+        values_a=pd.Series([3, 1, 2], name="A"), values_b=np.array([10, 100, 50])
+    )
+
+    assert legend_spec.range_a == (1, 3)
+    assert legend_spec.range_b == (10, 100)
+    assert legend_spec.label_a == "A"
+    assert legend_spec.label_b is None
+
+    ax = legend_spec.plot()
+    assert ax.get_ylabel() == "A"
+    assert ax.get_xlabel() == "Value B"
+    assert ax.get_images()[0].get_extent() == [10, 100, 1, 3]
+
+
+def test_legend_spec_pickle() -> None:
+    """Test that legend spec can be serialized."""
+    legend_spec = BivariateLegendSpec.from_values(
+        values_a=[0, 1], values_b=[0, 1], tick_labels_a=["0", "1"], cmap="bubblegum"
+    )
+
+    assert pickle.loads(pickle.dumps(legend_spec)).range_a == legend_spec.range_a
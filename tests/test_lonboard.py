@@ -1,17 +1,28 @@
 """Test folium plotting functionality."""
 
+import gc
 import tempfile
+import weakref
 
 import duckdb
 import geopandas as gpd
 import lonboard
+import narwhals as nw
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
+from lonboard.basemap import CartoStyle
 from matplotlib.axes import Axes
+from shapely import LineString, Point, box
 
-from bivario import viz_bivariate_data
-from bivario._scheme import SCHEME_TYPE
-from bivario.lonboard import LonboardMapWithLegend
+from bivario import BivariateClassifier, viz_bivariate_data
+from bivario._alpha import get_alpha_norm_values, scale_alpha_values
+from bivario._lazy import prepare_lazy_colouring, supports_lazy_colouring
+from bivario._prepared import prepare_bivariate_data
+from bivario._scheme import SCHEME_TYPE, apply_mapclassify
+from bivario.lonboard import LonboardMapWithLegend, _geoarrow, clear_geometry_cache
 
 
 @pytest.fixture  # type: ignore
@@ -34,7 +45,11 @@ def test_viz_bivariate_data(dummy_data: gpd.GeoDataFrame) -> None:
 
 def test_dark_mode_plotting(dummy_data: gpd.GeoDataFrame) -> None:
     """Test that dark_mode can be set."""
-    viz_bivariate_data(dummy_data, column_a="a", column_b="b", dark_mode=True)
+    m = viz_bivariate_data(dummy_data, column_a="a", column_b="b", dark_mode=True)
+    assert m.m.basemap.style == CartoStyle.DarkMatter
+
+    m.update(dummy_data, dark_mode=False)
+    assert m.m.basemap.style == CartoStyle.Positron
 
 
 def test_column_values_plotting(dummy_data: gpd.GeoDataFrame) -> None:
@@ -122,3 +137,496 @@ def test_pyarrow_input(nyc_data: gpd.GeoDataFrame) -> None:
 
         x = viz_bivariate_data(tbl, "morning_starts", "morning_ends")
         x.legend()
+
+
+def test_keep_columns(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that only kept columns and geometry are sent to the layers."""
+    m = viz_bivariate_data(
+        nyc_data, "morning_starts", "morning_ends", keep_columns=["h3"], legend=False
+    )
+
+    assert m.layers[0].table.column_names == ["h3", "geometry"]
+
+
+def test_keep_columns_raises_missing_column(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that kept columns must exist in the data."""
+    with pytest.raises(ValueError):
+        viz_bivariate_data(dummy_data, column_a="a", column_b="b", keep_columns=["c"])
+
+
+@pytest.mark.parametrize("alpha", [True, False])  # type: ignore
+def test_arrow_colours(dummy_data: gpd.GeoDataFrame, alpha: bool) -> None:
+    """Test that colours are passed to the layers as Arrow RGB(A) uint8 arrays."""
+    m = viz_bivariate_data(dummy_data, column_a="a", column_b="b", alpha=alpha, legend=False)
+
+    colours = m.layers[0].get_fill_color
+
+    assert colours.type.list_size == (4 if alpha else 3)
+    assert len(colours) == len(dummy_data)
+
+
+def test_update(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that existing map layers can be recoloured."""
+    x = viz_bivariate_data(nyc_data, column_a="morning_starts", column_b="morning_ends")
+    layer = x.m.layers[0]
+    colours = layer.get_fill_color
+
+    x.update(nyc_data, column_a="afternoon_starts", column_b="afternoon_ends", cmap="bubblegum")
+    ax = x.legend()
+
+    assert x.m.layers[0] is layer
+    assert layer.get_fill_color is not colours
+    assert ax.get_xlabel() == "afternoon_ends"
+
+
+def test_update_kept_values(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that plotted columns are recoloured without passing the data again."""
+    x = viz_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", keep_values=True
+    )
+    expected = viz_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", scheme="Quantiles", k=3
+    )
+
+    x.update(scheme="Quantiles", k=3)
+
+    assert x.legend().get_ylabel() == "morning_starts"
+    assert pa.chunked_array(x.m.layers[0].get_fill_color).equals(
+        pa.chunked_array(expected.m.layers[0].get_fill_color)
+    )
+
+
+def test_update_raises_column_name_without_data(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that data is required to load other columns by name."""
+    x = viz_bivariate_data(dummy_data, column_a="a", column_b="b")
+
+    with pytest.raises(ValueError):
+        x.update(column_a="b")
+
+
+def test_update_raises_unsupported_parameter(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that only colouring parameters can be updated."""
+    x = viz_bivariate_data(dummy_data, column_a="a", column_b="b")
+
+    with pytest.raises(TypeError):
+        x.update(polygon_kwargs={})
+
+
+@pytest.mark.parametrize("scheme", [True, False])  # type: ignore
+def test_update_rows(nyc_data: gpd.GeoDataFrame, scheme: SCHEME_TYPE) -> None:
+    """Test that only the given rows are recoloured using bounds of the full colouring."""
+    x = viz_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", scheme=scheme
+    )
+    assert x._colouring is not None
+    colour_bytes = x._colouring.colour_bytes
+    # Layer colours are a view of the buffer patched in place, so they are copied
+    colours = _layer_colours(x.m.layers[0]).copy()
+
+    indices = [0, 10, 20]
+    x.update_rows(
+        indices,
+        values_a=nyc_data["morning_starts"].iloc[indices],
+        values_b=nyc_data["morning_ends"].iloc[indices],
+    )
+    same_values_colours = _layer_colours(x.m.layers[0]).copy()
+
+    x.update_rows(indices, values_a=[0, 0, 0], values_b=[0, 0, 0])
+    new_colours = _layer_colours(x.m.layers[0])
+    changed_rows = np.flatnonzero((new_colours != colours).any(axis=1))
+
+    np.testing.assert_array_equal(same_values_colours, colours)
+    assert len(changed_rows) > 0
+    assert set(changed_rows).issubset(indices)
+    assert x._colouring.colour_bytes is colour_bytes
+
+
+def test_update_rows_kept_for_update(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that values of the recoloured rows are used by the following full recolouring."""
+    x = viz_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", keep_values=True
+    )
+
+    x.update_rows([0], values_a=[1000.5], values_b=[0])
+    x.update(alpha_norm_quantile=0.8)
+
+    updated_data = nyc_data.copy()
+    updated_data["morning_starts"] = updated_data["morning_starts"].astype(float)
+    updated_data.loc[0, ["morning_starts", "morning_ends"]] = [1000.5, 0]
+    expected = viz_bivariate_data(
+        updated_data, column_a="morning_starts", column_b="morning_ends", alpha_norm_quantile=0.8
+    )
+
+    np.testing.assert_array_equal(
+        _layer_colours(x.m.layers[0]), _layer_colours(expected.m.layers[0])
+    )
+
+
+def test_update_rows_mixed_geometry_types() -> None:
+    """Test that layers with rows picked from the colours buffer get the recoloured rows."""
+    gdf = gpd.GeoDataFrame(
+        dict(a=[1, 2, 3, 4], b=[10, 100, 1, 5]),
+        geometry=[box(0, 0, 1, 1), Point(0, 0), LineString([(0, 0), (1, 1)]), box(1, 1, 2, 2)],
+        crs=4326,
+    )
+    x = viz_bivariate_data(gdf, column_a="a", column_b="b", scheme=False)
+
+    x.update_rows([1], values_a=[4], values_b=[1])
+
+    assert x._colouring is not None
+    np.testing.assert_array_equal(_layer_colours(x.m.layers[2]), x._colouring.colour_bytes[[1]])
+
+
+def test_patch_colours(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that colours array is patched with the same colours as the map rows."""
+    x = viz_bivariate_data(nyc_data, column_a="morning_starts", column_b="morning_ends")
+    colours = _layer_colours(x.m.layers[0]).copy()
+
+    x.patch_colours(colours, [0, 1], values_a=[0, 1000], values_b=[0, 1000])
+    x.update_rows([0, 1], values_a=[0, 1000], values_b=[0, 1000])
+
+    np.testing.assert_array_equal(colours, _layer_colours(x.m.layers[0]))
+
+    with pytest.raises(ValueError):
+        x.patch_colours(colours[:, :3].copy(), [0], values_a=[0], values_b=[0])
+    with pytest.raises(TypeError):
+        x.patch_colours(colours.astype(float), [0], values_a=[0], values_b=[0])
+
+
+def test_update_rows_raises_length_mismatch(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that number of indices must match the number of values."""
+    x = viz_bivariate_data(dummy_data, column_a="a", column_b="b")
+
+    with pytest.raises(ValueError):
+        x.update_rows([0, 1], values_a=[1], values_b=[1])
+
+
+def test_h3_column(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that H3 cells are plotted without geometries."""
+    x = viz_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", h3_column="h3"
+    )
+    layer = x.m.layers[0]
+    colours = pa.chunked_array(layer.get_fill_color)
+
+    x.update(nyc_data, column_a="afternoon_starts", column_b="afternoon_ends")
+
+    assert isinstance(layer, lonboard.H3HexagonLayer)
+    assert not pa.chunked_array(layer.get_fill_color).equals(colours)
+    assert "geometry" not in layer.table.column_names
+    assert pa.chunked_array(layer.get_hexagon).type == pa.uint64()
+    assert len(layer.get_fill_color) == len(nyc_data)
+
+
+def test_h3_column_raises_missing_column(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that H3 column must exist in the data."""
+    with pytest.raises(ValueError):
+        viz_bivariate_data(dummy_data, column_a="a", column_b="b", h3_column="h3")
+
+
+def test_geometry_cache(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that converted geometries are reused for the same geometries."""
+    clear_geometry_cache()
+
+    first = viz_bivariate_data(nyc_data, "morning_starts", "morning_ends", legend=False)
+    second = viz_bivariate_data(nyc_data, "afternoon_starts", "afternoon_ends", legend=False)
+
+    assert len(_geoarrow._GEOMETRY_CACHE) == 1
+    assert first.layers[0].table["geometry"].equals(second.layers[0].table["geometry"])
+
+    nyc_data.loc[0, "geometry"] = nyc_data.geometry.iloc[1]
+    viz_bivariate_data(nyc_data, "morning_starts", "morning_ends", legend=False)
+
+    assert len(_geoarrow._GEOMETRY_CACHE) == 2
+
+
+def test_geometry_cache_renamed_geometry(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that cached geometries are reused under the current geometry column name."""
+    clear_geometry_cache()
+
+    viz_bivariate_data(nyc_data, "morning_starts", "morning_ends", legend=False)
+    m = viz_bivariate_data(
+        nyc_data.rename_geometry("geom"), "morning_starts", "morning_ends", legend=False
+    )
+
+    assert len(_geoarrow._GEOMETRY_CACHE) == 1
+    assert "geom" in m.layers[0].table.column_names
+    assert "geometry" not in m.layers[0].table.column_names
+
+
+def test_geometry_cache_size_includes_geometries(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that size of a cached entry includes the kept Shapely geometries."""
+    clear_geometry_cache()
+
+    viz_bivariate_data(nyc_data, "morning_starts", "morning_ends", legend=False)
+    (cached_geometry,) = _geoarrow._GEOMETRY_CACHE.values()
+
+    assert cached_geometry.nbytes > cached_geometry.column.nbytes + len(nyc_data) * 100
+
+
+def test_geoarrow_table_columns(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that only the selected attribute columns are converted."""
+    table = _geoarrow.to_geoarrow_table(nyc_data, columns=["morning_starts", "missing"])
+
+    assert table is not None
+    assert table.column_names == ["morning_starts", "geometry"]
+
+
+def test_geometry_cache_eviction(
+    nyc_data: gpd.GeoDataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the least recently used geometries are evicted from the cache."""
+    clear_geometry_cache()
+    monkeypatch.setattr(_geoarrow, "_GEOMETRY_CACHE_MAX_BYTES", 0)
+
+    viz_bivariate_data(nyc_data, "morning_starts", "morning_ends", legend=False)
+    viz_bivariate_data(nyc_data.to_crs(3857), "morning_starts", "morning_ends", legend=False)
+
+    assert len(_geoarrow._GEOMETRY_CACHE) == 1
+
+
+@pytest.mark.parametrize(  # type: ignore[misc]
+    "scheme,k",
+    [
+        ("Quantiles", 5),
+        ("equal_interval", 4),
+        (False, 5),
+        (("Quantiles", False), (3, 5)),
+        ("EqualInterval", 1),
+    ],
+)
+def test_lazy_colouring(
+    scheme: SCHEME_TYPE | tuple[SCHEME_TYPE, SCHEME_TYPE], k: int | tuple[int, int]
+) -> None:
+    """Test that statistics computed by the lazy engine are the same as the eager ones."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(  # noqa: F841
+        dict(a=rng.lognormal(size=1000), b=rng.integers(0, 20, size=1000).astype(float))
+    )
+    lf = nw.from_native(duckdb.sql("SELECT * FROM df"))
+
+    assert supports_lazy_colouring(scheme=scheme, k=k)
+    lazy_colouring = prepare_lazy_colouring(
+        lf, "a", "b", scheme=scheme, k=k, alpha=True, alpha_norm_quantile=0.9
+    )
+
+    values = lf.collect()
+    values_a, values_b = values["a"].to_numpy(), values["b"].to_numpy()
+    scheme_result = apply_mapclassify(values_a, values_b, scheme=scheme, k=k)
+    alpha_norm_values = get_alpha_norm_values(values_a, values_b, alpha_norm_quantile=0.9)
+
+    assert lazy_colouring.scheme_result.tick_labels_a == scheme_result.tick_labels_a
+    assert lazy_colouring.scheme_result.tick_labels_b == scheme_result.tick_labels_b
+    np.testing.assert_array_equal(lazy_colouring.scheme_result.values_a, scheme_result.values_a)
+    np.testing.assert_array_equal(lazy_colouring.scheme_result.values_b, scheme_result.values_b)
+    np.testing.assert_allclose(lazy_colouring.alpha_norm_values, alpha_norm_values)
+    np.testing.assert_allclose(
+        lazy_colouring.alpha_values,
+        scale_alpha_values(values_a, values_b, *alpha_norm_values),
+    )
+
+
+def test_lazy_colouring_raises_missing_values() -> None:
+    """Test that lazy engine raises the same error for nulls and NaNs as the eager one."""
+    lf = nw.from_native(
+        duckdb.sql(
+            "SELECT * FROM (VALUES (1.0, 2.0), (NULL, 3.0), (3.0, 'NaN'::DOUBLE), (4.0, 5.0))"
+            " AS t(a, b)"
+        )
+    )
+    match = "Found 1 missing values in values_a and 1 in values_b"
+
+    with pytest.raises(ValueError, match=match):
+        prepare_lazy_colouring(
+            lf, "a", "b", scheme="Quantiles", k=3, alpha=True, alpha_norm_quantile=0.9
+        )
+    with pytest.raises(ValueError, match=match):
+        prepare_bivariate_data(
+            [1.0, np.nan, 3.0, 4.0],
+            [2.0, 3.0, np.nan, 5.0],
+            scheme="Quantiles",
+            k=3,
+            alpha=True,
+            alpha_norm_quantile=0.9,
+        )
+
+
+def test_lazy_colouring_not_supported_scheme() -> None:
+    """Test that schemes without lazy implementation are detected."""
+    assert not supports_lazy_colouring(scheme="NaturalBreaks", k=5)
+    assert not supports_lazy_colouring(scheme=("Quantiles", "FisherJenks"), k=5)
+    assert not supports_lazy_colouring(scheme=True, k=5)
+
+
+def test_lazy_colouring_with_classifier() -> None:
+    """Test that lazy engine applies bins of a fitted classifier."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(dict(a=rng.lognormal(size=1000), b=rng.lognormal(size=1000)))
+    lf = nw.from_native(duckdb.sql("SELECT * FROM df"))
+    classifier = BivariateClassifier(scheme=(True, False)).fit(df["a"], df["b"])
+
+    assert supports_lazy_colouring(scheme=classifier, k=5)
+    lazy_colouring = prepare_lazy_colouring(
+        lf, "a", "b", scheme=classifier, k=5, alpha=False, alpha_norm_quantile=0.9
+    )
+    eager_colouring = prepare_bivariate_data(
+        df["a"], df["b"], scheme=classifier, k=5, alpha=False, alpha_norm_quantile=0.9
+    )
+
+    assert lazy_colouring.bounds == eager_colouring.bounds
+    np.testing.assert_array_equal(
+        lazy_colouring.scheme_result.values_a, eager_colouring.scheme_result.values_a
+    )
+    np.testing.assert_array_equal(
+        lazy_colouring.scheme_result.values_b, eager_colouring.scheme_result.values_b
+    )
+
+
+def test_classifier_scheme(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that a subset coloured with a fitted classifier matches the full map colours."""
+    classifier = BivariateClassifier(scheme="Quantiles").fit(
+        nyc_data["morning_starts"], nyc_data["morning_ends"]
+    )
+    m = viz_bivariate_data(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        scheme=classifier,
+        alpha=False,
+    )
+    m_subset = viz_bivariate_data(
+        nyc_data.iloc[:100],
+        column_a="morning_starts",
+        column_b="morning_ends",
+        scheme=classifier,
+        alpha=False,
+    )
+
+    np.testing.assert_array_equal(
+        _layer_colours(m_subset.m.layers[0]), _layer_colours(m.m.layers[0])[:100]
+    )
+    assert m_subset.legend_spec.range_a == m.legend_spec.range_a
+    assert m_subset.legend_spec.tick_labels_a == m.legend_spec.tick_labels_a
+    assert m_subset.legend_spec.tick_labels_b == m.legend_spec.tick_labels_b
+
+
+def _layer_colours(layer: lonboard.BaseArrowLayer) -> np.ndarray:
+    colours = pa.chunked_array(
+        layer.get_color if isinstance(layer, lonboard.PathLayer) else layer.get_fill_color
+    ).combine_chunks()
+    return np.asarray(colours.flatten()).reshape(len(colours), -1)
+
+
+def test_multiple_tables(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that multiple tables are coloured together and each layer gets its own rows."""
+    m = viz_bivariate_data(
+        nyc_data, column_a="morning_starts", column_b="morning_ends", scheme="Quantiles"
+    )
+    m_tables = viz_bivariate_data(
+        [nyc_data.iloc[:500], nyc_data.iloc[500:]],
+        column_a="morning_starts",
+        column_b="morning_ends",
+        scheme="Quantiles",
+    )
+
+    assert len(m_tables.m.layers) == 2
+    np.testing.assert_array_equal(
+        np.concatenate([_layer_colours(layer) for layer in m_tables.m.layers]),
+        _layer_colours(m.m.layers[0]),
+    )
+
+
+def test_multiple_tables_raises_values_length_mismatch(dummy_data: gpd.GeoDataFrame) -> None:
+    """Test that values not matching the total number of rows raise ValueError."""
+    with pytest.raises(ValueError, match="doesn't match the number of rows"):
+        viz_bivariate_data([dummy_data, dummy_data], column_a=[1, 2], column_b=[3, 4])
+
+
+def test_mixed_geometry_types() -> None:
+    """Test that each layer of split mixed geometries gets colours of its rows."""
+    gdf = gpd.GeoDataFrame(
+        dict(a=[1, 2, 3, 4], b=[10, 100, 1, 5]),
+        geometry=[box(0, 0, 1, 1), Point(0, 0), LineString([(0, 0), (1, 1)]), box(1, 1, 2, 2)],
+        crs=4326,
+    )
+    m = viz_bivariate_data(gdf, column_a="a", column_b="b", scheme=False)
+    all_colours = viz_bivariate_data(
+        gdf.set_geometry(gdf.centroid), column_a="a", column_b="b", scheme=False
+    ).m.layers[0]
+
+    assert [type(layer) for layer in m.m.layers] == [
+        lonboard.PolygonLayer,
+        lonboard.PathLayer,
+        lonboard.ScatterplotLayer,
+    ]
+    for layer, indices in zip(m.m.layers, ([0, 3], [2], [1]), strict=True):
+        np.testing.assert_array_equal(_layer_colours(layer), _layer_colours(all_colours)[indices])
+
+
+def test_legend_spec(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that legend doesn't keep the data arrays."""
+    m = viz_bivariate_data(nyc_data, column_a="morning_starts", column_b="morning_ends")
+
+    assert m.legend_spec is not None
+    assert m.legend_spec.range_a == (
+        nyc_data["morning_starts"].min(),
+        nyc_data["morning_starts"].max(),
+    )
+    assert m.legend_spec.label_a == "morning_starts"
+    assert m.legend.__closure__ is not None
+    assert not any(
+        isinstance(cell.cell_contents, (np.ndarray, pd.Series, nw.Series))
+        for cell in m.legend.__closure__
+    )
+
+    m.update(nyc_data, column_a="afternoon_starts")
+    assert m.legend_spec.label_a == "afternoon_starts"
+    assert isinstance(m.legend(), Axes)
+
+
+@pytest.mark.parametrize("keep_values", [False, True])  # type: ignore
+@pytest.mark.parametrize("values", [False, True])  # type: ignore
+def test_data_not_kept(nyc_data: gpd.GeoDataFrame, values: bool, keep_values: bool) -> None:
+    """Test that the map object doesn't keep the input data alive."""
+    data = nyc_data.copy()
+    data_ref = weakref.ref(data)
+
+    if values:
+        m = viz_bivariate_data(
+            data,
+            column_a=data["morning_starts"],
+            column_b=data["morning_ends"],
+            keep_values=keep_values,
+        )
+    else:
+        m = viz_bivariate_data(
+            data, column_a="morning_starts", column_b="morning_ends", keep_values=keep_values
+        )
+
+    del data
+    gc.collect()
+
+    assert data_ref() is None
+    assert m._colouring is not None
+    assert (m._colouring.values is not None) == keep_values
+
+    if keep_values:
+        m.update(cmap="bubblegum")
+        assert m.legend_spec is not None
+        assert m.legend_spec.label_a == "morning_starts"
+    else:
+        with pytest.raises(ValueError):
+            m.update(cmap="bubblegum")
+
+
+def test_update_with_data_after_update_rows(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that map without kept values is recoloured from the passed data."""
+    x = viz_bivariate_data(nyc_data, column_a="morning_starts", column_b="morning_ends")
+
+    x.update_rows([0], values_a=[1000], values_b=[0])
+    x.update(nyc_data)
+
+    expected = viz_bivariate_data(nyc_data, column_a="morning_starts", column_b="morning_ends")
+    np.testing.assert_array_equal(
+        _layer_colours(x.m.layers[0]), _layer_colours(expected.m.layers[0])
+    )
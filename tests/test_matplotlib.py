@@ -0,0 +1,127 @@
+"""Test bivariate Matplotlib maps functionality."""
+
+from collections.abc import Iterator
+
+import geopandas as gpd
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+import shapely
+from matplotlib.collections import LineCollection, PathCollection
+
+from bivario import plot_bivariate_data
+from bivario._prepared import prepare_bivariate_data
+from bivario.cmap import get_bivariate_cmap
+
+
+@pytest.fixture(autouse=True)  # type: ignore
+def close_figures() -> Iterator[None]:
+    """Close all figures after each test."""
+    yield
+    plt.close("all")
+
+
+def test_single_polygons_collection(nyc_data: gpd.GeoDataFrame) -> None:
+    """Test that polygons are drawn as a single collection with the bivariate colours."""
+    ax = plot_bivariate_data(nyc_data, "morning_starts", "morning_ends")
+
+    prepared_data = prepare_bivariate_data(
+        nyc_data["morning_starts"],
+        nyc_data["morning_ends"],
+        scheme=True,
+        k=5,
+        alpha=True,
+        alpha_norm_quantile=0.9,
+    )
+    expected_colours = np.ones((len(nyc_data), 4))
+    expected_colours[:, :3] = prepared_data.colour(get_bivariate_cmap(None), dark_mode=False)
+    expected_colours[:, 3] = prepared_data.alpha_values  # type: ignore[assignment]
+
+    (collection,) = ax.collections
+    assert isinstance(collection, PathCollection)
+    assert len(collection.get_paths()) == len(nyc_data)
+    np.testing.assert_allclose(collection.get_facecolors(), expected_colours)
+    assert not collection.get_rasterized()
+    assert len(ax.child_axes) == 1
+
+    minx, miny, maxx, maxy = nyc_data.total_bounds
+    x_min, x_max = ax.get_xlim()
+    y_min, y_max = ax.get_ylim()
+    assert x_min <= minx and maxx <= x_max
+    assert y_min <= miny and maxy <= y_max
+
+
+def test_polygon_holes() -> None:
+    """Test that holes of polygons are not filled, regardless of the rings orientation."""
+    exterior = shapely.box(0, 0, 10, 10)
+    hole = shapely.box(3, 3, 7, 7)
+    polygons = [
+        shapely.Polygon(exterior.exterior.coords, [hole.exterior.coords]),
+        shapely.Polygon(exterior.exterior.coords[::-1], [hole.exterior.coords[::-1]]),
+    ]
+
+    for polygon in polygons:
+        gdf = gpd.GeoDataFrame(dict(a=[1], b=[1]), geometry=[polygon])
+        fig, ax = plt.subplots(figsize=(1, 1), dpi=100)
+        fig.subplots_adjust(0, 0, 1, 1)
+        plot_bivariate_data(gdf, "a", "b", ax=ax, scheme=False, alpha=False, legend=False)
+        ax.set_axis_off()
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        fig.canvas.draw()
+        image = np.asarray(fig.canvas.buffer_rgba())  # type: ignore[attr-defined]
+
+        assert (image[50, 50] == 255).all()
+        assert not (image[10, 10] == 255).all()
+
+
+def test_mixed_geometries() -> None:
+    """Test that each kind of geometries is drawn as a single collection."""
+    gdf = gpd.GeoDataFrame(
+        dict(a=[1, 2, 3, 4, 5], b=[5, 4, 3, 2, 1]),
+        geometry=[
+            shapely.Point(0, 0),
+            shapely.MultiPoint([(1, 1), (2, 2)]),
+            shapely.LineString([(0, 0), (1, 2)]),
+            shapely.MultiPolygon([shapely.box(0, 0, 1, 1), shapely.box(2, 2, 3, 3)]),
+            None,
+        ],
+    )
+
+    ax = plot_bivariate_data(gdf, "a", "b", scheme=False, rasterized=True, legend=False)
+
+    polygons, lines, points = ax.collections
+    assert isinstance(polygons, PathCollection) and len(polygons.get_paths()) == 1
+    assert isinstance(lines, LineCollection) and len(lines.get_paths()) == 1
+    assert len(points.get_offsets()) == 3
+    np.testing.assert_allclose(
+        points.get_facecolors()[1], points.get_facecolors()[2], err_msg="Same multipoint colour"
+    )
+    assert all(collection.get_rasterized() for collection in ax.collections)
+    assert not ax.child_axes
+
+
+@pytest.mark.parametrize("legend_loc", ["bl", "br", "tl", "tr"])  # type: ignore
+def test_legend_location(dummy_data: gpd.GeoDataFrame, legend_loc: str) -> None:
+    """Test that the legend is placed in the selected corner of the map."""
+    ax = plot_bivariate_data(dummy_data, "a", "b", legend_loc=legend_loc, legend_size=0.3)  # type: ignore[arg-type]
+
+    (legend_ax,) = ax.child_axes
+    x, y, width, height = legend_ax.get_axes_locator()(ax, None).bounds  # type: ignore[misc]
+    ax_x, ax_y, ax_width, ax_height = ax.get_position().bounds
+    relative_x = (x + width / 2 - ax_x) / ax_width
+    relative_y = (y + height / 2 - ax_y) / ax_height
+
+    assert (relative_x < 0.5) == (legend_loc[1] == "l")
+    assert (relative_y < 0.5) == (legend_loc[0] == "b")
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "kwargs", [{"column_a": "c"}, {"legend_loc": "center"}]
+)
+def test_invalid_arguments(dummy_data: gpd.GeoDataFrame, kwargs: dict[str, object]) -> None:
+    """Test that invalid arguments raise an error."""
+    arguments: dict[str, object] = {"column_a": "a", "column_b": "b", **kwargs}
+
+    with pytest.raises(ValueError):
+        plot_bivariate_data(dummy_data, **arguments)  # type: ignore[arg-type]
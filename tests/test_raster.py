@@ -0,0 +1,132 @@
+"""Test bivariate rasterization functionality."""
+
+import numpy as np
+import pytest
+
+from bivario import BivariateClassifier, BivariateRaster, rasterize_bivariate
+
+
+def test_pixels_aggregation() -> None:
+    """Test that points are counted and aggregated in the proper pixels."""
+    x = [0.0, 0.2, 1.8, 2.0, 0.5]
+    y = [0.0, 0.1, 1.9, 2.0, 1.5]
+    values_a = [1.0, 3.0, 10.0, 20.0, 5.0]
+    values_b = [2.0, 4.0, 1.0, 1.0, 8.0]
+
+    raster = rasterize_bivariate(x, y, values_a, values_b, size_px=2, scheme=False)
+
+    assert isinstance(raster, BivariateRaster)
+    assert raster.bounds == (0.0, 0.0, 2.0, 2.0)
+    assert raster.image.shape == (2, 2, 4)
+    assert raster.image.dtype == np.uint8
+    # First row is the top of the image
+    np.testing.assert_array_equal(raster.counts, [[1, 2], [2, 0]])
+    np.testing.assert_array_equal(raster.image[..., 3], [[255, 255], [255, 0]])
+    np.testing.assert_array_equal(raster.image[1, 1], [0, 0, 0, 0])
+    assert raster.legend_spec.range_a == (2.0, 15.0)
+    assert raster.legend_spec.range_b == (1.0, 8.0)
+
+
+def test_sum_aggregation() -> None:
+    """Test that values within a pixel can be summed."""
+    raster = rasterize_bivariate(
+        [0, 0.1, 1.0],
+        [0, 0.1, 1.0],
+        [1, 2, 4],
+        [1, 1, 1],
+        size_px=2,
+        aggregation="sum",
+        scheme=False,
+    )
+
+    np.testing.assert_array_equal(raster.counts, [[0, 1], [2, 0]])
+    assert raster.legend_spec.range_a == (3.0, 4.0)
+    assert raster.legend_spec.range_b == (1.0, 2.0)
+
+
+def test_bounds_skip_points() -> None:
+    """Test that points outside of the bounds and with missing values are skipped."""
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-1, 2, size=1000), rng.uniform(-1, 2, size=1000)
+    values_a, values_b = rng.random(1000), rng.random(1000)
+    values_a[:10] = np.nan
+
+    raster = rasterize_bivariate(
+        x, y, values_a, values_b, size_px=(4, 2), bounds=(0, 0, 1, 1), scheme="Quantiles"
+    )
+
+    inside = (x >= 0) & (x <= 1) & (y >= 0) & (y <= 1) & ~np.isnan(values_a)
+    assert raster.image.shape == (2, 4, 4)
+    assert raster.counts.sum() == inside.sum()
+
+
+def test_image_size() -> None:
+    """Test that the longer side of the image has the requested number of pixels."""
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 4, size=100), rng.uniform(0, 1, size=100)
+    x[:2], y[:2] = (0, 4), (0, 1)
+
+    raster = rasterize_bivariate(x, y, rng.random(100), rng.random(100), size_px=100)
+
+    assert raster.image.shape == (25, 100, 4)
+    assert raster.counts.sum() == 100
+
+
+def test_classifier_scheme() -> None:
+    """Test that aggregated values can be classified with a fitted classifier."""
+    rng = np.random.default_rng(0)
+    x, y = rng.random(1000), rng.random(1000)
+    values_a, values_b = rng.random(1000), rng.random(1000)
+    classifier = BivariateClassifier.from_breaks([0.25, 0.5, 1.0], [0.5, 1.0])
+
+    raster = rasterize_bivariate(x, y, values_a, values_b, size_px=10, scheme=classifier)
+
+    assert raster.legend_spec.tick_labels_a == classifier.tick_labels_a
+    assert raster.legend_spec.tick_labels_b == classifier.tick_labels_b
+
+
+def test_alpha() -> None:
+    """Test that transparency of the pixels is scaled with the aggregated values."""
+    raster = rasterize_bivariate(
+        [0, 1, 2, 3], [0, 0, 0, 0], [0, 1, 2, 3], [0, 1, 2, 3], size_px=4, alpha=True
+    )
+
+    alpha_channel = raster.image[0, :, 3]
+    assert alpha_channel[0] < alpha_channel[1] < alpha_channel[2]
+    assert alpha_channel[3] == 255
+
+
+def test_plot() -> None:
+    """Test that the image is plotted in the coordinates of the points."""
+    from matplotlib import pyplot as plt
+
+    raster = rasterize_bivariate([0, 1, 2], [0, 2, 4], [1, 2, 3], [3, 2, 1], size_px=10)
+    ax = raster.plot()
+
+    assert ax.get_xlim() == (0.0, 2.0)
+    assert ax.get_ylim() == (0.0, 4.0)
+    plt.close(ax.figure)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "kwargs",
+    [
+        {"x": [0, 1, 2]},
+        {"aggregation": "median"},
+        {"size_px": 0},
+        {"bounds": (1, 0, 0, 1)},
+        {"bounds": (10, 10, 11, 11)},
+    ],
+)
+def test_invalid_arguments(kwargs: dict[str, object]) -> None:
+    """Test that invalid arguments raise an error."""
+    arguments: dict[str, object] = {
+        "x": [0, 1],
+        "y": [0, 1],
+        "values_a": [1, 2],
+        "values_b": [1, 2],
+        **kwargs,
+    }
+
+    with pytest.raises(ValueError):
+        rasterize_bivariate(**arguments)  # type: ignore[arg-type]
@@ -0,0 +1,107 @@
+"""Tests for values classification schemes."""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from mapclassify import FisherJenks, classify
+
+from bivario._scheme import apply_mapclassify, format_tick_labels
+
+
+@pytest.mark.parametrize("k", [2, 5, 7])  # type: ignore
+def test_natural_breaks_optimal_bins(k: int) -> None:
+    """Test that natural breaks are the same as optimal Fisher-Jenks breaks."""
+    rng = np.random.default_rng(0)
+    values = np.round(rng.lognormal(size=500), 2)
+
+    result = apply_mapclassify(values, values, scheme="NaturalBreaks", k=k)
+    binning = FisherJenks(values, k=k)
+
+    np.testing.assert_allclose(result.bins_a, binning.bins)
+    np.testing.assert_array_equal(result.values_a, binning.yb)
+    assert result.tick_labels_a is not None and len(result.tick_labels_a) == k + 1
+
+
+def test_natural_breaks_deterministic() -> None:
+    """Test that default scheme returns the same classes on every call."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=10_000)
+
+    first_result = apply_mapclassify(values, values, scheme=True, k=6)
+    second_result = apply_mapclassify(values, values, scheme=True, k=6)
+
+    np.testing.assert_array_equal(first_result.bins_a, second_result.bins_a)
+    np.testing.assert_array_equal(first_result.values_a, second_result.values_a)
+
+
+def test_natural_breaks_sample() -> None:
+    """Test that natural breaks fitted on a sample cover all the values."""
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=100_000)
+
+    result = apply_mapclassify(
+        values, values, scheme="NaturalBreaks", k=5, natural_breaks_sample_size=1_000
+    )
+
+    assert result.bins_a is not None
+    assert result.bins_a[-1] == values.max()
+    assert result.values_a.min() == 0
+    assert result.values_a.max() == 4
+    np.testing.assert_array_equal(
+        result.values_a, np.searchsorted(result.bins_a, values, side="left")
+    )
+
+
+def test_natural_breaks_not_enough_unique_values() -> None:
+    """Test that number of classes is reduced to the number of unique values."""
+    values = np.array([1, 1, 2, 2, 3, 3])
+
+    with pytest.warns(UserWarning, match="Not enough unique values"):
+        result = apply_mapclassify(values, values, scheme=(True, False), k=5)
+
+    np.testing.assert_array_equal(result.bins_a, [1, 2, 3])
+    np.testing.assert_array_equal(result.values_a, [0, 0, 1, 1, 2, 2])
+    np.testing.assert_array_equal(result.values_b, values)
+
+
+@pytest.mark.parametrize("scheme", ["Quantiles", "EqualInterval", "StdMean", "BoxPlot"])  # type: ignore
+@pytest.mark.parametrize("dtype", [np.float64, np.float32, np.int64])  # type: ignore
+@pytest.mark.parametrize("k", [1, 4, 7])  # type: ignore
+def test_native_schemes_same_as_mapclassify(scheme: str, dtype: type, k: int) -> None:
+    """Test that natively computed schemes have the same bins and tick labels as mapclassify."""
+    rng = np.random.default_rng(0)
+    values = (rng.lognormal(size=1001) * 10).astype(dtype)
+
+    result = apply_mapclassify(values, values, scheme=(scheme, False), k=k)
+    binning = classify(values, scheme=scheme, k=k)
+
+    assert result.bins_a is not None
+    assert result.bins_a.dtype == binning.bins.dtype
+    np.testing.assert_array_equal(result.bins_a, binning.bins)
+    np.testing.assert_array_equal(result.values_a, binning.yb)
+    assert result.tick_labels_a == format_tick_labels(binning.y.min(), binning.bins)
+
+
+def test_other_schemes_use_mapclassify() -> None:
+    """Test that schemes without native implementation are computed by mapclassify."""
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=1000)
+
+    result = apply_mapclassify(values, values, scheme="HeadTailBreaks")
+    binning = classify(values, scheme="HeadTailBreaks")
+
+    np.testing.assert_array_equal(result.bins_a, binning.bins)
+    np.testing.assert_array_equal(result.values_a, binning.yb)
+
+
+def test_mapclassify_not_imported() -> None:
+    """Test that mapclassify isn't imported for natively computed schemes."""
+    code = (
+        "import sys; import numpy as np; from bivario._scheme import apply_mapclassify; "
+        "values = np.arange(100.0); "
+        "apply_mapclassify(values, values, scheme=('Quantiles', 'NaturalBreaks')); "
+        "assert 'mapclassify' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
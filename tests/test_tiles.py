@@ -0,0 +1,126 @@
+"""Test bivariate map tiles functionality."""
+
+import io
+import json
+import sqlite3
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from PIL import Image
+
+from bivario import BivariateLegendSpec, render_bivariate_tiles
+from bivario._tiles import tile_bounds
+
+
+def _read_directory_tiles(path: Path) -> dict[tuple[int, int, int], bytes]:
+    return {
+        (int(tile_path.parts[-3]), int(tile_path.parts[-2]), int(tile_path.stem)): (
+            tile_path.read_bytes()
+        )
+        for tile_path in path.glob("*/*/*.png")
+    }
+
+
+def test_directory_tiles(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that tiles are written to a directory with metadata."""
+    legend_spec = render_bivariate_tiles(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        output=tmp_path / "tiles",
+        min_zoom=9,
+        max_zoom=12,
+        processes=1,
+    )
+
+    tiles = _read_directory_tiles(tmp_path / "tiles")
+    metadata = json.loads((tmp_path / "tiles" / "metadata.json").read_text())
+
+    assert isinstance(legend_spec, BivariateLegendSpec)
+    assert {z for z, _, _ in tiles} == {9, 10, 11, 12}
+    assert metadata["format"] == "png"
+    assert (metadata["minzoom"], metadata["maxzoom"]) == ("9", "12")
+    for data in tiles.values():
+        image = np.asarray(Image.open(io.BytesIO(data)))
+        assert image.shape == (256, 256, 4)
+        assert image[..., 3].any()
+
+
+def test_tiles_cover_geometries(dummy_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that only tiles with geometries are rendered."""
+    render_bivariate_tiles(
+        dummy_data, "a", "b", output=tmp_path, min_zoom=3, max_zoom=3, processes=1
+    )
+
+    points = dummy_data.geometry.to_crs(3857)
+    expected_tiles = {
+        (3, x, y)
+        for x in range(8)
+        for y in range(8)
+        if points.intersects(shapely.box(*tile_bounds((3, x, y)))).any()
+    }
+
+    assert set(_read_directory_tiles(tmp_path)) == expected_tiles
+
+
+def test_process_pool_same_tiles(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that tiles rendered in a process pool are the same as rendered in a single process."""
+    kwargs = dict(column_a="morning_starts", column_b="morning_ends", min_zoom=10, max_zoom=11)
+    render_bivariate_tiles(nyc_data, output=tmp_path / "single", processes=1, **kwargs)  # type: ignore[arg-type]
+    render_bivariate_tiles(nyc_data, output=tmp_path / "pool", processes=2, **kwargs)  # type: ignore[arg-type]
+
+    assert _read_directory_tiles(tmp_path / "single") == _read_directory_tiles(tmp_path / "pool")
+
+
+def test_archives_same_tiles(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that MBTiles and PMTiles archives contain the same tiles as the directory."""
+    from pmtiles.reader import MmapSource, Reader
+
+    for output in ("tiles", "tiles.mbtiles", "tiles.pmtiles"):
+        render_bivariate_tiles(
+            nyc_data,
+            column_a="morning_starts",
+            column_b="morning_ends",
+            output=tmp_path / output,
+            min_zoom=10,
+            max_zoom=11,
+            processes=1,
+        )
+
+    tiles = _read_directory_tiles(tmp_path / "tiles")
+
+    connection = sqlite3.connect(tmp_path / "tiles.mbtiles")
+    # MBTiles rows are counted from the bottom
+    mbtiles_tiles = {
+        (z, x, (1 << z) - 1 - row): bytes(data)
+        for z, x, row, data in connection.execute("SELECT * FROM tiles")
+    }
+    metadata = dict(connection.execute("SELECT * FROM metadata").fetchall())
+    connection.close()
+
+    with (tmp_path / "tiles.pmtiles").open("rb") as file:
+        reader = Reader(MmapSource(file))
+        pmtiles_tiles = {tile: reader.get(*tile) for tile in tiles}
+        assert reader.header()["addressed_tiles_count"] == len(tiles)
+        assert reader.header()["clustered"]
+
+    assert mbtiles_tiles == tiles
+    assert pmtiles_tiles == tiles
+    assert metadata["name"] == "tiles"
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "kwargs",
+    [{"min_zoom": 5, "max_zoom": 4}, {"max_zoom": 25}, {"tile_size_px": 0}, {"column_a": "c"}],
+)
+def test_invalid_arguments(
+    dummy_data: gpd.GeoDataFrame, tmp_path: Path, kwargs: dict[str, object]
+) -> None:
+    """Test that invalid arguments raise an error."""
+    arguments: dict[str, object] = {"column_a": "a", "column_b": "b", **kwargs}
+
+    with pytest.raises(ValueError):
+        render_bivariate_tiles(dummy_data, output=tmp_path, **arguments)  # type: ignore[arg-type]
@@ -0,0 +1,173 @@
+"""Test bivariate vector tiles functionality."""
+
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+
+import geopandas as gpd
+import mapbox_vector_tile
+import numpy as np
+import pytest
+
+from bivario import BivariateLegendSpec, export_bivariate_vector_tiles
+from bivario._prepared import prepare_bivariate_data
+from bivario.cmap import get_bivariate_cmap
+
+
+def _read_directory_tiles(path: Path) -> dict[tuple[int, int, int], bytes]:
+    return {
+        (int(tile_path.parts[-3]), int(tile_path.parts[-2]), int(tile_path.stem)): (
+            tile_path.read_bytes()
+        )
+        for tile_path in path.glob("*/*/*.pbf")
+    }
+
+
+def _decode_features(data: bytes, layer_name: str = "bivariate") -> list[dict]:
+    layers = mapbox_vector_tile.decode(data)
+    return layers[layer_name]["features"]  # type: ignore[no-any-return]
+
+
+def _expected_colours(gdf: gpd.GeoDataFrame) -> list[str]:
+    prepared_data = prepare_bivariate_data(
+        gdf["morning_starts"],
+        gdf["morning_ends"],
+        scheme=True,
+        k=5,
+        alpha=True,
+        alpha_norm_quantile=0.9,
+    )
+    colours = np.full((len(gdf), 4), 255, dtype=np.uint8)
+    colours[:, :3] = prepared_data.colour(get_bivariate_cmap(None), dark_mode=False) * 255
+    colours[:, 3] = prepared_data.alpha_values * 255  # type: ignore[operator]
+    return [f"#{r:02x}{g:02x}{b:02x}{a:02x}" for r, g, b, a in colours]
+
+
+def test_palette_colours(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that features point to their colours in the palette saved in the metadata."""
+    legend_spec = export_bivariate_vector_tiles(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        output=tmp_path,
+        min_zoom=9,
+        max_zoom=11,
+        keep_columns=["h3"],
+        processes=1,
+    )
+
+    tiles = _read_directory_tiles(tmp_path)
+    metadata = json.loads((tmp_path / "metadata.json").read_text())
+    json_metadata = json.loads(metadata["json"])
+    palette = json_metadata["bivario_palette"]
+    expected_colours = _expected_colours(nyc_data)
+
+    assert isinstance(legend_spec, BivariateLegendSpec)
+    assert {z for z, _, _ in tiles} == {9, 10, 11}
+    assert metadata["format"] == "pbf"
+    assert json_metadata["vector_layers"] == [
+        {
+            "id": "bivariate",
+            "fields": {"h3": "Number", "colour_index": "Number"},
+            "minzoom": 9,
+            "maxzoom": 11,
+        }
+    ]
+    assert len(palette) == len(set(expected_colours))
+
+    features = [feature for data in tiles.values() for feature in _decode_features(data)]
+    assert {feature["id"] for feature in features} == set(range(len(nyc_data)))
+    for feature in features:
+        assert palette[feature["properties"]["colour_index"]] == expected_colours[feature["id"]]
+        assert feature["properties"]["h3"] == nyc_data["h3"].iloc[feature["id"]]
+
+
+def test_rgba_colours(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that features have colours packed into integers."""
+    export_bivariate_vector_tiles(
+        nyc_data,
+        column_a="morning_starts",
+        column_b="morning_ends",
+        output=tmp_path,
+        min_zoom=10,
+        max_zoom=10,
+        colour_encoding="rgba",
+        layer_name="trips",
+        processes=1,
+    )
+
+    metadata = json.loads((tmp_path / "metadata.json").read_text())
+    expected_colours = _expected_colours(nyc_data)
+
+    assert "bivario_palette" not in json.loads(metadata["json"])
+    for data in _read_directory_tiles(tmp_path).values():
+        for feature in _decode_features(data, layer_name="trips"):
+            colour = feature["properties"]["colour"]
+            assert f"#{colour:08x}" == expected_colours[feature["id"]]
+
+
+def test_archives_same_tiles(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that MBTiles and PMTiles archives contain the same compressed tiles as the directory."""
+    from pmtiles.reader import MmapSource, Reader
+
+    for output in ("tiles", "tiles.mbtiles", "tiles.pmtiles"):
+        export_bivariate_vector_tiles(
+            nyc_data,
+            column_a="morning_starts",
+            column_b="morning_ends",
+            output=tmp_path / output,
+            min_zoom=10,
+            max_zoom=11,
+            processes=1,
+        )
+
+    tiles = _read_directory_tiles(tmp_path / "tiles")
+
+    connection = sqlite3.connect(tmp_path / "tiles.mbtiles")
+    mbtiles_tiles = {
+        (z, x, (1 << z) - 1 - row): gzip.decompress(data)
+        for z, x, row, data in connection.execute("SELECT * FROM tiles")
+    }
+    mbtiles_metadata = dict(connection.execute("SELECT * FROM metadata").fetchall())
+    connection.close()
+
+    with (tmp_path / "tiles.pmtiles").open("rb") as file:
+        reader = Reader(MmapSource(file))
+        pmtiles_tiles = {tile: gzip.decompress(reader.get(*tile)) for tile in tiles}
+        pmtiles_metadata = reader.metadata()
+
+    assert mbtiles_tiles == tiles
+    assert pmtiles_tiles == tiles
+    assert json.loads(mbtiles_metadata["json"])["vector_layers"][0]["id"] == "bivariate"
+    assert pmtiles_metadata["vector_layers"][0]["id"] == "bivariate"
+    assert "bivario_palette" in pmtiles_metadata
+
+
+def test_process_pool_same_tiles(nyc_data: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test that tiles encoded in a process pool are the same as encoded in a single process."""
+    kwargs = dict(column_a="morning_starts", column_b="morning_ends", min_zoom=10, max_zoom=10)
+    export_bivariate_vector_tiles(nyc_data, output=tmp_path / "single", processes=1, **kwargs)  # type: ignore[arg-type]
+    export_bivariate_vector_tiles(nyc_data, output=tmp_path / "pool", processes=2, **kwargs)  # type: ignore[arg-type]
+
+    assert _read_directory_tiles(tmp_path / "single") == _read_directory_tiles(tmp_path / "pool")
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "kwargs",
+    [
+        {"min_zoom": 5, "max_zoom": 4},
+        {"colour_encoding": "hex"},
+        {"extent": 0},
+        {"simplify_tolerance_px": -1},
+        {"keep_columns": ["c"]},
+    ],
+)
+def test_invalid_arguments(
+    dummy_data: gpd.GeoDataFrame, tmp_path: Path, kwargs: dict[str, object]
+) -> None:
+    """Test that invalid arguments raise an error."""
+    arguments: dict[str, object] = {"column_a": "a", "column_b": "b", **kwargs}
+
+    with pytest.raises(ValueError):
+        export_bivariate_vector_tiles(dummy_data, output=tmp_path, **arguments)  # type: ignore[arg-type]
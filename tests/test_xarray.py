@@ -0,0 +1,115 @@
+"""Test bivariate xarray rasters functionality."""
+
+from typing import Any
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from bivario import BivariateClassifier, colour_bivariate_dataarray, get_bivariate_cmap
+from bivario._prepared import prepare_bivariate_data
+
+
+@pytest.fixture  # type: ignore
+def rasters() -> tuple[xr.DataArray, xr.DataArray]:
+    """Two co-registered rasters with a missing value."""
+    rng = np.random.default_rng(0)
+    coords = {"y": np.arange(60), "x": np.arange(80)}
+    population = xr.DataArray(
+        rng.lognormal(size=(60, 80)), coords=coords, dims=("y", "x"), name="population"
+    )
+    night_light = xr.DataArray(
+        rng.random((60, 80)), coords=coords, dims=("y", "x"), name="night_light"
+    )
+    population[0, 0] = np.nan
+    return population, night_light
+
+
+@pytest.mark.parametrize("scheme", ["Quantiles", False, ("EqualInterval", None)])  # type: ignore
+def test_same_colours_as_prepared_data(
+    rasters: tuple[xr.DataArray, xr.DataArray], scheme: Any
+) -> None:
+    """Test that chunked colours are the same as colours of all values prepared at once."""
+    population, night_light = rasters
+    coloured = colour_bivariate_dataarray(
+        population.chunk({"y": 25, "x": 30}),
+        night_light.chunk({"y": 25, "x": 30}),
+        scheme=scheme,
+        alpha=True,
+        quantile_method="exact",
+    )
+
+    values_a, values_b = population.values.ravel(), night_light.values.ravel()
+    mask = ~np.isnan(values_a)
+    prepared_data = prepare_bivariate_data(
+        values_a[mask], values_b[mask], scheme=scheme, k=5, alpha=True, alpha_norm_quantile=0.9
+    )
+    expected_colours = prepared_data.colour(get_bivariate_cmap(), dark_mode=False)
+    assert prepared_data.alpha_values is not None
+
+    image = coloured.image.values.reshape(-1, 4)
+    np.testing.assert_array_equal(image[mask, :3], (expected_colours * 255).astype(np.uint8))
+    np.testing.assert_array_equal(
+        image[mask, 3], (prepared_data.alpha_values * 255).astype(np.uint8)
+    )
+    np.testing.assert_array_equal(image[~mask], 0)
+    assert coloured.legend_spec.tick_labels_a == prepared_data.scheme_result.tick_labels_a
+    assert coloured.legend_spec.range_a == prepared_data.range_a
+    assert coloured.legend_spec.label_a == "population"
+    assert coloured.legend_spec.label_b == "night_light"
+
+
+def test_lazy_image(rasters: tuple[xr.DataArray, xr.DataArray]) -> None:
+    """Test that the image of chunked rasters is evaluated lazily with the same chunks."""
+    population, night_light = rasters
+    coloured = colour_bivariate_dataarray(population.chunk({"y": 20}), night_light)
+
+    assert coloured.image.chunks is not None
+    assert coloured.image.chunksizes["y"] == (20, 20, 20)
+    assert coloured.image.dims == ("y", "x", "band")
+    assert list(coloured.image["band"].values) == ["red", "green", "blue", "alpha"]
+    assert coloured.image.dtype == np.uint8
+
+
+def test_kll_quantiles(rasters: tuple[xr.DataArray, xr.DataArray]) -> None:
+    """Test that approximate quantile bins cover the whole range of values."""
+    population, night_light = rasters
+    coloured = colour_bivariate_dataarray(
+        population.chunk({"y": 10}), night_light.chunk({"y": 10}), k=4, quantile_method="kll"
+    )
+
+    assert coloured.legend_spec.tick_labels_a is not None
+    assert len(coloured.legend_spec.tick_labels_a) == 5
+    assert coloured.legend_spec.tick_labels_a[-1] == f"{float(population.max()):,.1f}".replace(
+        ".0", ""
+    )
+
+
+def test_classifier_scheme(rasters: tuple[xr.DataArray, xr.DataArray]) -> None:
+    """Test that rasters can be classified with a fitted classifier."""
+    population, night_light = rasters
+    classifier = BivariateClassifier(scheme="NaturalBreaks", k=3).fit(
+        population.values[1:].ravel(), night_light.values[1:].ravel()
+    )
+
+    coloured = colour_bivariate_dataarray(
+        population.chunk({"x": 40}), night_light.chunk({"x": 40}), scheme=classifier
+    )
+
+    assert coloured.legend_spec.tick_labels_a == classifier.tick_labels_a
+    assert coloured.legend_spec.tick_labels_b == classifier.tick_labels_b
+    assert coloured.image.values[0, 0, 3] == 0
+
+
+def test_unsupported_scheme(rasters: tuple[xr.DataArray, xr.DataArray]) -> None:
+    """Test that schemes requiring all values at once are rejected."""
+    population, night_light = rasters
+    with pytest.raises(ValueError):
+        colour_bivariate_dataarray(population, night_light, scheme="NaturalBreaks")
+
+
+def test_misaligned_rasters(rasters: tuple[xr.DataArray, xr.DataArray]) -> None:
+    """Test that rasters with different coordinates are rejected."""
+    population, night_light = rasters
+    with pytest.raises(ValueError):
+        colour_bivariate_dataarray(population, night_light.assign_coords(x=night_light.x + 1))